@@ -1,5 +1,29 @@
 from fastapi import APIRouter
-from app.api.endpoints import y_line
+from app.core.config import settings
+from app.api.endpoints import (
+    exports, monitoring, platform_products, reference_data, strenuus_products
+)
+
+if settings.DB_ASYNC:
+    from app.api.endpoints import (
+        projects_async as projects,
+        notes_async as notes,
+        competitors_async as competitors,
+        service_areas_async as service_areas,
+        y_line_async as y_line
+    )
+else:
+    from app.api.endpoints import projects, notes, competitors, service_areas, y_line
 
 api_router = APIRouter()
-api_router.include_router(y_line.router, tags=["y-lines"]) 
\ No newline at end of file
+api_router.include_router(projects.router, tags=["projects"])
+api_router.include_router(notes.router, tags=["notes"])
+api_router.include_router(competitors.router, tags=["competitors"])
+api_router.include_router(service_areas.router, tags=["service-areas"])
+api_router.include_router(y_line.router, tags=["y-lines"])
+# These routers do not use the async request session, so they serve both modes
+api_router.include_router(exports.router, tags=["exports"])
+api_router.include_router(monitoring.router, tags=["monitoring"])
+api_router.include_router(platform_products.router, tags=["platform-products"])
+api_router.include_router(strenuus_products.router, tags=["strenuus-products"])
+api_router.include_router(reference_data.router, tags=["reference-data"])
@@ -0,0 +1,8 @@
+"""Shared API dependencies"""
+from app.db.session import get_db
+from app.db.async_session import get_async_db
+
+__all__ = [
+    'get_db',
+    'get_async_db'
+]
@@ -1,24 +1,39 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.db.session import get_db
+from app.models.competitor import Competitor as CompetitorModel
 from app.services.competitor_service import CompetitorService
 from app.schemas.competitor import Competitor, CompetitorCreate, CompetitorUpdate
+from app.utils.pagination import NEXT_CURSOR_HEADER
 import getpass
 
 router = APIRouter()
 
 @router.get("/competitors/", response_model=List[Competitor])
 def read_competitors(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve competitors.
+    Retrieve competitors in RecordID order.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page. `skip` is still honoured (offset paging) when no cursor is given.
     """
-    competitors = CompetitorService.get_competitors(db, skip=skip, limit=limit)
-    return competitors
+    if skip and cursor is None:
+        return CompetitorService.get_competitors(db, skip=skip, limit=limit)
+
+    try:
+        page = CompetitorService.get_competitors_page(db, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 @router.get("/competitors/project/{project_id}", response_model=List[Competitor])
 def read_competitors_by_project(
@@ -33,7 +48,7 @@ def read_competitors_by_project(
 
 @router.post("/competitors/", response_model=CompetitorCreate)
 def create_competitor(competitor: CompetitorCreate, db: Session = Depends(get_db)):
-    db_competitor = Competitor(**competitor.dict())
+    db_competitor = CompetitorModel(**CompetitorService.apply_product_defaults(db, competitor.dict()))
     db_competitor.LastEditMSID = getpass.getuser()
     db.add(db_competitor)
     db.commit()
@@ -42,15 +57,18 @@ def create_competitor(competitor: CompetitorCreate, db: Session = Depends(get_db
 
 @router.get("/competitors/{project_id}", response_model=List[CompetitorCreate])
 def get_competitors(project_id: str, db: Session = Depends(get_db)):
-    return db.query(Competitor).filter(Competitor.ProjectID == project_id).all()
+    return db.query(CompetitorModel).filter(CompetitorModel.ProjectID == project_id).all()
 
 @router.put("/competitors/{record_id}", response_model=CompetitorUpdate)
 def update_competitor(record_id: int, competitor: CompetitorUpdate, db: Session = Depends(get_db)):
-    db_competitor = db.query(Competitor).filter(Competitor.RecordID == record_id).first()
+    db_competitor = db.query(CompetitorModel).filter(CompetitorModel.RecordID == record_id).first()
     if not db_competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
-    for key, value in competitor.dict(exclude_unset=True).items():
+    values = CompetitorService.apply_product_defaults(
+        db, competitor.dict(exclude_unset=True), current=db_competitor
+    )
+    for key, value in values.items():
         setattr(db_competitor, key, value)
     
     db_competitor.LastEditMSID = getpass.getuser()
@@ -60,7 +78,7 @@ def update_competitor(record_id: int, competitor: CompetitorUpdate, db: Session
 
 @router.delete("/competitors/{record_id}")
 def delete_competitor(record_id: int, db: Session = Depends(get_db)):
-    db_competitor = db.query(Competitor).filter(Competitor.RecordID == record_id).first()
+    db_competitor = db.query(CompetitorModel).filter(CompetitorModel.RecordID == record_id).first()
     if not db_competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
     
@@ -0,0 +1,102 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db
+from app.models.competitor import Competitor as CompetitorModel
+from app.services.competitor_service import CompetitorService
+from app.schemas.competitor import Competitor, CompetitorCreate, CompetitorUpdate
+from app.utils.pagination import NEXT_CURSOR_HEADER
+import getpass
+
+router = APIRouter()
+
+async def _get_competitor_or_404(db: AsyncSession, record_id: int) -> CompetitorModel:
+    result = await db.execute(select(CompetitorModel).where(CompetitorModel.RecordID == record_id))
+    db_competitor = result.scalars().first()
+    if not db_competitor:
+        raise HTTPException(status_code=404, detail="Competitor not found")
+    return db_competitor
+
+@router.get("/competitors/", response_model=List[Competitor])
+async def read_competitors(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve competitors in RecordID order.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page. `skip` is still honoured (offset paging) when no cursor is given.
+    """
+    if skip and cursor is None:
+        return await db.run_sync(
+            lambda session: CompetitorService.get_competitors(session, skip=skip, limit=limit)
+        )
+
+    try:
+        page = await db.run_sync(
+            lambda session: CompetitorService.get_competitors_page(session, cursor=cursor, limit=limit)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+@router.get("/competitors/project/{project_id}", response_model=List[Competitor])
+async def read_competitors_by_project(
+    project_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get competitors by project ID.
+    """
+    return await db.run_sync(
+        lambda session: CompetitorService.get_competitors_by_project(db=session, project_id=project_id)
+    )
+
+@router.post("/competitors/", response_model=CompetitorCreate)
+async def create_competitor(competitor: CompetitorCreate, db: AsyncSession = Depends(get_async_db)):
+    values = competitor.dict()
+    values = await db.run_sync(
+        lambda session: CompetitorService.apply_product_defaults(session, values)
+    )
+    db_competitor = CompetitorModel(**values)
+    db_competitor.LastEditMSID = getpass.getuser()
+    db.add(db_competitor)
+    await db.commit()
+    await db.refresh(db_competitor)
+    return db_competitor
+
+@router.get("/competitors/{project_id}", response_model=List[CompetitorCreate])
+async def get_competitors(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(CompetitorModel).where(CompetitorModel.ProjectID == project_id))
+    return result.scalars().all()
+
+@router.put("/competitors/{record_id}", response_model=CompetitorUpdate)
+async def update_competitor(record_id: int, competitor: CompetitorUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_competitor = await _get_competitor_or_404(db, record_id)
+    values = competitor.dict(exclude_unset=True)
+    values = await db.run_sync(
+        lambda session: CompetitorService.apply_product_defaults(session, values, current=db_competitor)
+    )
+
+    for key, value in values.items():
+        setattr(db_competitor, key, value)
+
+    db_competitor.LastEditMSID = getpass.getuser()
+    await db.commit()
+    await db.refresh(db_competitor)
+    return db_competitor
+
+@router.delete("/competitors/{record_id}")
+async def delete_competitor(record_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_competitor = await _get_competitor_or_404(db, record_id)
+
+    await db.delete(db_competitor)
+    await db.commit()
+    return {"message": "Competitor deleted successfully"}
@@ -0,0 +1,31 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.export_service import EXPORT_MEDIA_TYPES, ExportService
+
+router = APIRouter()
+
+@router.get("/exports/{table}")
+def export_table(
+    table: str,
+    fmt: str = Query("csv", alias="format"),
+    project_id: Optional[str] = None
+):
+    """
+    Stream a table as CSV or Parquet.
+
+    `table` is one of projects, competitors, service-areas, notes or y-lines.
+    Pass `project_id` to export a single project's rows; y-lines take the
+    numeric projects id.
+    """
+    try:
+        ExportService.validate(table, fmt, project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = ExportService.filename(table, fmt, project_id)
+    return StreamingResponse(
+        ExportService.stream(table, fmt, project_id=project_id),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Response
+from app.utils.slow_queries import slow_query_log
+
+router = APIRouter()
+
+@router.get("/monitoring/slow-queries")
+def read_slow_queries(limit: int = 50):
+    """
+    Most recent slow statements, newest first. Plans are fetched separately.
+    """
+    return [
+        dict(event.to_dict(), has_plan=event.plan is not None)
+        for event in slow_query_log.recent(limit)
+    ]
+
+@router.get("/monitoring/slow-queries/{event_id}/plan")
+def read_slow_query_plan(event_id: int):
+    """Estimated SHOWPLAN_XML captured for a slow statement"""
+    event = slow_query_log.get(event_id)
+    if event is None or event.plan is None:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return Response(content=event.plan, media_type="application/xml")
@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.session import get_db
 from app.models.notes import ProjectNote
-from app.schemas.notes import NoteCreate, NoteUpdate
+from app.schemas.notes import NoteCreate, NoteSearchResult, NoteUpdate
+from app.services.note_search import note_search_index, search_notes
 from datetime import datetime
 import getpass
 
 router = APIRouter()
 
+def _search_result(note: ProjectNote, score: float) -> NoteSearchResult:
+    result = NoteSearchResult.model_validate(note)
+    result.score = score
+    return result
+
 @router.post("/notes/", response_model=NoteCreate)
 def create_note(note: NoteCreate, db: Session = Depends(get_db)):
     db_note = ProjectNote(**note.dict())
@@ -19,8 +25,20 @@ def create_note(note: NoteCreate, db: Session = Depends(get_db)):
     db.add(db_note)
     db.commit()
     db.refresh(db_note)
+    note_search_index.index_note(db_note)
     return db_note
 
+# Declared before /notes/{project_id} so "search" is not taken as a project ID
+@router.get("/notes/search", response_model=List[NoteSearchResult])
+def search_project_notes(
+    q: str = Query(..., min_length=1),
+    project_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """Notes ranked by relevance to ``q`` from the full-text index"""
+    return [_search_result(note, score) for note, score in search_notes(db, q, project_id, limit)]
+
 @router.get("/notes/{project_id}", response_model=List[NoteCreate])
 def get_notes(project_id: str, db: Session = Depends(get_db)):
     return db.query(ProjectNote).filter(ProjectNote.ProjectID == project_id).all()
@@ -38,6 +56,7 @@ def update_note(record_id: int, note: NoteUpdate, db: Session = Depends(get_db))
     db_note.LastEditMSID = getpass.getuser()
     db.commit()
     db.refresh(db_note)
+    note_search_index.index_note(db_note)
     return db_note
 
 @router.delete("/notes/{record_id}")
@@ -48,4 +67,5 @@ def delete_note(record_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_note)
     db.commit()
+    note_search_index.remove_note(record_id)
     return {"message": "Note deleted successfully"} 
\ No newline at end of file
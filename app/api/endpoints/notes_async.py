@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.api.deps import get_async_db
+from app.models.notes import ProjectNote
+from app.schemas.notes import NoteCreate, NoteSearchResult, NoteUpdate
+from app.services.note_search import note_search_index, search_notes
+from datetime import datetime
+import getpass
+
+router = APIRouter()
+
+def _search_result(note: ProjectNote, score: float) -> NoteSearchResult:
+    result = NoteSearchResult.model_validate(note)
+    result.score = score
+    return result
+
+async def _get_note_or_404(db: AsyncSession, record_id: int) -> ProjectNote:
+    result = await db.execute(select(ProjectNote).where(ProjectNote.RecordID == record_id))
+    db_note = result.scalars().first()
+    if not db_note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return db_note
+
+@router.post("/notes/", response_model=NoteCreate)
+async def create_note(note: NoteCreate, db: AsyncSession = Depends(get_async_db)):
+    db_note = ProjectNote(**note.dict())
+    db_note.DataLoadDate = datetime.now()
+    db_note.LastEditDate = datetime.now()
+    db_note.OrigNoteMSID = getpass.getuser()
+    db_note.LastEditMSID = getpass.getuser()
+    db.add(db_note)
+    await db.commit()
+    await db.refresh(db_note)
+    note_search_index.index_note(db_note)
+    return db_note
+
+# Declared before /notes/{project_id} so "search" is not taken as a project ID
+@router.get("/notes/search", response_model=List[NoteSearchResult])
+async def search_project_notes(
+    q: str = Query(..., min_length=1),
+    project_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Notes ranked by relevance to ``q`` from the full-text index"""
+    hits = await db.run_sync(lambda session: search_notes(session, q, project_id, limit))
+    return [_search_result(note, score) for note, score in hits]
+
+@router.get("/notes/{project_id}", response_model=List[NoteCreate])
+async def get_notes(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(ProjectNote).where(ProjectNote.ProjectID == project_id))
+    return result.scalars().all()
+
+@router.put("/notes/{record_id}", response_model=NoteUpdate)
+async def update_note(record_id: int, note: NoteUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_note = await _get_note_or_404(db, record_id)
+
+    for key, value in note.dict(exclude_unset=True).items():
+        setattr(db_note, key, value)
+
+    db_note.LastEditDate = datetime.now()
+    db_note.LastEditMSID = getpass.getuser()
+    await db.commit()
+    await db.refresh(db_note)
+    note_search_index.index_note(db_note)
+    return db_note
+
+@router.delete("/notes/{record_id}")
+async def delete_note(record_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_note = await _get_note_or_404(db, record_id)
+
+    await db.delete(db_note)
+    await db.commit()
+    note_search_index.remove_note(record_id)
+    return {"message": "Note deleted successfully"}
@@ -0,0 +1,63 @@
+import getpass
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.session import get_db
+from app.schemas.platform_product import (
+    PlatformProduct, PlatformProductSelection, PlatformSelectionResult, SelectedPlatformProduct
+)
+from app.services.platform_product_catalog import platform_product_catalog
+from app.services.platform_selection_service import PlatformSelectionService
+
+router = APIRouter()
+
+@router.get("/platform-products/", response_model=List[PlatformProduct])
+def search_platform_products(
+    network_prefix: Optional[str] = None,
+    product_prefix: Optional[str] = None,
+    project_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Prefix lookup against the in-memory platform product catalog.
+
+    `project_id` matches networks sharing the project's first two characters,
+    as the legacy CSP LOB screen did.
+    """
+    if project_id is not None:
+        network_prefix = project_id[:2]
+    if network_prefix is None and product_prefix is None:
+        raise HTTPException(
+            status_code=400, detail="Pass network_prefix, product_prefix or project_id"
+        )
+    catalog = platform_product_catalog.ensure_fresh(db)
+    return [
+        product._asdict()
+        for product in catalog.search(network_prefix, product_prefix, limit=limit)
+    ]
+
+@router.get("/platform-products/selections/{project_id}", response_model=List[SelectedPlatformProduct])
+def get_platform_product_selection(project_id: str, db: Session = Depends(get_db)):
+    return PlatformSelectionService.get_selection(db, project_id)
+
+@router.put("/platform-products/selections/{project_id}", response_model=PlatformSelectionResult)
+def save_platform_product_selection(
+    project_id: str,
+    products: List[PlatformProductSelection],
+    project_status: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Replace the project's selected products with `products`. Only the
+    difference from the stored selection is written, in one transaction.
+    """
+    changes = PlatformSelectionService.save_selection(
+        db, project_id, [product.dict() for product in products],
+        project_status=project_status, user_msid=getpass.getuser()
+    )
+    return PlatformSelectionResult(
+        inserted=len(changes.to_insert),
+        deleted=len(changes.to_delete),
+        unchanged=changes.unchanged
+    )
@@ -1,24 +1,38 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.services.project_service import ProjectService
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate
+from app.schemas.project import Project, ProjectCreate, ProjectSearchResult, ProjectUpdate
+from app.utils.pagination import NEXT_CURSOR_HEADER
 import getpass
 
 router = APIRouter()
 
 @router.get("/projects/", response_model=List[Project])
 def read_projects(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve projects.
+    Retrieve projects, most recently edited first.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page. `skip` is still honoured (offset paging) when no cursor is given.
     """
-    projects = ProjectService.get_projects(db, skip=skip, limit=limit)
-    return projects
+    if skip and cursor is None:
+        return ProjectService.get_projects(db, skip=skip, limit=limit)
+
+    try:
+        page = ProjectService.get_projects_page(db, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 @router.post("/projects/", response_model=ProjectCreate)
 def create_project(
@@ -40,6 +54,19 @@ def create_project(
             detail=str(e)
         )
 
+# Declared before /projects/{record_id}, which would otherwise reject "search"
+@router.get("/projects/search", response_model=List[ProjectSearchResult])
+def search_projects(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Typeahead search over project ID, description, analyst, PM and benchmark file.
+    """
+    matches = ProjectService.search_projects(db, q, limit=limit)
+    return [dict(match.project._asdict(), score=match.score) for match in matches]
+
 @router.get("/projects/{record_id}", response_model=Project)
 def read_project(
     record_id: int,
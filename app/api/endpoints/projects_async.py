@@ -0,0 +1,138 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_async_db
+from app.services.project_service import ProjectService
+from app.schemas.project import Project, ProjectCreate, ProjectSearchResult, ProjectUpdate
+from app.utils.pagination import NEXT_CURSOR_HEADER
+import getpass
+
+router = APIRouter()
+
+# Service calls run through AsyncSession.run_sync: the service code stays
+# synchronous while the driver I/O is awaited on the event loop
+
+@router.get("/projects/", response_model=List[Project])
+async def read_projects(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve projects, most recently edited first.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page. `skip` is still honoured (offset paging) when no cursor is given.
+    """
+    if skip and cursor is None:
+        return await db.run_sync(
+            lambda session: ProjectService.get_projects(session, skip=skip, limit=limit)
+        )
+
+    try:
+        page = await db.run_sync(
+            lambda session: ProjectService.get_projects_page(session, cursor=cursor, limit=limit)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+@router.post("/projects/", response_model=ProjectCreate)
+async def create_project(
+    project: ProjectCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create new project.
+    """
+    try:
+        # Set the LastEditMSID if not provided
+        if not project.LastEditMSID:
+            project.LastEditMSID = getpass.getuser()
+
+        return await db.run_sync(
+            lambda session: ProjectService.create_project(db=session, project=project)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
+# Declared before /projects/{record_id}, which would otherwise reject "search"
+@router.get("/projects/search", response_model=List[ProjectSearchResult])
+async def search_projects(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Typeahead search over project ID, description, analyst, PM and benchmark file.
+    """
+    matches = await db.run_sync(
+        lambda session: ProjectService.search_projects(session, q, limit=limit)
+    )
+    return [dict(match.project._asdict(), score=match.score) for match in matches]
+
+@router.get("/projects/{record_id}", response_model=Project)
+async def read_project(
+    record_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get project by ID.
+    """
+    project = await db.run_sync(
+        lambda session: ProjectService.get_project(db=session, record_id=record_id)
+    )
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+@router.put("/projects/{record_id}", response_model=Project)
+async def update_project(
+    record_id: int,
+    project: ProjectUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update project.
+    """
+    updated_project = await db.run_sync(
+        lambda session: ProjectService.update_project(
+            db=session, record_id=record_id, project=project
+        )
+    )
+    if updated_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return updated_project
+
+@router.delete("/projects/{record_id}", response_model=Project)
+async def delete_project(
+    record_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete project.
+    """
+    project = await db.run_sync(
+        lambda session: ProjectService.delete_project(db=session, record_id=record_id)
+    )
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+@router.get("/projects/check/{project_id}")
+async def check_project_exists(
+    project_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Check if a project ID already exists"""
+    project = await db.run_sync(
+        lambda session: ProjectService.get_project_by_project_id(db=session, project_id=project_id)
+    )
+    return {"exists": project is not None}
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Header, Response
+from typing import Optional
+from app.schemas.reference_data import ReferenceData
+from app.services.reference_data import reference_registry
+
+router = APIRouter()
+
+@router.get("/reference-data", response_model=ReferenceData)
+def read_reference_data(response: Response, if_none_match: Optional[str] = Header(None)):
+    """All dropdown options, tagged with the registry version for client caching"""
+    data = reference_registry.ensure_loaded()
+    etag = f'"{data.version}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return data.to_dict()
@@ -1,13 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.session import get_db
 from app.models.service_area import ServiceArea
-from app.schemas.service_area import ServiceAreaCreate, ServiceAreaUpdate
+from app.schemas.service_area import (
+    ServiceAreaCounty, ServiceAreaCreate, ServiceAreaLoadStatus, ServiceAreaStageError,
+    ServiceAreaSyncResult, ServiceAreaTarget, ServiceAreaUpdate
+)
+from app.services.service_area_service import ServiceAreaService
+from app.services.service_area_engine import ServiceAreaEngine
+from app.services.service_area_stage_service import ServiceAreaStageService, StageReport
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from datetime import datetime
 
 router = APIRouter()
 
+def _load_status(load, report: Optional[StageReport] = None) -> ServiceAreaLoadStatus:
+    status = ServiceAreaLoadStatus.model_validate(load)
+    if report is not None:
+        status.errors = [
+            ServiceAreaStageError(row=e.row, county=e.county, message=e.message)
+            for e in report.errors
+        ]
+    return status
+
 @router.post("/service-areas/", response_model=ServiceAreaCreate)
 def create_service_area(service_area: ServiceAreaCreate, db: Session = Depends(get_db)):
     db_service_area = ServiceArea(**service_area.dict())
@@ -17,10 +33,69 @@ def create_service_area(service_area: ServiceAreaCreate, db: Session = Depends(g
     db.refresh(db_service_area)
     return db_service_area
 
+@router.get("/service-areas/", response_model=List[ServiceAreaCreate])
+def read_service_areas(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Page through all service areas; pass X-Next-Cursor back as `cursor`"""
+    try:
+        page = ServiceAreaService.get_service_areas_page(db, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
 @router.get("/service-areas/{project_id}", response_model=List[ServiceAreaCreate])
 def get_service_areas(project_id: str, db: Session = Depends(get_db)):
     return db.query(ServiceArea).filter(ServiceArea.ProjectID == project_id).all()
 
+@router.post("/service-areas/{project_id}/radius")
+def apply_service_area_radius(
+    project_id: str,
+    max_mileage: float,
+    dry_run: bool = False,
+    footprint: Optional[List[ServiceAreaCounty]] = Body(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute the project's service area as every county within `max_mileage`
+    of its footprint counties, writing only the rows that change.
+
+    A `footprint` replaces the stored one. Without one the stored footprint
+    is used; a project that has none and already carries a radius gets 400
+    until its footprint is given.
+    """
+    counties = [(c.State, c.County) for c in footprint] if footprint is not None else None
+    engine_call = ServiceAreaEngine.preview if dry_run else ServiceAreaEngine.apply
+    try:
+        diff = engine_call(db, project_id, max_mileage, counties)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return diff.summary()
+
+@router.put("/service-areas/{project_id}/sync", response_model=ServiceAreaSyncResult)
+def sync_service_areas(
+    project_id: str,
+    targets: List[ServiceAreaTarget],
+    db: Session = Depends(get_db)
+):
+    """
+    Make the project's service area match `targets`, inserting and deleting
+    only the counties that differ. Existing rows keep their flags.
+    """
+    changes = ServiceAreaService.sync_service_areas(
+        db, project_id, [target.dict(exclude_none=True) for target in targets]
+    )
+    return ServiceAreaSyncResult(
+        inserted=len(changes.to_insert),
+        deleted=len(changes.to_delete),
+        unchanged=changes.unchanged
+    )
+
 @router.put("/service-areas/{record_id}", response_model=ServiceAreaUpdate)
 def update_service_area(record_id: int, service_area: ServiceAreaUpdate, db: Session = Depends(get_db)):
     db_service_area = db.query(ServiceArea).filter(ServiceArea.RecordID == record_id).first()
@@ -42,4 +117,61 @@ def delete_service_area(record_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_service_area)
     db.commit()
-    return {"message": "Service Area deleted successfully"} 
\ No newline at end of file
+    return {"message": "Service Area deleted successfully"}
+
+def _get_load_or_404(db: Session, load_id: int):
+    load = ServiceAreaStageService.get_load(db, load_id)
+    if not load:
+        raise HTTPException(status_code=404, detail="Service Area load not found")
+    return load
+
+@router.post("/service-area-loads/", response_model=ServiceAreaLoadStatus)
+def create_service_area_load(
+    project_id: str,
+    rows: List[ServiceAreaTarget],
+    source: str = "api",
+    db: Session = Depends(get_db)
+):
+    """
+    Start a staged load for the project with its first batch of rows.
+    Rows are written to the stage table only; promote the load to apply them.
+    """
+    load = ServiceAreaStageService.start_load(db, project_id, source=source)
+    report = ServiceAreaStageService.stage_rows(db, load.LoadID, [row.dict(exclude_unset=True) for row in rows])
+    return _load_status(load, report)
+
+@router.post("/service-area-loads/{load_id}/rows", response_model=ServiceAreaLoadStatus)
+def stage_service_area_rows(load_id: int, rows: List[ServiceAreaTarget], db: Session = Depends(get_db)):
+    """Append another batch of rows to a load that is still staging"""
+    load = _get_load_or_404(db, load_id)
+    try:
+        report = ServiceAreaStageService.stage_rows(db, load_id, [row.dict(exclude_unset=True) for row in rows])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _load_status(load, report)
+
+@router.get("/service-area-loads/{load_id}", response_model=ServiceAreaLoadStatus)
+def get_service_area_load(load_id: int, db: Session = Depends(get_db)):
+    return _load_status(_get_load_or_404(db, load_id))
+
+@router.post("/service-area-loads/{load_id}/promote", response_model=ServiceAreaLoadStatus)
+def promote_service_area_load(load_id: int, replace: bool = False, db: Session = Depends(get_db)):
+    """
+    Apply the staged rows to the live service area in one set-based MERGE.
+    With `replace`, counties not in the load are removed from the project.
+    """
+    _get_load_or_404(db, load_id)
+    try:
+        load = ServiceAreaStageService.promote(db, load_id, replace=replace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _load_status(load)
+
+@router.delete("/service-area-loads/{load_id}", response_model=ServiceAreaLoadStatus)
+def discard_service_area_load(load_id: int, db: Session = Depends(get_db)):
+    _get_load_or_404(db, load_id)
+    try:
+        load = ServiceAreaStageService.discard(db, load_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _load_status(load)
@@ -0,0 +1,206 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.api.deps import get_async_db
+from app.models.service_area import ServiceArea
+from app.schemas.service_area import (
+    ServiceAreaCounty, ServiceAreaCreate, ServiceAreaLoadStatus, ServiceAreaStageError,
+    ServiceAreaSyncResult, ServiceAreaTarget, ServiceAreaUpdate
+)
+from app.services.service_area_service import ServiceAreaService
+from app.services.service_area_engine import ServiceAreaEngine
+from app.services.service_area_stage_service import ServiceAreaStageService, StageReport
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from datetime import datetime
+
+router = APIRouter()
+
+def _load_status(load, report: Optional[StageReport] = None) -> ServiceAreaLoadStatus:
+    status = ServiceAreaLoadStatus.model_validate(load)
+    if report is not None:
+        status.errors = [
+            ServiceAreaStageError(row=e.row, county=e.county, message=e.message)
+            for e in report.errors
+        ]
+    return status
+
+async def _get_service_area_or_404(db: AsyncSession, record_id: int) -> ServiceArea:
+    result = await db.execute(select(ServiceArea).where(ServiceArea.RecordID == record_id))
+    db_service_area = result.scalars().first()
+    if not db_service_area:
+        raise HTTPException(status_code=404, detail="Service Area not found")
+    return db_service_area
+
+@router.post("/service-areas/", response_model=ServiceAreaCreate)
+async def create_service_area(service_area: ServiceAreaCreate, db: AsyncSession = Depends(get_async_db)):
+    db_service_area = ServiceArea(**service_area.dict())
+    db_service_area.DataLoadDate = datetime.now()
+    db.add(db_service_area)
+    await db.commit()
+    await db.refresh(db_service_area)
+    return db_service_area
+
+@router.get("/service-areas/", response_model=List[ServiceAreaCreate])
+async def read_service_areas(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Page through all service areas; pass X-Next-Cursor back as `cursor`"""
+    try:
+        page = await db.run_sync(
+            lambda session: ServiceAreaService.get_service_areas_page(session, cursor=cursor, limit=limit)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+@router.get("/service-areas/{project_id}", response_model=List[ServiceAreaCreate])
+async def get_service_areas(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(ServiceArea).where(ServiceArea.ProjectID == project_id))
+    return result.scalars().all()
+
+@router.post("/service-areas/{project_id}/radius")
+async def apply_service_area_radius(
+    project_id: str,
+    max_mileage: float,
+    dry_run: bool = False,
+    footprint: Optional[List[ServiceAreaCounty]] = Body(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Recompute the project's service area as every county within `max_mileage`
+    of its footprint counties, writing only the rows that change.
+
+    A `footprint` replaces the stored one. Without one the stored footprint
+    is used; a project that has none and already carries a radius gets 400
+    until its footprint is given.
+    """
+    counties = [(c.State, c.County) for c in footprint] if footprint is not None else None
+    engine_call = ServiceAreaEngine.preview if dry_run else ServiceAreaEngine.apply
+    try:
+        diff = await db.run_sync(
+            lambda session: engine_call(session, project_id, max_mileage, counties)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return diff.summary()
+
+@router.put("/service-areas/{project_id}/sync", response_model=ServiceAreaSyncResult)
+async def sync_service_areas(
+    project_id: str,
+    targets: List[ServiceAreaTarget],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Make the project's service area match `targets`, inserting and deleting
+    only the counties that differ. Existing rows keep their flags.
+    """
+    target_rows = [target.dict(exclude_none=True) for target in targets]
+    changes = await db.run_sync(
+        lambda session: ServiceAreaService.sync_service_areas(session, project_id, target_rows)
+    )
+    return ServiceAreaSyncResult(
+        inserted=len(changes.to_insert),
+        deleted=len(changes.to_delete),
+        unchanged=changes.unchanged
+    )
+
+@router.put("/service-areas/{record_id}", response_model=ServiceAreaUpdate)
+async def update_service_area(record_id: int, service_area: ServiceAreaUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_service_area = await _get_service_area_or_404(db, record_id)
+
+    for key, value in service_area.dict(exclude_unset=True).items():
+        setattr(db_service_area, key, value)
+
+    await db.commit()
+    await db.refresh(db_service_area)
+    return db_service_area
+
+@router.delete("/service-areas/{record_id}")
+async def delete_service_area(record_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_service_area = await _get_service_area_or_404(db, record_id)
+
+    await db.delete(db_service_area)
+    await db.commit()
+    return {"message": "Service Area deleted successfully"}
+
+
+async def _get_load_or_404(db: AsyncSession, load_id: int):
+    load = await db.run_sync(lambda session: ServiceAreaStageService.get_load(session, load_id))
+    if not load:
+        raise HTTPException(status_code=404, detail="Service Area load not found")
+    return load
+
+@router.post("/service-area-loads/", response_model=ServiceAreaLoadStatus)
+async def create_service_area_load(
+    project_id: str,
+    rows: List[ServiceAreaTarget],
+    source: str = "api",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Start a staged load for the project with its first batch of rows.
+    Rows are written to the stage table only; promote the load to apply them.
+    """
+    row_dicts = [row.dict(exclude_unset=True) for row in rows]
+
+    def stage(session):
+        load = ServiceAreaStageService.start_load(session, project_id, source=source)
+        return load, ServiceAreaStageService.stage_rows(session, load.LoadID, row_dicts)
+
+    load, report = await db.run_sync(stage)
+    return _load_status(load, report)
+
+@router.post("/service-area-loads/{load_id}/rows", response_model=ServiceAreaLoadStatus)
+async def stage_service_area_rows(
+    load_id: int,
+    rows: List[ServiceAreaTarget],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Append another batch of rows to a load that is still staging"""
+    load = await _get_load_or_404(db, load_id)
+    row_dicts = [row.dict(exclude_unset=True) for row in rows]
+    try:
+        report = await db.run_sync(
+            lambda session: ServiceAreaStageService.stage_rows(session, load_id, row_dicts)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _load_status(load, report)
+
+@router.get("/service-area-loads/{load_id}", response_model=ServiceAreaLoadStatus)
+async def get_service_area_load(load_id: int, db: AsyncSession = Depends(get_async_db)):
+    return _load_status(await _get_load_or_404(db, load_id))
+
+@router.post("/service-area-loads/{load_id}/promote", response_model=ServiceAreaLoadStatus)
+async def promote_service_area_load(
+    load_id: int,
+    replace: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Apply the staged rows to the live service area in one set-based MERGE.
+    With `replace`, counties not in the load are removed from the project.
+    """
+    await _get_load_or_404(db, load_id)
+    try:
+        load = await db.run_sync(
+            lambda session: ServiceAreaStageService.promote(session, load_id, replace=replace)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _load_status(load)
+
+@router.delete("/service-area-loads/{load_id}", response_model=ServiceAreaLoadStatus)
+async def discard_service_area_load(load_id: int, db: AsyncSession = Depends(get_async_db)):
+    await _get_load_or_404(db, load_id)
+    try:
+        load = await db.run_sync(lambda session: ServiceAreaStageService.discard(session, load_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _load_status(load)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.session import get_db
+from app.schemas.strenuus_product import StrenuusProduct
+from app.services.strenuus_product_cache import strenuus_product_cache
+
+router = APIRouter()
+
+@router.get("/strenuus-products/payors", response_model=List[str])
+def read_payors(db: Session = Depends(get_db)):
+    """Distinct payors for competitor entry dropdowns, served from the reference cache"""
+    return strenuus_product_cache.ensure_fresh(db).payors()
+
+@router.get("/strenuus-products/", response_model=List[StrenuusProduct])
+def read_strenuus_products(
+    payor: Optional[str] = None,
+    product: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Products for a payor, or the products with a given name"""
+    cache = strenuus_product_cache.ensure_fresh(db)
+    if product is not None:
+        matches = cache.get_by_product(product, payor)
+    elif payor is not None:
+        matches = cache.products_for_payor(payor)
+    else:
+        raise HTTPException(status_code=400, detail="Pass payor or product")
+    return [match._asdict() for match in matches]
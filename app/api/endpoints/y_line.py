@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from app.api.deps import get_db
-from app.schemas.y_line import YLineCreate, YLineUpdate, YLineResponse
+from app.models.y_line import YLineStatus
+from app.schemas.y_line import (
+    YLineBulkStatusResult, YLineCreate, YLineIngestReport, YLineProjectRollup, YLineRollupReconcileResult,
+    YLineSearchPage, YLineUpdate, YLineResponse
+)
 from app.services.y_line_service import YLineService
 
 router = APIRouter()
@@ -18,6 +22,47 @@ def create_y_line(
     y_line_service = YLineService(db)
     return y_line_service.create_y_line(project_id, y_line_data)
 
+# Declared before /y-lines/{y_line_id}, which would otherwise capture "bulk-status" and "search"
+@router.put("/y-lines/bulk-status", response_model=YLineBulkStatusResult)
+def bulk_update_status(
+    y_line_ids: List[int],
+    status: YLineStatus,
+    return_rows: bool = False,
+    strict: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Update status for multiple Y-Lines; counts and unmatched IDs are returned.
+
+    With return_rows the updated Y-Lines are included. With strict any
+    unmatched ID rolls the whole change back with 404.
+    """
+    y_line_service = YLineService(db)
+    return y_line_service.bulk_update_status(y_line_ids, status, return_rows=return_rows, strict=strict)
+
+@router.get("/y-lines/search", response_model=YLineSearchPage)
+def search_y_lines(
+    project_id: Optional[int] = None,
+    status: Optional[YLineStatus] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    q: Optional[str] = None,
+    after: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    facets: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Search Y-Lines a page at a time, continuing after the last id returned.
+
+    q matches the start of ipa_number or product_code, and a word in the
+    description when Y_LINE_FULLTEXT_SEARCH is on. The total and counts by status and value bucket describe
+    every match and can be turned off after the first page.
+    """
+    y_line_service = YLineService(db)
+    return y_line_service.search_y_lines(
+        project_id=project_id, status=status, min_value=min_value, max_value=max_value,
+        q=q, after=after, limit=limit, facets=facets
+    )
+
 @router.get("/y-lines/{y_line_id}", response_model=YLineResponse)
 def get_y_line(
     y_line_id: int,
@@ -66,12 +111,35 @@ def bulk_create_y_lines(
     y_line_service = YLineService(db)
     return y_line_service.bulk_create_y_lines(project_id, y_lines_data)
 
-@router.put("/y-lines/bulk-status", response_model=List[YLineResponse])
-def bulk_update_status(
-    y_line_ids: List[int],
-    status: YLineStatus,
+@router.post("/{project_id}/y-lines/ingest", response_model=YLineIngestReport)
+def ingest_y_lines(
+    project_id: int,
+    rows: List[Dict[str, Any]],
+    partial: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Validate and insert a Y-Line file, reporting each row's outcome.
+
+    Without partial any rejected row means nothing is inserted; with it the
+    valid rows are inserted and the rejected ones reported.
+    """
+    y_line_service = YLineService(db)
+    return y_line_service.ingest_y_lines(project_id, rows, partial=partial)
+
+@router.get("/{project_id}/y-lines/rollup", response_model=YLineProjectRollup)
+def get_project_rollup(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """Count and value totals of a project's Y-Lines, overall and by status"""
+    y_line_service = YLineService(db)
+    return y_line_service.get_project_rollup(project_id)
+
+@router.post("/y-lines/rollup/reconcile", response_model=YLineRollupReconcileResult)
+def reconcile_rollups(
+    project_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """Update status for multiple Y-Lines"""
+    """Recompute rollups from the Y-Lines themselves, for one project or all"""
     y_line_service = YLineService(db)
-    return y_line_service.bulk_update_status(y_line_ids, status) 
\ No newline at end of file
+    return y_line_service.reconcile_rollups(project_id)
@@ -0,0 +1,161 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+
+from app.api.deps import get_async_db
+from app.models.y_line import YLineStatus
+from app.schemas.y_line import (
+    YLineBulkStatusResult, YLineCreate, YLineIngestReport, YLineProjectRollup, YLineRollupReconcileResult,
+    YLineSearchPage, YLineUpdate, YLineResponse
+)
+from app.services.y_line_service import YLineService
+
+router = APIRouter()
+
+# YLineService is synchronous; run_sync hands it a Session whose I/O is
+# awaited on the event loop instead of blocking a threadpool worker
+
+@router.post("/{project_id}/y-lines/", response_model=YLineResponse)
+async def create_y_line(
+    project_id: int,
+    y_line_data: YLineCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new Y-Line for a project"""
+    return await db.run_sync(
+        lambda session: YLineService(session).create_y_line(project_id, y_line_data)
+    )
+
+# Declared before /y-lines/{y_line_id}, which would otherwise capture "bulk-status" and "search"
+@router.put("/y-lines/bulk-status", response_model=YLineBulkStatusResult)
+async def bulk_update_status(
+    y_line_ids: List[int],
+    status: YLineStatus,
+    return_rows: bool = False,
+    strict: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update status for multiple Y-Lines; counts and unmatched IDs are returned.
+
+    With return_rows the updated Y-Lines are included. With strict any
+    unmatched ID rolls the whole change back with 404.
+    """
+    return await db.run_sync(
+        lambda session: YLineService(session).bulk_update_status(
+            y_line_ids, status, return_rows=return_rows, strict=strict
+        )
+    )
+
+@router.get("/y-lines/search", response_model=YLineSearchPage)
+async def search_y_lines(
+    project_id: Optional[int] = None,
+    status: Optional[YLineStatus] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    q: Optional[str] = None,
+    after: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    facets: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search Y-Lines a page at a time, continuing after the last id returned.
+
+    q matches the start of ipa_number or product_code, and a word in the
+    description when Y_LINE_FULLTEXT_SEARCH is on. The total and counts by status and value bucket describe
+    every match and can be turned off after the first page.
+    """
+    return await db.run_sync(
+        lambda session: YLineService(session).search_y_lines(
+            project_id=project_id, status=status, min_value=min_value, max_value=max_value,
+            q=q, after=after, limit=limit, facets=facets
+        )
+    )
+
+@router.get("/y-lines/{y_line_id}", response_model=YLineResponse)
+async def get_y_line(
+    y_line_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a specific Y-Line by ID"""
+    return await db.run_sync(
+        lambda session: YLineService(session).get_y_line(y_line_id)
+    )
+
+@router.get("/{project_id}/y-lines/", response_model=List[YLineResponse])
+async def get_project_y_lines(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all Y-Lines for a project"""
+    return await db.run_sync(
+        lambda session: YLineService(session).get_project_y_lines(project_id)
+    )
+
+@router.put("/y-lines/{y_line_id}", response_model=YLineResponse)
+async def update_y_line(
+    y_line_id: int,
+    y_line_data: YLineUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a Y-Line"""
+    return await db.run_sync(
+        lambda session: YLineService(session).update_y_line(y_line_id, y_line_data)
+    )
+
+@router.delete("/y-lines/{y_line_id}")
+async def delete_y_line(
+    y_line_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a Y-Line"""
+    await db.run_sync(
+        lambda session: YLineService(session).delete_y_line(y_line_id)
+    )
+    return {"message": "Y-Line deleted successfully"}
+
+@router.post("/{project_id}/y-lines/bulk", response_model=List[YLineResponse])
+async def bulk_create_y_lines(
+    project_id: int,
+    y_lines_data: List[YLineCreate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create multiple Y-Lines for a project"""
+    return await db.run_sync(
+        lambda session: YLineService(session).bulk_create_y_lines(project_id, y_lines_data)
+    )
+
+@router.post("/{project_id}/y-lines/ingest", response_model=YLineIngestReport)
+async def ingest_y_lines(
+    project_id: int,
+    rows: List[Dict[str, Any]],
+    partial: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Validate and insert a Y-Line file, reporting each row's outcome.
+
+    Without partial any rejected row means nothing is inserted; with it the
+    valid rows are inserted and the rejected ones reported.
+    """
+    return await db.run_sync(
+        lambda session: YLineService(session).ingest_y_lines(project_id, rows, partial=partial)
+    )
+
+@router.get("/{project_id}/y-lines/rollup", response_model=YLineProjectRollup)
+async def get_project_rollup(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Count and value totals of a project's Y-Lines, overall and by status"""
+    return await db.run_sync(
+        lambda session: YLineService(session).get_project_rollup(project_id)
+    )
+
+@router.post("/y-lines/rollup/reconcile", response_model=YLineRollupReconcileResult)
+async def reconcile_rollups(
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Recompute rollups from the Y-Lines themselves, for one project or all"""
+    return await db.run_sync(
+        lambda session: YLineService(session).reconcile_rollups(project_id)
+    )
@@ -5,6 +5,13 @@ import urllib.parse
 
 load_dotenv()
 
+# Sync URL prefix -> async driver used for the same backend
+ASYNC_DRIVERS = (
+    ("mssql+pyodbc://", "mssql+aioodbc://"),
+    ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+    ("sqlite://", "sqlite+aiosqlite://"),
+)
+
 class Settings(BaseSettings):
     # Database settings
     DB_SERVER: str = os.getenv("DB_SERVER", "")
@@ -12,6 +19,58 @@ class Settings(BaseSettings):
     DB_DRIVER: str = os.getenv("DB_DRIVER", "ODBC Driver 17 for SQL Server")
     DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
     DB_TRUSTED_CONNECTION: bool = True
+    # Optional SQLAlchemy URL overrides, e.g. sqlite:///./axis_local.db for local work
+    DB_URL: str = os.getenv("DB_URL", "")
+    DB_ASYNC_URL: str = os.getenv("DB_ASYNC_URL", "")
+    # Serve the API routers through the async session when enabled
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "False").lower() == "true"
+
+    # Connection pool settings
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+    DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", "0"))
+
+    # Query result cache settings
+    QUERY_CACHE_MAX_MB: int = int(os.getenv("QUERY_CACHE_MAX_MB", "64"))
+    QUERY_CACHE_DEFAULT_TTL: int = int(os.getenv("QUERY_CACHE_DEFAULT_TTL", "60"))
+
+    # Slow query capture: statements at or over the threshold are kept in a
+    # ring buffer, with the estimated plan on SQL Server
+    SLOW_QUERY_THRESHOLD_MS: int = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500"))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+    SLOW_QUERY_CAPTURE_PLAN: bool = os.getenv("SLOW_QUERY_CAPTURE_PLAN", "True").lower() == "true"
+
+    # Seconds between DataLoadDate checks of the in-memory platform product catalog
+    PLATFORM_CATALOG_REFRESH_SECONDS: int = int(os.getenv("PLATFORM_CATALOG_REFRESH_SECONDS", "300"))
+
+    # Seconds between version checks of the cached Strenuus product reference table
+    STRENUUS_CACHE_TTL_SECONDS: int = int(os.getenv("STRENUUS_CACHE_TTL_SECONDS", "600"))
+
+    # Seconds before the dropdown reference data (and its ETag version) is re-read
+    REFERENCE_DATA_TTL_SECONDS: int = int(os.getenv("REFERENCE_DATA_TTL_SECONDS", "600"))
+
+    # Notes full-text index: where it is saved, how often it checks the table
+    # for notes edited elsewhere, and the minimum seconds between saves
+    NOTES_INDEX_PATH: str = os.getenv("NOTES_INDEX_PATH", "data/notes_index.json")
+    NOTES_INDEX_REFRESH_SECONDS: int = int(os.getenv("NOTES_INDEX_REFRESH_SECONDS", "60"))
+    NOTES_INDEX_SAVE_SECONDS: int = int(os.getenv("NOTES_INDEX_SAVE_SECONDS", "30"))
+
+    # Seconds between LastEditDate checks of the in-memory project search index
+    PROJECT_SEARCH_REFRESH_SECONDS: int = int(os.getenv("PROJECT_SEARCH_REFRESH_SECONDS", "30"))
+
+    # Search Y-Line descriptions with CONTAINS; needs the full-text index in
+    # app.services.y_line_search.FULLTEXT_INDEX_DDL. Off, /y-lines/search
+    # matches ipa_number and product_code prefixes only
+    Y_LINE_FULLTEXT_SEARCH: bool = os.getenv("Y_LINE_FULLTEXT_SEARCH", "False").lower() == "true"
+
+    # Seconds between recomputing Y-Line rollups from source (0 disables)
+    Y_LINE_ROLLUP_RECONCILE_SECONDS: int = int(os.getenv("Y_LINE_ROLLUP_RECONCILE_SECONDS", "3600"))
+
+    # Table Y-Lines are read from: "y_lines", or "translation" for the legacy
+    # CS_EXP_YLine_Translation until app.services.y_line_migration has run
+    Y_LINE_STORAGE: str = os.getenv("Y_LINE_STORAGE", "y_lines")
 
     # API settings
     API_V1_STR: str = "/api/v1"
@@ -23,6 +82,9 @@ class Settings(BaseSettings):
     @property
     def DATABASE_URL(self) -> str:
         """Constructs the database URL for Windows Authentication"""
+        if self.DB_URL:
+            return self.DB_URL
+
         # Clean up the driver name
         driver = self.DB_DRIVER.replace('+', ' ')
         
@@ -39,4 +101,16 @@ class Settings(BaseSettings):
         
         return f"mssql+pyodbc:///?odbc_connect={params}"
 
-settings = Settings() 
\ No newline at end of file
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Database URL using the async driver for the configured backend"""
+        if self.DB_ASYNC_URL:
+            return self.DB_ASYNC_URL
+
+        url = self.DATABASE_URL
+        for sync_prefix, async_prefix in ASYNC_DRIVERS:
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix):]
+        return url
+
+settings = Settings()
@@ -0,0 +1,78 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.utils.metrics import instrument_engine
+import logging
+import os
+import threading
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Created lazily, like the sync engine in app.db.session
+_async_engine = None
+_async_engine_pid = None
+_async_engine_lock = threading.Lock()
+
+# expire_on_commit=False: attributes must stay readable after commit because
+# async sessions cannot lazy-load them during response serialisation
+_async_session_factory = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+def _async_engine_options(url: str) -> dict:
+    """Build create_async_engine keyword arguments for the configured backend"""
+    options = {
+        'echo': settings.DB_ECHO,
+        'pool_pre_ping': True,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+    }
+    if make_url(url).get_backend_name() != 'sqlite':
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+def get_async_engine():
+    """Return the process-wide async engine, creating it on first use"""
+    global _async_engine, _async_engine_pid
+    pid = os.getpid()
+    if _async_engine is not None and _async_engine_pid == pid:
+        return _async_engine
+
+    with _async_engine_lock:
+        if _async_engine is None:
+            url = settings.ASYNC_DATABASE_URL
+            _async_engine = create_async_engine(url, **_async_engine_options(url))
+            instrument_engine(_async_engine.sync_engine)
+            _async_session_factory.configure(bind=_async_engine)
+            logger.info("Async database engine created")
+        elif _async_engine_pid != pid:
+            # Drop connections inherited from the parent process
+            _async_engine.sync_engine.dispose(close=False)
+            logger.info(f"Async database pool re-initialised for worker process {pid}")
+        _async_engine_pid = pid
+    return _async_engine
+
+async def dispose_async_engine():
+    """Close all pooled async connections and forget the engine"""
+    global _async_engine, _async_engine_pid
+    engine = _async_engine
+    _async_engine = None
+    _async_engine_pid = None
+    if engine is not None:
+        await engine.dispose()
+
+def AsyncSessionLocal(**kwargs) -> AsyncSession:
+    """Create a new async session bound to the lazily created engine"""
+    get_async_engine()
+    return _async_session_factory(**kwargs)
+
+async def get_async_db():
+    """Dependency for getting async database sessions"""
+    async with AsyncSessionLocal() as db:
+        yield db
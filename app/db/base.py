@@ -6,5 +6,9 @@ Base = declarative_base()
 
 def init_db(engine):
     # Import all models here to ensure they're registered
-    from app.models import Project, Competitor, ServiceArea, YLine, ProjectNote
+    from app.models import (
+        Project, Competitor, ServiceArea, ServiceAreaFootprint, YLine, ProjectNote, CountyCentroid,
+        ServiceAreaLoad, ServiceAreaStage, PlatformLoadProduct, SelectedPlatformProduct,
+        StrenuusProduct, ProjectType
+    )
     Base.metadata.create_all(bind=engine) 
\ No newline at end of file
@@ -1,11 +1,38 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Type, TypeVar, Union
+from sqlalchemy import and_, bindparam, delete, false, insert, inspect, or_, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi.encoders import jsonable_encoder
 from app.db.base import Base
+from app.utils.pagination import Page, decode_cursor, encode_cursor
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Rows per transaction for the bulk_* methods. Also keeps IN lists well
+# under SQL Server's 2100-parameter limit.
+BULK_CHUNK_SIZE = 1000
+
+
+@dataclass
+class ChunkFailure:
+    """A chunk that was rolled back; `offset` indexes into the caller's input"""
+    offset: int
+    size: int
+    error: str
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk_* call"""
+    affected: int = 0
+    ids: List[Any] = field(default_factory=list)
+    failures: List[ChunkFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
 class CRUDBase(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -26,6 +53,42 @@ class CRUDBase(Generic[ModelType]):
             db.rollback()
             raise e
 
+    def get_multi_keyset(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: Sequence[str] = ("RecordID",),
+        descending: bool = False
+    ) -> Page:
+        """Seek pagination: each page starts after the sort key of the last row.
+
+        The last column in ``order_by`` must be unique (normally RecordID) so
+        the ordering is total. Raises ValueError for a malformed cursor.
+        """
+        columns = [getattr(self.model, name) for name in order_by]
+        query = db.query(self.model)
+
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(columns):
+                raise ValueError("Invalid cursor")
+            query = query.filter(_seek_predicate(columns, values, descending))
+
+        ordering = [c.desc() if descending else c.asc() for c in columns]
+        try:
+            rows = query.order_by(*ordering).limit(limit + 1).all()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise e
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([getattr(rows[-1], name) for name in order_by])
+        return Page(items=rows, next_cursor=next_cursor)
+
     def create(self, db: Session, *, obj_in: Dict[str, Any]) -> ModelType:
         try:
             obj_data = jsonable_encoder(obj_in)
@@ -47,9 +110,9 @@ class CRUDBase(Generic[ModelType]):
                 update_data = obj_in
             else:
                 update_data = obj_in.dict(exclude_unset=True)
-            for field in obj_data:
-                if field in update_data:
-                    setattr(db_obj, field, update_data[field])
+            for name in obj_data:
+                if name in update_data:
+                    setattr(db_obj, name, update_data[name])
             db.add(db_obj)
             db.commit()
             db.refresh(db_obj)
@@ -58,6 +121,106 @@ class CRUDBase(Generic[ModelType]):
             db.rollback()
             raise e
 
+    def bulk_create(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        return_ids: bool = False
+    ) -> BulkResult:
+        """Insert rows with one executemany per chunk, committing each chunk.
+
+        With ``return_ids`` the generated keys are fetched in the same round
+        trip (OUTPUT INSERTED on SQL Server) and returned in input order.
+        """
+        stmt = insert(self.model)
+        if return_ids:
+            stmt = stmt.returning(self._pk, sort_by_parameter_order=True)
+
+        def run(chunk):
+            executed = db.execute(stmt, chunk)
+            return len(chunk), executed.scalars().all() if return_ids else []
+
+        return self._run_chunked(db, objs_in, chunk_size, run)
+
+    def bulk_update(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> BulkResult:
+        """Update rows by primary key; every dict must include the key column.
+
+        Rows are grouped by the set of columns they touch and each group is
+        sent as a single executemany. pyodbc reports rows sent, not rows
+        matched, for an executemany, so the chunk's keys are read back in
+        the same transaction: ``ids`` holds the keys that matched and
+        ``affected`` their count, leaving out keys that no longer exist.
+        """
+        mapper = inspect(self.model)
+        pk = self._pk
+        key = mapper.get_property_by_column(pk).key
+
+        def run(chunk):
+            groups: Dict[tuple, List[Dict[str, Any]]] = {}
+            for obj in chunk:
+                names = tuple(sorted(name for name in obj if name != key))
+                groups.setdefault(names, []).append(obj)
+            for names, objs in groups.items():
+                stmt = (
+                    update(pk.table)
+                    .where(pk == bindparam("_pk"))
+                    .values({mapper.columns[name]: bindparam(f"_{name}") for name in names})
+                )
+                params = [{"_pk": obj[key], **{f"_{name}": obj[name] for name in names}} for obj in objs]
+                db.execute(stmt, params)
+            keys = list({obj[key] for obj in chunk})
+            matched = db.execute(select(pk).where(pk.in_(keys)).order_by(pk)).scalars().all()
+            return len(matched), matched
+
+        return self._run_chunked(db, objs_in, chunk_size, run)
+
+    def bulk_delete(
+        self,
+        db: Session,
+        *,
+        ids: Sequence[Any],
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> BulkResult:
+        """Delete rows by primary key with one DELETE ... IN per chunk"""
+        pk = self._pk
+
+        def run(chunk):
+            stmt = delete(self.model).where(pk.in_(chunk))
+            executed = db.execute(stmt, execution_options={"synchronize_session": False})
+            return executed.rowcount, []
+
+        return self._run_chunked(db, ids, chunk_size, run)
+
+    @property
+    def _pk(self):
+        return inspect(self.model).primary_key[0]
+
+    def _run_chunked(self, db: Session, items: Sequence[Any], chunk_size: int, run) -> BulkResult:
+        """Apply ``run`` to each chunk in its own transaction.
+
+        ``run`` returns (rows affected, generated or matched ids). A failing chunk is
+        rolled back and recorded; later chunks still run.
+        """
+        result = BulkResult()
+        for offset, chunk in _chunks(items, chunk_size):
+            try:
+                affected, ids = run(chunk)
+                db.commit()
+                result.affected += affected
+                result.ids.extend(ids)
+            except SQLAlchemyError as e:
+                db.rollback()
+                result.failures.append(ChunkFailure(offset=offset, size=len(chunk), error=str(e)))
+        return result
+
     def remove(self, db: Session, *, record_id: int) -> ModelType:
         try:
             obj = db.query(self.model).get(record_id)
@@ -66,4 +229,40 @@ class CRUDBase(Generic[ModelType]):
             return obj
         except SQLAlchemyError as e:
             db.rollback()
-            raise e 
\ No newline at end of file
+            raise e
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator:
+    if size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    items = list(items)
+    for offset in range(0, len(items), size):
+        yield offset, items[offset:offset + size]
+
+
+def _after(column, value, descending: bool):
+    """Rows strictly after ``value`` in the sort order.
+
+    NULL sorts lowest on SQL Server (and SQLite): first when ascending,
+    last when descending.
+    """
+    if descending:
+        if value is None:
+            return false()
+        return or_(column < value, column.is_(None))
+    if value is None:
+        return column.isnot(None)
+    return column > value
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _seek_predicate(columns, values, descending: bool):
+    """(c1, c2, ...) after (v1, v2, ...) expanded into OR-of-ANDs"""
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        prefix = [_equal(c, v) for c, v in zip(columns[:i], values[:i])]
+        clauses.append(and_(*prefix, _after(column, value, descending)))
+    return or_(*clauses)
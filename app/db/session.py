@@ -1,31 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.utils.metrics import instrument_engine
 import logging
+import os
+import threading
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-try:
-    # Create engine using Windows Authentication
-    engine = create_engine(
-        settings.DATABASE_URL,
-        echo=settings.DB_ECHO,
-        pool_pre_ping=True,
-        pool_recycle=3600,
-        fast_executemany=True
-    )
+# The engine is created on first use rather than at import time, so importing
+# models, schemas or services never blocks on an ODBC handshake
+_engine = None
+_engine_pid = None
+_engine_lock = threading.Lock()
 
-    # Test the connection
-    with engine.connect() as connection:
-        logger.info("Successfully connected to database")
+# Session factory; bound to the engine when the engine is created
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
 
-except Exception as e:
-    logger.error(f"Error connecting to database: {str(e)}")
-    raise
+def _engine_options(url: str) -> dict:
+    """Build create_engine keyword arguments for the configured backend"""
+    options = {
+        'echo': settings.DB_ECHO,
+        'pool_pre_ping': True,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+    }
+    backend = make_url(url).get_backend_name()
+    if backend != 'sqlite':
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    if backend == 'mssql':
+        options['fast_executemany'] = True
+    return options
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_engine():
+    """Return the process-wide engine, creating it on first use.
+
+    After a fork (multi-worker uvicorn/gunicorn) the child must not reuse the
+    parent's pooled connections, so the pool is reset the first time the
+    engine is used in a new process.
+    """
+    global _engine, _engine_pid
+    pid = os.getpid()
+    if _engine is not None and _engine_pid == pid:
+        return _engine
+
+    with _engine_lock:
+        if _engine is None:
+            url = settings.DATABASE_URL
+            _engine = create_engine(url, **_engine_options(url))
+            instrument_engine(_engine)
+            _session_factory.configure(bind=_engine)
+            logger.info("Database engine created")
+        elif _engine_pid != pid:
+            # Drop inherited connections without closing the parent's sockets
+            _engine.dispose(close=False)
+            logger.info(f"Database pool re-initialised for worker process {pid}")
+        _engine_pid = pid
+    return _engine
+
+def dispose_engine():
+    """Close all pooled connections and forget the engine"""
+    global _engine, _engine_pid
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _engine_pid = None
+
+def warm_up_pool(connections: int = None) -> int:
+    """Pre-open pooled connections so the first requests skip the handshake"""
+    count = settings.DB_POOL_WARMUP if connections is None else connections
+    count = min(count, settings.DB_POOL_SIZE)
+    if count <= 0:
+        return 0
+
+    engine = get_engine()
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        opened = list(executor.map(lambda _: engine.connect(), range(count)))
+    # Closing returns the connections to the pool, where they stay open
+    for connection in opened:
+        connection.close()
+    logger.info(f"Warmed up {len(opened)} database connections")
+    return len(opened)
+
+def SessionLocal(**kwargs):
+    """Create a new session bound to the lazily created engine"""
+    get_engine()
+    return _session_factory(**kwargs)
+
+def __getattr__(name):
+    # Keep `from app.db.session import engine` working without eager creation
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_db():
     """Dependency for getting database sessions"""
@@ -39,8 +112,8 @@ def init_db():
     """Initialize database with required tables"""
     from app.db.base import Base  # Import all models here
     try:
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
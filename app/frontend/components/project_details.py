@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 from app.db.session import get_db
+from app.schemas.competitor import CompetitorCreate
+from app.services.competitor_service import CompetitorService
+from app.services.strenuus_product_cache import strenuus_product_cache
 from datetime import datetime
 import getpass
 
@@ -53,26 +56,39 @@ def display_competitors(project_id):
     
     # Add new competitor
     with st.expander("Add New Competitor"):
-        with st.form("new_competitor"):
-            strenuus_code = st.text_input("Strenuus Code")
-            payor = st.text_input("Payor")
-            product = st.text_input("Product")
-            ei = st.checkbox("EI")
-            cs = st.checkbox("CS")
-            mr = st.checkbox("MR")
+        db = next(get_db())
+        try:
+            # Payor and product lists come from the in-memory reference cache,
+            # so changing the payor does not query the database
+            products = strenuus_product_cache.ensure_fresh(db)
+            payor = st.selectbox("Payor", products.payors(), key=f"competitor_payor_{project_id}")
+            choices = products.products_for_payor(payor) if payor else []
+            choice = st.selectbox(
+                "Product", choices, format_func=lambda p: p.Product,
+                key=f"competitor_product_{project_id}"
+            )
+            defaults = choice.flags() if choice else {}
             
-            if st.form_submit_button("Add Competitor"):
-                add_competitor({
-                    'project_id': project_id,
-                    'strenuus_code': strenuus_code,
-                    'payor': payor,
-                    'product': product,
-                    'ei': ei,
-                    'cs': cs,
-                    'mr': mr
-                })
-                st.success("Competitor added successfully!")
-                st.rerun()
+            with st.form("new_competitor"):
+                strenuus_code = st.text_input(
+                    "Strenuus Code", value=choice.StrenuusProductCode if choice else ""
+                )
+                ei = st.checkbox("EI", value=defaults.get('EI', False))
+                cs = st.checkbox("CS", value=defaults.get('CS', False))
+                mr = st.checkbox("MR", value=defaults.get('MR', False))
+                
+                if st.form_submit_button("Add Competitor") and choice:
+                    CompetitorService.create_competitor(db, CompetitorCreate(
+                        ProjectID=project_id,
+                        Payor=payor,
+                        Product=choice.Product,
+                        StrenuusProductCode=strenuus_code or None,
+                        EI=ei, CS=cs, MR=mr
+                    ))
+                    st.success("Competitor added successfully!")
+                    st.rerun()
+        finally:
+            db.close()
     
     # Display existing competitors
     competitors = get_competitors(project_id)
@@ -1,15 +1,82 @@
 import streamlit as st
 import pandas as pd
-from app.db.session import get_db
+from app.db.session import get_db, warm_up_pool
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import plotly.express as px
 import plotly.graph_objects as go
+import logging
 from app.utils.db_monitor import monitor_db_operation, display_db_monitor
+from app.services.dashboard_service import DashboardService, DashboardMetrics
+from app.services.service_area_engine import ServiceAreaEngine, load_footprint
+from app.services.service_area_stage_service import FAILED, STAGING, ServiceAreaStageService
+from app.services.reference_data import reference_registry
+from app.services.y_line_rollup import rollup_reconciler
+from app.services.note_search import note_search_index, search_notes
+from app.services.project_search import project_search_index
+from app.services.project_service import ProjectService
+from app.utils.query_cache import query_cache, cached_read_sql
+from app.utils.metrics import metrics as db_metrics
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.middleware.error_handler import ErrorHandler
+from app.api.api import api_router
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 app.middleware("http")(ErrorHandler())
+app.include_router(api_router, prefix=settings.API_V1_STR)
+
+@app.on_event("startup")
+def warm_up_database():
+    """Pre-open pooled connections (DB_POOL_WARMUP) before serving requests"""
+    try:
+        warm_up_pool()
+    except Exception as e:
+        # The engine is lazy; requests will connect on demand instead
+        logger.warning(f"Database warm-up failed: {str(e)}")
+
+@app.on_event("startup")
+def preload_reference_data():
+    """Read the dropdown reference tables once before serving requests"""
+    try:
+        reference_registry.ensure_loaded()
+    except Exception as e:
+        # The registry serves its built-in defaults until a load succeeds
+        logger.warning(f"Reference data preload failed: {str(e)}")
+
+@app.on_event("startup")
+def start_rollup_reconciler():
+    """Recompute Y-Line rollups every Y_LINE_ROLLUP_RECONCILE_SECONDS"""
+    rollup_reconciler.start()
+
+@app.on_event("shutdown")
+def stop_rollup_reconciler():
+    rollup_reconciler.stop(timeout=5)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    """Operation and query counters/latency histograms in Prometheus text format"""
+    return PlainTextResponse(
+        db_metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+# Tables used as cache tags so writers can invalidate dependent reads
+PROJECT_TABLE = "CS_EXP_Project_Translation"
+NOTES_TABLE = "CS_EXP_ProjectNotes"
+
+# Cache lifetimes (seconds) for the read queries below
+METRICS_TTL = 30
+RECENT_PROJECTS_TTL = 30
+FILTERED_PROJECTS_TTL = 60
+STATUS_TRENDS_TTL = 300
+PROJECT_NOTES_TTL = 60
+
+# Rows per page in the project grid; the next page is read in the background
+PROJECT_PAGE_SIZE = 50
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="project-prefetch")
 
 def main():
     st.set_page_config(
@@ -24,6 +91,9 @@ def main():
     if 'selected_project' not in st.session_state:
         st.session_state.selected_project = None
 
+    # Re-read once its TTL has passed; forms read dropdown options from it
+    reference_registry.ensure_loaded()
+
     # Sidebar navigation
     with st.sidebar:
         st.title("Axis Program Management")
@@ -52,45 +122,19 @@ def get_current_user():
     import getpass
     return getpass.getuser()
 
-def get_project_metrics():
-    """Get project metrics from database"""
+def get_dashboard_metrics():
+    """Get dashboard metrics (status counts and distribution) in one query"""
     try:
         db = next(get_db())
-        metrics = {}
-        
-        # Active Projects
-        active_query = """
-        SELECT COUNT(*) as count 
-        FROM CS_EXP_Project_Translation WITH (NOLOCK)
-        WHERE Status IN ('New', 'Active')
-        """
-        active_df = pd.read_sql(active_query, db.bind)
-        metrics['active'] = active_df['count'].iloc[0]
-        
-        # Pending Reviews
-        pending_query = """
-        SELECT COUNT(*) as count 
-        FROM CS_EXP_Project_Translation WITH (NOLOCK)
-        WHERE Status = 'Review'
-        """
-        pending_df = pd.read_sql(pending_query, db.bind)
-        metrics['pending'] = pending_df['count'].iloc[0]
-        
-        # Completed This Month
-        completed_query = """
-        SELECT COUNT(*) as count 
-        FROM CS_EXP_Project_Translation WITH (NOLOCK)
-        WHERE Status = 'Completed' 
-        AND LastEditDate >= DATEADD(MONTH, DATEDIFF(MONTH, 0, GETDATE()), 0)
-        AND LastEditDate < DATEADD(MONTH, DATEDIFF(MONTH, 0, GETDATE()) + 1, 0)
-        """
-        completed_df = pd.read_sql(completed_query, db.bind)
-        metrics['completed'] = completed_df['count'].iloc[0]
-        
-        return metrics
+        return query_cache.get_or_load(
+            ("dashboard_metrics",),
+            lambda: DashboardService.get_metrics(db),
+            ttl=METRICS_TTL,
+            tags=(PROJECT_TABLE,)
+        )
     except Exception as e:
         st.error(f"Error fetching metrics: {str(e)}")
-        return {'active': 0, 'pending': 0, 'completed': 0}
+        return DashboardMetrics()
     finally:
         db.close()
 
@@ -121,7 +165,11 @@ def get_recent_projects():
             p.LastEditDate
         ORDER BY p.LastEditDate DESC
         """
-        df = pd.read_sql(query, db.bind)
+        df = cached_read_sql(
+            query, db.bind,
+            ttl=RECENT_PROJECTS_TTL,
+            tags=(PROJECT_TABLE, NOTES_TABLE)
+        )
         
         # Format the LastEditDate column
         if not df.empty:
@@ -159,13 +207,13 @@ def render_dashboard():
     st.title("Project Dashboard")
     
     # Project Metrics
-    metrics = get_project_metrics()
+    metrics = get_dashboard_metrics()
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.metric(
             "Active Projects",
-            metrics['active'],
+            metrics.active,
             delta=None,
             help="Projects with status New or Active"
         )
@@ -173,7 +221,7 @@ def render_dashboard():
     with col2:
         st.metric(
             "Pending Reviews",
-            metrics['pending'],
+            metrics.pending,
             delta=None,
             help="Projects awaiting review"
         )
@@ -181,7 +229,7 @@ def render_dashboard():
     with col3:
         st.metric(
             "Completed This Month",
-            metrics['completed'],
+            metrics.completed_this_month,
             delta=None,
             help="Projects completed in current month"
         )
@@ -239,8 +287,8 @@ def render_dashboard():
     
     with col2:
         st.subheader("Project Status Distribution")
-        status_dist = get_status_distribution()
-        if status_dist is not None and not status_dist.empty:
+        status_dist = metrics.distribution_frame()
+        if not status_dist.empty:
             fig = px.pie(
                 status_dist,
                 values='count',
@@ -257,33 +305,6 @@ def render_dashboard():
     if st.checkbox("Show Debug Info"):
         debug_date_formats()
 
-def get_status_distribution():
-    """Get project status distribution"""
-    try:
-        db = next(get_db())
-        query = """
-        SELECT 
-            Status, 
-            COUNT(*) as count
-        FROM CS_EXP_Project_Translation WITH (NOLOCK)
-        GROUP BY Status
-        ORDER BY 
-            CASE Status 
-                WHEN 'New' THEN 1
-                WHEN 'Active' THEN 2
-                WHEN 'Review' THEN 3
-                WHEN 'Completed' THEN 4
-                ELSE 5
-            END
-        """
-        df = pd.read_sql(query, db.bind)
-        return df
-    except Exception as e:
-        st.error(f"Error fetching status distribution: {str(e)}")
-        return None
-    finally:
-        db.close()
-
 @monitor_db_operation("project_management")
 def render_project_management():
     """Render project management view"""
@@ -301,152 +322,201 @@ def render_project_management():
     tab1, tab2 = st.tabs(["Project List", "Create New Project"])
     
     with tab1:
-        # Filters
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            status_filter = st.multiselect(
-                "Status Filter",
-                ["New", "Active", "Review", "Completed"],
-                default=["New", "Active"]
-            )
+        # Typeahead over the in-memory project index; an empty box shows the filtered list
+        search_text = st.text_input(
+            "Find a project",
+            placeholder="Project ID, description, analyst, PM or benchmark file"
+        )
+        if search_text.strip():
+            display_project_search(search_text)
+        else:
+            # Filters
+            col1, col2 = st.columns([2, 1])
         
-        with col2:
-            try:
-                date_range = st.date_input(
-                    "Date Range",
-                    value=[
-                        datetime.now() - timedelta(days=30),
-                        datetime.now()
-                    ],
-                    max_value=datetime.now()
+            with col1:
+                status_filter = st.multiselect(
+                    "Status Filter",
+                    list(reference_registry.get().project_statuses),
+                    default=["New", "Active"]
                 )
-            except Exception as e:
-                st.error(f"Error with date input: {str(e)}")
-                date_range = None
-        
-        # Get filtered projects
-        projects_df = get_filtered_projects(
-            status_filter=status_filter if status_filter else None,
-            date_range=date_range if isinstance(date_range, (list, tuple)) and len(date_range) == 2 else None
-        )
         
-        if not projects_df.empty:
-            # Display projects in a dataframe with selection
-            st.dataframe(
-                projects_df,
-                column_config={
-                    "ProjectID": st.column_config.TextColumn(
-                        "Project ID",
-                        width="medium"
-                    ),
-                    "ProjectType": st.column_config.TextColumn(
-                        "Type",
-                        width="small"
-                    ),
-                    "ProjectDesc": st.column_config.TextColumn(
-                        "Description",
-                        width="large"
-                    ),
-                    "Status": st.column_config.TextColumn(
-                        "Status",
-                        width="medium"
-                    ),
-                    "LastEditDate": st.column_config.TextColumn(
-                        "Last Updated",
-                        width="medium"
+            with col2:
+                try:
+                    date_range = st.date_input(
+                        "Date Range",
+                        value=[
+                            datetime.now() - timedelta(days=30),
+                            datetime.now()
+                        ],
+                        max_value=datetime.now()
                     )
-                },
-                hide_index=True,
-                use_container_width=True
-            )
-            
-            # Add a selectbox for project selection
-            project_ids = projects_df['ProjectID'].tolist()
-            project_descriptions = [
-                f"Project {pid}: {desc[:50]}..." 
-                for pid, desc in zip(projects_df['ProjectID'], projects_df['ProjectDesc'])
-            ]
-            
-            selected_project_index = st.selectbox(
-                "Select a project to view details:",
-                range(len(project_ids)),
-                format_func=lambda x: project_descriptions[x]
+                except Exception as e:
+                    st.error(f"Error with date input: {str(e)}")
+                    date_range = None
+        
+            display_project_grid(
+                status_filter=status_filter if status_filter else None,
+                date_range=date_range if isinstance(date_range, (list, tuple)) and len(date_range) == 2 else None
             )
-            
-            if selected_project_index is not None:
-                selected_project_id = project_ids[selected_project_index]
-                display_project_details(selected_project_id)
-                
-        else:
-            st.info("No projects found matching the filters.")
     
     with tab2:
         create_new_project()
 
-def get_filtered_projects(status_filter=None, date_range=None):
-    """Get filtered projects from database"""
-    try:
-        db = next(get_db())
-        
-        # Base query
-        query = """
-        SELECT 
-            ProjectID,
-            ProjectType,
-            ProjectDesc,
-            Status,
-            CONVERT(VARCHAR(23), LastEditDate, 126) as LastEditDate
-        FROM CS_EXP_Project_Translation WITH (NOLOCK)
-        WHERE 1=1
-        """
-        
-        # Initialize parameters as a list
-        params = []
-        
-        # Add status filter if provided
-        if status_filter and isinstance(status_filter, list) and len(status_filter) > 0:
-            placeholders = ','.join(['?' for _ in status_filter])
-            query += f" AND Status IN ({placeholders})"
-            # Add each status as a separate parameter
-            for status in status_filter:
-                params.append(status)
-        
-        # Add date range filter if provided
-        if date_range and isinstance(date_range, (list, tuple)) and len(date_range) == 2:
-            query += " AND LastEditDate BETWEEN ? AND ?"
-            # Convert dates to string format
-            start_date = date_range[0].strftime('%Y-%m-%d 00:00:00')
-            end_date = date_range[1].strftime('%Y-%m-%d 23:59:59')
-            params.extend([start_date, end_date])
-        
-        # Add order by
-        query += " ORDER BY LastEditDate DESC"
-        
-        # Execute query with parameters as a tuple
-        df = pd.read_sql(query, db.bind, params=tuple(params) if params else None)
-        
-        # Format dates
-        if not df.empty:
-            df['LastEditDate'] = pd.to_datetime(
-                df['LastEditDate'],
-                format='mixed',
-                errors='coerce'
-            ).dt.strftime('%Y-%m-%d %H:%M')
-            
-        return df
-        
-    except Exception as e:
-        st.error(f"Error fetching projects: {str(e)}")
-        # Log the full error for debugging
-        st.error(f"Full error: {type(e).__name__}, {str(e)}")
-        return pd.DataFrame(columns=[
-            'ProjectID', 'ProjectType', 'ProjectDesc', 
-            'Status', 'LastEditDate'
+def project_page_query(status_filter=None, date_range=None, after=None, page_size=PROJECT_PAGE_SIZE):
+    """SQL and parameters for one page of the project list.
+
+    Rows are ordered by (LastEditDate, RecordID) descending and ``after`` is
+    the (LastEditDate, RecordID) of the previous page's last row, so each
+    page seeks on the index instead of skipping rows. NULL LastEditDate sorts
+    last, as in the API's keyset paging. One extra row is read to tell
+    whether another page follows.
+    """
+    query = """
+    SELECT TOP (?)
+        RecordID,
+        ProjectID,
+        ProjectType,
+        ProjectDesc,
+        Status,
+        LastEditDate
+    FROM CS_EXP_Project_Translation WITH (NOLOCK)
+    WHERE 1=1
+    """
+    params = [page_size + 1]
+
+    if status_filter:
+        placeholders = ','.join(['?' for _ in status_filter])
+        query += f" AND Status IN ({placeholders})"
+        params.extend(status_filter)
+
+    if date_range and isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        query += " AND LastEditDate BETWEEN ? AND ?"
+        params.extend([
+            date_range[0].strftime('%Y-%m-%d 00:00:00'),
+            date_range[1].strftime('%Y-%m-%d 23:59:59')
         ])
+
+    if after is not None:
+        last_edit, record_id = after
+        if last_edit is None:
+            query += " AND LastEditDate IS NULL AND RecordID < ?"
+            params.append(record_id)
+        else:
+            query += (
+                " AND (LastEditDate < ? OR LastEditDate IS NULL"
+                " OR (LastEditDate = ? AND RecordID < ?))"
+            )
+            params.extend([last_edit, last_edit, record_id])
+
+    query += " ORDER BY LastEditDate DESC, RecordID DESC"
+    return query, tuple(params)
+
+def fetch_project_page(status_filter=None, date_range=None, after=None, page_size=PROJECT_PAGE_SIZE):
+    """One page of projects and the seek key for the next page (None on the last page)"""
+    query, params = project_page_query(status_filter, date_range, after, page_size)
+    db = next(get_db())
+    try:
+        df = cached_read_sql(
+            query, db.bind,
+            params=params,
+            ttl=FILTERED_PROJECTS_TTL,
+            tags=(PROJECT_TABLE,)
+        )
     finally:
         db.close()
 
+    next_after = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        last = df.iloc[-1]
+        last_edit = None if pd.isna(last['LastEditDate']) else pd.Timestamp(last['LastEditDate']).to_pydatetime()
+        next_after = (last_edit, int(last['RecordID']))
+    return df, next_after
+
+def prefetch_project_page(status_filter, date_range, after):
+    """Warm the query cache with the next page while the current one is viewed"""
+    def load():
+        try:
+            fetch_project_page(status_filter, date_range, after)
+        except Exception as e:
+            logger.warning(f"Project page prefetch failed: {str(e)}")
+    return _prefetch_executor.submit(load)
+
+def display_project_grid(status_filter=None, date_range=None):
+    """Keyset-paged project grid; selecting a row opens its details"""
+    # Seek keys of the pages visited so far; reset when the filters change
+    filters = (tuple(status_filter or ()), tuple(date_range or ()))
+    if st.session_state.get('project_grid_filters') != filters:
+        st.session_state.project_grid_filters = filters
+        st.session_state.project_grid_pages = [None]
+    pages = st.session_state.project_grid_pages
+
+    try:
+        projects_df, next_after = fetch_project_page(status_filter, date_range, pages[-1])
+    except Exception as e:
+        st.error(f"Error fetching projects: {str(e)}")
+        return
+
+    if projects_df.empty:
+        st.info("No projects found matching the filters.")
+        return
+
+    if next_after is not None:
+        prefetch_project_page(status_filter, date_range, next_after)
+
+    display_df = projects_df.assign(
+        LastEditDate=pd.to_datetime(projects_df['LastEditDate'], errors='coerce').dt.strftime('%Y-%m-%d %H:%M')
+    )
+    event = st.dataframe(
+        display_df,
+        column_order=["ProjectID", "ProjectType", "ProjectDesc", "Status", "LastEditDate"],
+        column_config={
+            "ProjectID": st.column_config.TextColumn(
+                "Project ID",
+                width="medium"
+            ),
+            "ProjectType": st.column_config.TextColumn(
+                "Type",
+                width="small"
+            ),
+            "ProjectDesc": st.column_config.TextColumn(
+                "Description",
+                width="large"
+            ),
+            "Status": st.column_config.TextColumn(
+                "Status",
+                width="medium"
+            ),
+            "LastEditDate": st.column_config.TextColumn(
+                "Last Updated",
+                width="medium"
+            )
+        },
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"project_grid_{len(pages)}"
+    )
+
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("← Previous", disabled=len(pages) == 1):
+            pages.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"Page {len(pages)} · {len(projects_df)} projects")
+    with next_col:
+        if st.button("Next →", disabled=next_after is None):
+            pages.append(next_after)
+            st.rerun()
+
+    selected_rows = event.selection.rows
+    if selected_rows:
+        display_project_details(projects_df.iloc[selected_rows[0]]['ProjectID'])
+    else:
+        st.caption("Select a row to view project details.")
+
 def render_reports():
     st.title("Reports")
     
@@ -465,6 +535,28 @@ def render_reports():
 def render_status_report():
     st.subheader("Project Status Summary")
     
+    # Current status breakdown (shares the dashboard metrics query)
+    metrics = get_dashboard_metrics()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Projects", metrics.total)
+    with col2:
+        st.metric("Active Projects", metrics.active)
+    with col3:
+        st.metric("Pending Reviews", metrics.pending)
+    with col4:
+        st.metric("Completed This Month", metrics.completed_this_month)
+    
+    status_dist = metrics.distribution_frame()
+    if not status_dist.empty:
+        fig = px.bar(
+            status_dist,
+            x='Status',
+            y='count',
+            title='Current Status Distribution'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
     # Project status over time
     status_data = get_status_over_time()
     if status_data is not None and not status_data.empty:
@@ -491,7 +583,11 @@ def get_status_over_time():
         GROUP BY FORMAT(LastEditDate, 'yyyy-MM'), Status
         ORDER BY Month, Status
         """
-        df = pd.read_sql(query, db.bind)
+        df = cached_read_sql(
+            query, db.bind,
+            ttl=STATUS_TRENDS_TTL,
+            tags=(PROJECT_TABLE,)
+        )
         return df
     except Exception as e:
         st.error(f"Error fetching status trends: {str(e)}")
@@ -546,9 +642,36 @@ def debug_date_formats():
     finally:
         db.close()
 
+def display_project_search(search_text):
+    """Ranked project matches for the typeahead box, with details for the chosen one"""
+    db = next(get_db())
+    try:
+        matches = ProjectService.search_projects(db, search_text, limit=15)
+    except Exception as e:
+        st.error(f"Error searching projects: {str(e)}")
+        return
+    finally:
+        db.close()
+
+    if not matches:
+        st.info("No projects match your search.")
+        return
+
+    selected = st.selectbox(
+        "Matching projects",
+        range(len(matches)),
+        format_func=lambda i: (
+            f"{matches[i].project.ProjectID}: {(matches[i].project.ProjectDesc or '')[:50]}"
+            f" ({matches[i].project.Analyst or 'no analyst'})"
+        )
+    )
+    if selected is not None:
+        display_project_details(matches[selected].project.ProjectID)
+
 def create_new_project():
     """Create a new project form"""
     st.subheader("Create New Project")
+    reference = reference_registry.get()
     
     with st.form("new_project_form"):
         col1, col2 = st.columns(2)
@@ -556,14 +679,15 @@ def create_new_project():
         with col1:
             project_type = st.selectbox(
                 "Project Type",
-                ["Translation", "Review", "QA", "Other"],
+                [t.code for t in reference.project_types],
+                format_func=reference.project_type_description,
                 index=None,
                 placeholder="Select project type..."
             )
             
             status = st.selectbox(
                 "Status",
-                ["New", "Active", "Review", "Completed"],
+                list(reference.project_statuses),
                 index=0
             )
             
@@ -614,6 +738,8 @@ def create_new_project():
                 
                 db.execute(query, params)
                 db.commit()
+                query_cache.invalidate(PROJECT_TABLE)
+                project_search_index.invalidate()
                 st.success("Project created successfully!")
                 
                 # Clear form (by rerunning the app)
@@ -663,6 +789,8 @@ def display_project_details(project_id):
         
         if not df.empty:
             project = df.iloc[0].to_dict()  # Convert to dictionary for safer access
+            # Project-scoped pages (e.g. CSP LOB platform products) read the ProjectID code
+            st.session_state.selected_project = str(project['ProjectID'])
             
             # Display project details in an expander
             with st.expander("Project Details", expanded=True):
@@ -686,6 +814,10 @@ def display_project_details(project_id):
             # Display notes in a separate expander
             with st.expander("Project Notes", expanded=True):
                 display_project_notes(str(project_id))
+            
+            with st.expander("Service Area", expanded=False):
+                display_service_area(str(project_id))
+                display_service_area_upload(str(project_id))
         else:
             st.warning(f"No details found for Project ID: {project_id}")
             
@@ -695,6 +827,129 @@ def display_project_details(project_id):
     finally:
         db.close()
 
+@monitor_db_operation("service_area")
+def display_service_area(project_id):
+    """Preview and apply a mileage change with the in-process radius engine"""
+    db = next(get_db())
+    try:
+        current = pd.read_sql(
+            """
+            SELECT MAX(MaxMileage) AS MaxMileage, COUNT(*) AS Counties
+            FROM CS_EXP_zTrxServiceArea WITH (NOLOCK)
+            WHERE ProjectID = ?
+            """,
+            db.bind,
+            params=(project_id,)
+        ).iloc[0]
+        current_mileage = int(current['MaxMileage']) if pd.notna(current['MaxMileage']) else 30
+        
+        mileage = st.slider(
+            "Max Mileage", min_value=0, max_value=250, value=current_mileage, step=5,
+            key=f"service_area_mileage_{project_id}"
+        )
+        counties = pd.read_sql(
+            """
+            SELECT State, County
+            FROM CS_EXP_zTrxServiceArea WITH (NOLOCK)
+            WHERE ProjectID = ?
+            ORDER BY State, County
+            """,
+            db.bind,
+            params=(project_id,)
+        )
+        stored = load_footprint(db, project_id)
+        chosen = st.multiselect(
+            "Footprint Counties",
+            list(dict.fromkeys(stored + list(counties.itertuples(index=False, name=None)))),
+            default=stored,
+            format_func=lambda key: f"{key[1]}, {key[0]}",
+            key=f"service_area_footprint_{project_id}",
+            help="Counties the radius is measured from"
+        )
+        # Only a changed selection replaces the stored footprint
+        footprint = chosen if chosen and set(chosen) != set(stored) else None
+        try:
+            diff = ServiceAreaEngine.preview(db, project_id, mileage, footprint)
+        except ValueError as e:
+            st.info(str(e))
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Counties Kept", diff.kept)
+        col2.metric("To Add", len(diff.to_add))
+        col3.metric("To Remove", len(diff.to_remove))
+        if diff.missing_footprint:
+            st.warning(
+                "No centroid for: " + ", ".join(f"{c}, {s}" for s, c in diff.missing_footprint)
+            )
+        
+        if diff.to_add or diff.to_remove or diff.save_footprint or mileage != current_mileage:
+            if diff.to_add:
+                st.caption("Adding: " + ", ".join(f"{r['County']}, {r['State']}" for r in diff.to_add))
+            if diff.removed_counties:
+                st.caption("Removing: " + ", ".join(f"{c}, {s}" for s, c in diff.removed_counties))
+            if st.button("Apply Mileage", key=f"apply_mileage_{project_id}"):
+                ServiceAreaEngine.apply(db, project_id, mileage, footprint)
+                st.success(f"Service area updated to {mileage} miles")
+    except Exception as e:
+        st.error(f"Error updating service area: {str(e)}")
+    finally:
+        db.close()
+
+@monitor_db_operation("service_area_upload")
+def display_service_area_upload(project_id):
+    """Stage a service area CSV, then promote it to the live table in one step"""
+    st.markdown("**Upload Service Area**")
+    load_key = f"service_area_load_{project_id}"
+    db = next(get_db())
+    try:
+        uploaded_file = st.file_uploader(
+            "Service area CSV", type=['csv'], key=f"service_area_csv_{project_id}"
+        )
+        st.caption("Columns: State, County, and optionally Region, ReportInclude, MaxMileage")
+        if uploaded_file is not None and st.button("Stage Upload", key=f"stage_upload_{project_id}"):
+            load = ServiceAreaStageService.start_load(db, project_id, source="csv")
+            try:
+                with st.spinner("Staging..."):
+                    report = ServiceAreaStageService.stage_csv(db, load.LoadID, uploaded_file)
+            except ValueError as e:
+                ServiceAreaStageService.discard(db, load.LoadID)
+                st.error(str(e))
+                return
+            st.session_state[load_key] = load.LoadID
+            if report.errors:
+                st.warning(f"{len(report.errors)} rows rejected")
+                st.dataframe(report.error_frame())
+        
+        load_id = st.session_state.get(load_key)
+        load = ServiceAreaStageService.get_load(db, load_id) if load_id else None
+        if load is None or load.Status not in (STAGING, FAILED):
+            return
+        
+        st.info(f"Load {load.LoadID}: {load.RowsStaged} rows staged, {load.RowsRejected} rejected")
+        if load.Message:
+            st.error(load.Message)
+        replace = st.checkbox(
+            "Replace the whole service area (remove counties not in the file)",
+            key=f"replace_service_area_{project_id}"
+        )
+        col1, col2 = st.columns(2)
+        if col1.button("Promote", key=f"promote_load_{project_id}"):
+            load = ServiceAreaStageService.promote(db, load.LoadID, replace=replace)
+            del st.session_state[load_key]
+            st.success(
+                f"Service area updated: {load.RowsInserted} added, {load.RowsUpdated} updated, "
+                f"{load.RowsDeleted} removed"
+            )
+        elif col2.button("Discard", key=f"discard_load_{project_id}"):
+            ServiceAreaStageService.discard(db, load.LoadID)
+            del st.session_state[load_key]
+            st.info("Staged upload discarded")
+    except Exception as e:
+        st.error(f"Error loading service area: {str(e)}")
+    finally:
+        db.close()
+
 @monitor_db_operation("project_notes")
 def display_project_notes(project_id):
     """Display project notes with monitoring"""
@@ -715,9 +970,35 @@ def display_project_notes(project_id):
         ORDER BY LastEditDate DESC
         """
         
-        notes_df = pd.read_sql(query, db.bind, params=(str(project_id),))
+        notes_df = cached_read_sql(
+            query, db.bind,
+            params=(str(project_id),),
+            ttl=PROJECT_NOTES_TTL,
+            tags=(NOTES_TABLE,)
+        )
         
-        if not notes_df.empty:
+        search_col, scope_col = st.columns([3, 1])
+        with search_col:
+            search_text = st.text_input(
+                "Search notes",
+                key=f"note_search_{project_id}",
+                placeholder="Words to find, e.g. network adequacy"
+            )
+        with scope_col:
+            all_projects = st.checkbox("All projects", key=f"note_search_all_{project_id}")
+
+        if search_text.strip():
+            hits = search_notes(db, search_text, None if all_projects else str(project_id), limit=25)
+            if not hits:
+                st.info("No notes match your search.")
+            for note, score in hits:
+                with st.container():
+                    edited = note.LastEditDate.strftime('%Y-%m-%d %H:%M') if note.LastEditDate else ""
+                    st.markdown(f"**{note.ProjectID} · {note.LastEditMSID or 'Unknown'} - {edited}**")
+                    st.markdown(note.Notes or "")
+                    st.caption(f"Relevance {score:.2f}")
+                    st.markdown("---")
+        elif not notes_df.empty:
             for _, note in notes_df.iterrows():
                 with st.container():
                     st.markdown(f"**{note['Author']} - {note['NoteDate']}**")
@@ -733,7 +1014,7 @@ def display_project_notes(project_id):
             new_note = st.text_area("Add a new note")
             status = st.selectbox(
                 "Status",
-                ["", "New", "Active", "Review", "Completed"],
+                [""] + list(reference_registry.get().project_statuses),
                 index=0
             )
             action_item = st.selectbox(
@@ -769,6 +1050,8 @@ def display_project_notes(project_id):
                         )
                     )
                     db.commit()
+                    query_cache.invalidate(NOTES_TABLE)
+                    note_search_index.invalidate()
                     st.success("Note added successfully!")
                     st.experimental_rerun()
                 except Exception as e:
@@ -1,13 +1,27 @@
 from app.models.project import Project
 from app.models.competitor import Competitor
-from app.models.service_area import ServiceArea
+from app.models.service_area import ServiceArea, ServiceAreaFootprint
 from app.models.yline import YLine
 from app.models.notes import ProjectNote
+from app.models.county_centroid import CountyCentroid
+from app.models.service_area_stage import ServiceAreaLoad, ServiceAreaStage
+from app.models.platform_load_product import PlatformLoadProduct
+from app.models.selected_platform_product import SelectedPlatformProduct
+from app.models.strenuus_product import StrenuusProduct
+from app.models.project_type import ProjectType
 
 __all__ = [
     'Project',
     'Competitor',
     'ServiceArea',
+    'ServiceAreaFootprint',
     'YLine',
-    'ProjectNote'
+    'ProjectNote',
+    'CountyCentroid',
+    'ServiceAreaLoad',
+    'ServiceAreaStage',
+    'PlatformLoadProduct',
+    'SelectedPlatformProduct',
+    'StrenuusProduct',
+    'ProjectType'
 ]
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Float, Integer, String, UniqueConstraint
+from app.db.base import Base
+
+class CountyCentroid(Base):
+    """Population/geographic centre of each county, used for service-area radius searches"""
+    __tablename__ = "CS_EXP_CountyCentroid"
+
+    RecordID = Column(Integer, primary_key=True, index=True)
+    State = Column(String(2), nullable=False)
+    County = Column(String(75), nullable=False)
+    Region = Column(String(30))
+    Latitude = Column(Float, nullable=False)
+    Longitude = Column(Float, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('State', 'County', name='uix_county_centroid'),
+    )
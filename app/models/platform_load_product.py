@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class PlatformLoadProduct(Base):
+    """Network/product prefix combinations loaded from the claims platform"""
+    __tablename__ = "CS_EXP_PlatformLoadProducts"
+
+    RECORD_ID = Column(Integer, primary_key=True)
+    NWNW_ID = Column(String(12), index=True)
+    NWPR_PFX = Column(String(4), index=True)
+    GRGR_ID = Column(String(8))
+    GRGR_NAME = Column(String(50))
+    DataLoadDate = Column(DateTime, server_default=func.now(), index=True)
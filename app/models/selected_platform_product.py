@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class SelectedPlatformProduct(Base):
+    """Platform load product chosen for a project on the CSP LOB screen"""
+    __tablename__ = "CS_EXP_Sel_PLProducts"
+
+    RECORD_ID = Column(Integer, primary_key=True)
+    ProjectID = Column(String(12), index=True, nullable=False)
+    ProjectStatus = Column(String(10))
+    NWNW_ID = Column(String(12))
+    NWPR_PFX = Column(String(4))
+    GRGR_ID = Column(String(8))
+    GRGR_NAME = Column(String(50))
+    LastEditMSID = Column(String(15))
+    DataLoadDate = Column(DateTime, server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -13,4 +13,22 @@ class ServiceArea(Base):
     ReportInclude = Column(String(1))
     MaxMileage = Column(Integer)
     DataLoadDate = Column(DateTime, server_default=func.now())
-    ProjectStatus = Column(String(10)) 
\ No newline at end of file
+    ProjectStatus = Column(String(10))
+
+class ServiceAreaFootprint(Base):
+    """Counties a project's service-area radius is measured from.
+
+    Kept apart from ReportInclude, which analysts set freely, so flagging
+    an added county never widens the radius or pins it in place.
+    """
+    __tablename__ = "CS_EXP_zTrxServiceArea_Footprint"
+
+    RecordID = Column(Integer, primary_key=True, index=True)
+    ProjectID = Column(String(12), index=True, nullable=False)
+    State = Column(String(2), nullable=False)
+    County = Column(String(75), nullable=False)
+    DataLoadDate = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('ProjectID', 'State', 'County', name='uix_service_area_footprint'),
+    )
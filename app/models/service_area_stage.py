@@ -0,0 +1,35 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class ServiceAreaLoad(Base):
+    """Status and progress of one staged service area load"""
+    __tablename__ = "CS_EXP_zTrxServiceArea_Load"
+
+    LoadID = Column(Integer, primary_key=True, index=True)
+    ProjectID = Column(String(12), index=True, nullable=False)
+    Source = Column(String(50))
+    Status = Column(String(10), nullable=False, default="staging")
+    RowsStaged = Column(Integer, nullable=False, default=0)
+    RowsRejected = Column(Integer, nullable=False, default=0)
+    RowsInserted = Column(Integer)
+    RowsUpdated = Column(Integer)
+    RowsDeleted = Column(Integer)
+    Message = Column(String(500))
+    LastEditMSID = Column(String(15))
+    StartedAt = Column(DateTime, server_default=func.now())
+    CompletedAt = Column(DateTime)
+
+class ServiceAreaStage(Base):
+    """Staged copy of CS_EXP_zTrxServiceArea rows awaiting promotion"""
+    __tablename__ = "CS_EXP_zTrxServiceArea_Stage"
+
+    StageID = Column(Integer, primary_key=True)
+    LoadID = Column(Integer, index=True, nullable=False)
+    ProjectID = Column(String(12), nullable=False)
+    Region = Column(String(30))
+    State = Column(String(2), nullable=False)
+    County = Column(String(75), nullable=False)
+    ReportInclude = Column(String(1))
+    MaxMileage = Column(Integer)
+    ProjectStatus = Column(String(10))
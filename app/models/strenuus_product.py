@@ -0,0 +1,16 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from app.db.base import Base
+
+class StrenuusProduct(Base):
+    """Strenuus competitor product reference data"""
+    __tablename__ = "Strenuus_Product"
+
+    KeyId = Column(Integer, primary_key=True)
+    StrenuusProductCode = Column(String(50), index=True)
+    Payor = Column(String(50), index=True)
+    Product = Column(String(60))
+    EI = Column(Boolean, default=False)
+    CS = Column(Boolean, default=False)
+    MR = Column(Boolean, default=False)
+    LoadDate = Column(DateTime)
+    IFP = Column(Integer)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -27,4 +27,11 @@ class YLine(Base):
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
     
     # Relationships
-    project = relationship("Project", back_populates="y_lines")
\ No newline at end of file
+    project = relationship("Project", back_populates="y_lines")
+
+    # Search: prefix matches on product_code (ipa_number has its unique index),
+    # and project/status/value filters answered from one index
+    __table_args__ = (
+        Index('ix_y_lines_product_code', 'product_code'),
+        Index('ix_y_lines_project_status_value', 'project_id', 'status', 'estimated_value'),
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime
+from sqlalchemy.sql import func
+from .base import Base
+
+class YLineMigrationCheckpoint(Base):
+    """Progress of a batched copy of legacy Y-Lines into y_lines"""
+    __tablename__ = 'y_line_migration_checkpoints'
+
+    job = Column(String(50), primary_key=True)
+    # Highest legacy RecordID already copied or skipped
+    last_record_id = Column(Integer, nullable=False, default=0)
+    copied = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    # Of the skipped rows, those whose legacy ProjectID has no LegacyProjectMapping
+    unmapped = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, onupdate=func.now())
+    completed_at = Column(DateTime)
+
+class LegacyProjectMapping(Base):
+    """projects.id for a legacy CS_EXP ProjectID code.
+
+    The legacy tables key projects by code and CS_EXP_Project_Translation
+    numbers them with its own RecordID, unrelated to projects.id, so the
+    mapping is filled in before legacy Y-Lines are read or migrated.
+    """
+    __tablename__ = 'legacy_project_map'
+
+    legacy_project_id = Column(String(12), primary_key=True)
+    project_id = Column(Integer, ForeignKey('projects.id'), nullable=False, index=True)
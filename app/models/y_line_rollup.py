@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Enum, Float
+from sqlalchemy.sql import func
+from .base import Base
+from .y_line import YLineStatus
+
+class YLineRollup(Base):
+    """Running totals of a project's Y-Lines in one status, kept by YLineService"""
+    __tablename__ = 'y_line_rollups'
+
+    project_id = Column(Integer, ForeignKey('projects.id'), primary_key=True)
+    status = Column(Enum(YLineStatus), primary_key=True)
+    line_count = Column(Integer, nullable=False, default=0)
+    estimated_total = Column(Float, nullable=False, default=0.0)
+    actual_total = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -39,52 +39,46 @@ class YLineManager:
         self.db = db_session
     
     def get_yline_items(self, status_filter=None):
-        """Get Y-Line items with optional filtering"""
-        query = """
-        SELECT 
-            IPA_Number,
-            ProductCode,
-            Description,
-            PreAward,
-            PostAward,
-            Status,
-            LastEditDate,
-            Notes
-        FROM CS_EXP_YLine WITH (NOLOCK)
-        WHERE 1=1
-        """
-        
-        if status_filter:
-            query += " AND Status = ?"
-            return pd.read_sql(query, self.db.bind, params=(status_filter,))
-        
-        return pd.read_sql(query, self.db.bind)
-    
-    def create_yline_item(self, item: YLineItem):
-        """Create new Y-Line item"""
-        query = """
-        INSERT INTO CS_EXP_YLine (
-            IPA_Number,
-            ProductCode,
-            Description,
-            PreAward,
-            PostAward,
-            Status,
-            LastEditDate,
-            Notes
-        ) VALUES (?, ?, ?, ?, ?, ?, GETDATE(), ?)
-        """
-        
-        self.db.execute(
-            query,
-            (
-                item.ipa_number,
-                item.product_code,
-                item.description,
-                item.pre_award,
-                item.post_award,
-                item.status,
-                item.notes
-            )
+        """Get Y-Line items with optional filtering, from the configured Y-Line store"""
+        # Imported here: the repository imports this module for the legacy table
+        from app.services.y_line_repository import award_flag, legacy_status, y_line_repository
+
+        status = legacy_status(status_filter) if status_filter else None
+        records = y_line_repository.find(self.db, status=status)
+        return pd.DataFrame(
+            [
+                (r.ipa_number, r.product_code, r.description, award_flag(r.pre_award_status),
+                 award_flag(r.post_award_status), r.status.value.title() if r.status else None,
+                 r.updated_at or r.created_at, None)
+                for r in records
+            ],
+            columns=["IPA_Number", "ProductCode", "Description", "PreAward", "PostAward",
+                     "Status", "LastEditDate", "Notes"]
         )
-        self.db.commit() 
\ No newline at end of file
+
+    def create_yline_item(self, item: YLineItem, project_id: int):
+        """Create a Y-Line item for a project in y_lines.
+
+        Goes through YLineService.ingest_y_lines, so the item is validated and
+        counted in the project's rollup like any other Y-Line. y_lines has no
+        notes column, so notes are not stored. Raises ValueError when the
+        project is missing or the item is rejected.
+        """
+        from fastapi import HTTPException
+        from app.services.y_line_repository import AWARD_NO, AWARD_YES, legacy_status
+        from app.services.y_line_service import YLineService
+
+        row = {
+            "ipa_number": item.ipa_number,
+            "product_code": item.product_code,
+            "description": item.description,
+            "pre_award_status": AWARD_YES if item.pre_award else AWARD_NO,
+            "post_award_status": AWARD_YES if item.post_award else AWARD_NO,
+            "status": legacy_status(item.status),
+        }
+        try:
+            report = YLineService(self.db).ingest_y_lines(project_id, [row])
+        except HTTPException as e:
+            raise ValueError(e.detail)
+        if report.rejected:
+            raise ValueError(report.rows[0].message)
@@ -2,8 +2,11 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from app.db.session import get_db
 from app.models.yline import YLineItem, YLineManager
+from app.services.y_line_repository import y_line_repository
 from app.utils.db_monitor import monitor_db_operation
+from app.utils.validators import validate_yline_item
 
 @monitor_db_operation("yline_management")
 def render_yline_management():
@@ -49,10 +52,16 @@ def render_yline_management():
     
     with tab2:
         st.subheader("Create New Y-Line Item")
+        if y_line_repository.adapter.name != "y_lines":
+            # New items go to y_lines and would not show in a list read from the legacy table
+            st.info("Creating Y-Line items is disabled until Y_LINE_STORAGE is set to y_lines.")
+            return
+
         with st.form("new_yline_form"):
             col1, col2 = st.columns(2)
             
             with col1:
+                project_id = st.number_input("Project Number", min_value=1, step=1)
                 ipa_number = st.text_input("IPA Number")
                 product_code = st.text_input("Product Code")
                 status = st.selectbox(
@@ -65,28 +74,26 @@ def render_yline_management():
                 post_award = st.checkbox("Post-Award")
                 description = st.text_area("Description")
             
-            notes = st.text_area("Notes")
-            
             submitted = st.form_submit_button("Create Y-Line Item")
             
             if submitted:
                 try:
-                    validate_yline_item(YLineItem(
+                    item = YLineItem(
                         ipa_number=ipa_number,
                         product_code=product_code,
                         description=description,
                         pre_award=pre_award,
                         post_award=post_award,
                         status=status,
-                        last_updated=datetime.now(),
-                        notes=notes
-                    ))
+                        last_updated=datetime.now()
+                    )
+                    validate_yline_item(item)
                     
                     manager = YLineManager(next(get_db()))
-                    manager.create_yline_item(item)
+                    manager.create_yline_item(item, int(project_id))
                     st.success("Y-Line item created successfully!")
-                    st.experimental_rerun()
+                    st.rerun()
                 except ValueError as e:
                     st.error(f"Validation error: {str(e)}")
                 except Exception as e:
-                    st.error(f"Error creating Y-Line item: {str(e)}") 
\ No newline at end of file
+                    st.error(f"Error creating Y-Line item: {str(e)}")
@@ -6,6 +6,11 @@ class CompetitorBase(BaseModel):
     ProjectID: str
     Product: str
     Payor: str
+    # Defaulted from the Strenuus product reference data when left unset
+    StrenuusProductCode: Optional[str] = None
+    EI: Optional[bool] = None
+    CS: Optional[bool] = None
+    MR: Optional[bool] = None
 
 class CompetitorCreate(CompetitorBase):
     pass
@@ -14,6 +19,10 @@ class CompetitorUpdate(BaseModel):
     ProjectID: Optional[str] = None
     Product: Optional[str] = None
     Payor: Optional[str] = None
+    StrenuusProductCode: Optional[str] = None
+    EI: Optional[bool] = None
+    CS: Optional[bool] = None
+    MR: Optional[bool] = None
 
 class CompetitorInDBBase(CompetitorBase):
     RecordID: int
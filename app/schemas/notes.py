@@ -0,0 +1,32 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class NoteBase(BaseModel):
+    ProjectID: str = Field(..., max_length=12)
+    Notes: Optional[str] = None
+    ActionItem: Optional[str] = Field(None, max_length=3)
+    ProjectStatus: Optional[str] = Field(None, max_length=8)
+    ProjectCategory: Optional[str] = Field(None, max_length=50)
+
+class NoteCreate(NoteBase):
+    class Config:
+        from_attributes = True
+
+class NoteUpdate(BaseModel):
+    Notes: Optional[str] = None
+    ActionItem: Optional[str] = Field(None, max_length=3)
+    ProjectStatus: Optional[str] = Field(None, max_length=8)
+    ProjectCategory: Optional[str] = Field(None, max_length=50)
+
+    class Config:
+        from_attributes = True
+
+class NoteSearchResult(NoteBase):
+    RecordID: int
+    LastEditDate: Optional[datetime] = None
+    LastEditMSID: Optional[str] = None
+    score: float = 0.0
+
+    class Config:
+        from_attributes = True
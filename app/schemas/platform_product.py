@@ -0,0 +1,37 @@
+"""Platform load product schemas"""
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class PlatformProduct(BaseModel):
+    """A network/product prefix row from CS_EXP_PlatformLoadProducts"""
+    RECORD_ID: int
+    NWNW_ID: Optional[str] = None
+    NWPR_PFX: Optional[str] = None
+    GRGR_ID: Optional[str] = None
+    GRGR_NAME: Optional[str] = None
+    DataLoadDate: Optional[datetime] = None
+
+class PlatformProductSelection(BaseModel):
+    """A product in the desired selection for a project"""
+    NWNW_ID: str = Field(..., max_length=12)
+    NWPR_PFX: str = Field(..., max_length=4)
+    GRGR_ID: Optional[str] = Field(None, max_length=8)
+    GRGR_NAME: Optional[str] = Field(None, max_length=50)
+
+class SelectedPlatformProduct(PlatformProductSelection):
+    """A stored selection row"""
+    RECORD_ID: int
+    ProjectID: str
+    ProjectStatus: Optional[str] = None
+    LastEditMSID: Optional[str] = None
+    DataLoadDate: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class PlatformSelectionResult(BaseModel):
+    """Outcome of saving a project's product selection"""
+    inserted: int
+    deleted: int
+    unchanged: int
@@ -45,4 +45,16 @@ class ProjectInDBBase(ProjectBase):
         from_attributes = True
 
 class Project(ProjectInDBBase):
-    pass 
\ No newline at end of file
+    pass 
+
+class ProjectSearchResult(BaseModel):
+    """A typeahead match; higher score ranks first"""
+    RecordID: int
+    ProjectID: Optional[str] = None
+    BenchmarkFileID: Optional[str] = None
+    ProjectDesc: Optional[str] = None
+    Analyst: Optional[str] = None
+    PM: Optional[str] = None
+    Status: Optional[str] = None
+    LastEditDate: Optional[datetime] = None
+    score: float
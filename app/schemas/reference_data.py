@@ -0,0 +1,26 @@
+"""Reference data schemas"""
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class ProjectTypeRef(BaseModel):
+    code: str
+    description: str
+
+class CountyRef(BaseModel):
+    state: str
+    county: str
+    region: Optional[str] = None
+
+class ReferenceData(BaseModel):
+    """Dropdown options for every form; version changes whenever the content does"""
+    version: str
+    loaded_at: Optional[datetime] = None
+    project_types: List[ProjectTypeRef]
+    project_statuses: List[str]
+    lob_types: List[str]
+    csp_statuses: List[str]
+    payors: List[str]
+    regions: List[str]
+    states: List[str]
+    counties: List[CountyRef]
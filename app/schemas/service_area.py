@@ -1,6 +1,6 @@
 """Service Area schemas"""
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ServiceAreaBase(BaseModel):
@@ -26,4 +26,49 @@ class ServiceArea(ServiceAreaBase):
     last_modified: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class ServiceAreaCounty(BaseModel):
+    """A county in a project's service-area footprint"""
+    State: str
+    County: str
+
+class ServiceAreaTarget(BaseModel):
+    """One county in the desired service area for a project"""
+    Region: Optional[str] = None
+    State: str
+    County: str
+    ReportInclude: Optional[str] = "N"
+    MaxMileage: Optional[int] = None
+    ProjectStatus: Optional[str] = None
+
+class ServiceAreaSyncResult(BaseModel):
+    """Outcome of a set-difference service area sync"""
+    inserted: int
+    deleted: int
+    unchanged: int
+
+class ServiceAreaStageError(BaseModel):
+    """A staged row that failed validation"""
+    row: int
+    county: str
+    message: str
+
+class ServiceAreaLoadStatus(BaseModel):
+    """Status and progress of a staged service area load"""
+    LoadID: int
+    ProjectID: str
+    Source: Optional[str] = None
+    Status: str
+    RowsStaged: int
+    RowsRejected: int
+    RowsInserted: Optional[int] = None
+    RowsUpdated: Optional[int] = None
+    RowsDeleted: Optional[int] = None
+    Message: Optional[str] = None
+    StartedAt: Optional[datetime] = None
+    CompletedAt: Optional[datetime] = None
+    errors: List[ServiceAreaStageError] = []
+
+    class Config:
+        from_attributes = True
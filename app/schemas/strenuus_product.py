@@ -0,0 +1,16 @@
+"""Strenuus product reference schemas"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class StrenuusProduct(BaseModel):
+    """A competitor product from the Strenuus reference table"""
+    KeyId: int
+    StrenuusProductCode: Optional[str] = None
+    Payor: Optional[str] = None
+    Product: Optional[str] = None
+    EI: bool = False
+    CS: bool = False
+    MR: bool = False
+    LoadDate: Optional[datetime] = None
+    IFP: Optional[int] = None
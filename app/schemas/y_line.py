@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from app.models.y_line import YLineStatus
 
@@ -33,4 +33,66 @@ class YLineResponse(YLineBase):
     updated_at: Optional[datetime]
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+class YLineBulkStatusResult(BaseModel):
+    status: YLineStatus
+    requested: int = Field(..., description="Distinct IDs submitted")
+    updated: int = Field(..., description="Y-Lines whose status was set")
+    missing_ids: List[int] = Field(default_factory=list, description="Submitted IDs that matched no Y-Line")
+    y_lines: Optional[List[YLineResponse]] = Field(None, description="Updated rows, when return_rows is set")
+
+class YLineSearchPage(BaseModel):
+    y_lines: List[YLineResponse]
+    next_after: Optional[int] = Field(None, description="Pass as after for the next page; None on the last page")
+    total: Optional[int] = Field(None, description="Y-Lines matching the filters; None when facets is off")
+    status_counts: Dict[str, int] = Field(default_factory=dict)
+    value_counts: Dict[str, int] = Field(default_factory=dict, description="Matches by estimated_value bucket")
+
+    class Config:
+        from_attributes = True
+
+class YLineRollupTotals(BaseModel):
+    status: YLineStatus
+    line_count: int
+    estimated_total: float
+    actual_total: float
+    variance: float = Field(..., description="actual_total less estimated_total")
+
+    class Config:
+        from_attributes = True
+
+class YLineProjectRollup(BaseModel):
+    project_id: int
+    line_count: int
+    estimated_total: float
+    actual_total: float
+    variance: float = Field(..., description="actual_total less estimated_total")
+    updated_at: Optional[datetime] = None
+    by_status: List[YLineRollupTotals]
+
+    class Config:
+        from_attributes = True
+
+class YLineRollupReconcileResult(BaseModel):
+    checked: int = Field(..., description="(project, status) rollups compared with source")
+    corrected: int = Field(..., description="Rollups whose totals had drifted and were rewritten")
+
+    class Config:
+        from_attributes = True
+
+class YLineIngestRow(BaseModel):
+    row: int = Field(..., description="Position in the submitted list, from 1")
+    ipa_number: Optional[str]
+    status: str = Field(..., description="inserted, rejected, or skipped when another row was rejected")
+    message: Optional[str] = None
+
+class YLineIngestReport(BaseModel):
+    project_id: int
+    received: int
+    inserted: int
+    rejected: int
+    rows: List[YLineIngestRow]
+
+    class Config:
+        from_attributes = True
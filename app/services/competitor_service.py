@@ -1,8 +1,11 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
+from app.db.crud.base import BulkResult
 from app.db.crud.competitor import competitor as competitor_crud
 from app.models.competitor import Competitor
 from app.schemas.competitor import CompetitorCreate, CompetitorUpdate
+from app.services.strenuus_product_cache import FLAG_COLUMNS, strenuus_product_cache
+from app.utils.pagination import Page
 
 class CompetitorService:
     @staticmethod
@@ -19,9 +22,49 @@ class CompetitorService:
     ) -> List[Competitor]:
         return competitor_crud.get_multi(db=db, skip=skip, limit=limit)
     
+    @staticmethod
+    def get_competitors_page(
+        db: Session, cursor: Optional[str] = None, limit: int = 100
+    ) -> Page:
+        return competitor_crud.get_multi_keyset(db=db, cursor=cursor, limit=limit)
+    
+    @staticmethod
+    def apply_product_defaults(
+        db: Session, values: Dict[str, Any], current: Optional[Competitor] = None
+    ) -> Dict[str, Any]:
+        """Fill unset EI/CS/MR flags and StrenuusProductCode from the cached Strenuus product.
+
+        On update, ``current`` supplies the fields not being changed and the
+        flags are only defaulted when the code, product or payor changes. A
+        product or payor change without a code resolves the new product and
+        replaces the stored code, or clears it if the product is unknown.
+        """
+        values = {k: v for k, v in values.items() if not (k in FLAG_COLUMNS and v is None)}
+        identity = ("StrenuusProductCode", "Product", "Payor")
+        missing = [name for name in FLAG_COLUMNS if name not in values]
+        stale_code = current is not None and "StrenuusProductCode" not in values and any(
+            name in values and values[name] != getattr(current, name) for name in ("Product", "Payor")
+        )
+        if not (missing or stale_code) or (current is not None and not any(values.get(n) for n in identity)):
+            return values
+        
+        def field(name):
+            return values.get(name) or getattr(current, name, None)
+        
+        code = None if stale_code else field("StrenuusProductCode")
+        ref = strenuus_product_cache.ensure_fresh(db).resolve(code, field("Product"), field("Payor"))
+        if ref is not None:
+            values.update({name: getattr(ref, name) for name in missing})
+            if not code and ref.StrenuusProductCode:
+                values["StrenuusProductCode"] = ref.StrenuusProductCode
+        elif stale_code:
+            values["StrenuusProductCode"] = None
+        return values
+    
     @staticmethod
     def create_competitor(db: Session, competitor: CompetitorCreate) -> Competitor:
-        return competitor_crud.create(db=db, obj_in=competitor.dict())
+        values = CompetitorService.apply_product_defaults(db, competitor.dict())
+        return competitor_crud.create(db=db, obj_in=values)
     
     @staticmethod
     def update_competitor(
@@ -29,11 +72,27 @@ class CompetitorService:
     ) -> Optional[Competitor]:
         db_competitor = competitor_crud.get(db=db, record_id=record_id)
         if db_competitor:
-            return competitor_crud.update(
-                db=db, db_obj=db_competitor, obj_in=competitor.dict(exclude_unset=True)
+            values = CompetitorService.apply_product_defaults(
+                db, competitor.dict(exclude_unset=True), current=db_competitor
             )
+            return competitor_crud.update(db=db, db_obj=db_competitor, obj_in=values)
         return None
     
     @staticmethod
     def delete_competitor(db: Session, record_id: int) -> Optional[Competitor]:
-        return competitor_crud.remove(db=db, record_id=record_id) 
\ No newline at end of file
+        return competitor_crud.remove(db=db, record_id=record_id)
+    
+    @staticmethod
+    def bulk_create_competitors(
+        db: Session, rows: List[Dict[str, Any]], return_ids: bool = False
+    ) -> BulkResult:
+        return competitor_crud.bulk_create(db=db, objs_in=rows, return_ids=return_ids)
+    
+    @staticmethod
+    def bulk_update_competitors(db: Session, rows: List[Dict[str, Any]]) -> BulkResult:
+        """Each row must carry its RecordID"""
+        return competitor_crud.bulk_update(db=db, objs_in=rows)
+    
+    @staticmethod
+    def bulk_delete_competitors(db: Session, record_ids: List[int]) -> BulkResult:
+        return competitor_crud.bulk_delete(db=db, ids=record_ids)
@@ -1,11 +1,48 @@
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import IO, Dict, List, Optional, Tuple, Union
+import pandas as pd
 from fastapi import HTTPException
+from sqlalchemy import bindparam, column, insert, select, table as table_clause, update
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.models.csp_lob import CSPLOB, LOBType, CSPStatus
 from app.schemas.csp_lob import CSPLOBCreate, CSPLOBUpdate
 from app.utils.validators import CSPLOBValidator
 
+# Rows parsed, validated and written per transaction during bulk import
+IMPORT_CHUNK_SIZE = 5000
+# Keeps csp_code IN lists under SQL Server's 2100-parameter limit
+LOOKUP_BATCH_SIZE = 2000
+IMPORT_COLUMNS = ("csp_code", "lob_type", "project_id")
+_WRITE_COLUMNS = (
+    "csp_code", "lob_type", "description", "status",
+    "effective_date", "termination_date", "project_id"
+)
+# Written on update only when the file has a non-blank value for them
+_OPTIONAL_COLUMNS = ("description", "status", "effective_date", "termination_date")
+
+# Target of csp_lob.project_id; the legacy Project model maps a different table
+_projects = table_clause("projects", column("id"))
+
+@dataclass
+class RowError:
+    row: int  # line number in the uploaded file, header is line 1
+    csp_code: str
+    message: str
+
+@dataclass
+class ImportReport:
+    total_rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    def error_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [(e.row, e.csp_code, e.message) for e in self.errors],
+            columns=["Row", "CSP Code", "Error"]
+        )
+
 class CSPLOBService:
     def __init__(self, db: Session):
         self.db = db
@@ -77,8 +114,8 @@ class CSPLOBService:
             termination_date = update_data.get('termination_date', csp_lob.termination_date)
             CSPLOBValidator.validate_dates(effective_date, termination_date)
         
-        for field, value in update_data.items():
-            setattr(csp_lob, field, value)
+        for name, value in update_data.items():
+            setattr(csp_lob, name, value)
             
         try:
             self.db.commit()
@@ -96,4 +133,177 @@ class CSPLOBService:
         csp_lob = self.get_csp_lob(csp_lob_id)
         self.db.delete(csp_lob)
         self.db.commit()
-        return True 
\ No newline at end of file
+        return True
+
+    def bulk_import(
+        self,
+        source: Union[str, IO],
+        update_existing: bool = False,
+        chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> ImportReport:
+        """Import CSP LOB mappings from CSV.
+
+        Each chunk is validated column-wise, checked for (csp_code, lob_type)
+        duplicates within the file, and checked against stored mappings and
+        projects in one lookup each, then written in a single transaction.
+        Rows matching an existing mapping are reported as duplicates unless
+        ``update_existing`` is set, in which case they update it like
+        update_csp_lob: only the columns the file fills in are written, and
+        a blank status keeps the stored one (subject to the transition rules).
+        """
+        report = ImportReport()
+        seen = set()
+        reader = pd.read_csv(
+            source, dtype=str, keep_default_na=False, chunksize=chunk_size,
+            skipinitialspace=True
+        )
+        for chunk in reader:
+            chunk.columns = [c.strip().lower() for c in chunk.columns]
+            missing = [c for c in IMPORT_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}")
+            chunk.index = chunk.index + 2
+            report.total_rows += len(chunk)
+            self._import_chunk(chunk, seen, update_existing, report)
+        return report
+
+    def _import_chunk(self, chunk: pd.DataFrame, seen: set, update_existing: bool, report: ImportReport):
+        frame = CSPLOBValidator.validate_frame(chunk)
+        valid = frame["error"] == ""
+        # Optional cells the file actually fills in; validate_frame defaults a blank status
+        supplied = pd.DataFrame({
+            name: chunk[name].str.strip() != "" if name in chunk else False
+            for name in _OPTIONAL_COLUMNS
+        }, index=frame.index)
+
+        keys = pd.Series(list(zip(frame["csp_code"], frame["lob_type"])), index=frame.index)
+        repeated = valid & (keys.duplicated() | keys.isin(seen))
+        frame.loc[repeated, "error"] = "Duplicate CSP code and LOB type in file"
+        valid &= ~repeated
+        seen.update(keys[valid])
+
+        projects = self._existing_projects(frame.loc[valid, "project_id"].astype(int).unique().tolist())
+        unknown = valid & ~frame["project_id"].isin(list(projects))
+        frame.loc[unknown, "error"] = "Project not found"
+        valid &= ~unknown
+
+        existing = self._existing_mappings(frame.loc[valid, "csp_code"].unique().tolist())
+        matched = valid & keys.isin(list(existing))
+        if update_existing:
+            stored = pd.DataFrame(
+                [existing[key] for key in keys[matched]],
+                index=frame.index[matched],
+                columns=["id", "status", "effective_date", "termination_date"]
+            )
+            given = supplied[matched]
+            status = frame.loc[matched, "status"].where(given["status"], stored["status"])
+            blocked = CSPLOBValidator.invalid_transition_mask(stored["status"], status)
+            effective = frame.loc[matched, "effective_date"].where(
+                given["effective_date"], pd.to_datetime(stored["effective_date"])
+            )
+            termination = frame.loc[matched, "termination_date"].where(
+                given["termination_date"], pd.to_datetime(stored["termination_date"])
+            )
+            misordered = termination.notna() & (effective > termination)
+            frame.loc[misordered[misordered].index, "error"] = "Effective date must be before termination date"
+            frame.loc[blocked[blocked].index, "error"] = "Invalid status transition"
+            matched &= frame["error"] == ""
+        else:
+            frame.loc[matched, "error"] = "CSP LOB mapping already exists"
+        valid &= frame["error"] == ""
+
+        inserts = dict(zip(frame.index[valid & ~matched], _records(frame[valid & ~matched])))
+        updates = {}
+        for row, record in zip(frame.index[valid & matched], _records(frame[valid & matched])):
+            written = ["project_id"] + [name for name in _OPTIONAL_COLUMNS if supplied.at[row, name]]
+            updates[row] = dict({name: record[name] for name in written}, id=existing[keys[row]][0])
+
+        try:
+            self._write(inserts.values(), updates.values())
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            failed = self._write_row_by_row(inserts, updates)
+            for row, error in failed.items():
+                frame.loc[row, "error"] = f"Database error: {error.__class__.__name__}"
+                inserts.pop(row, None)
+                updates.pop(row, None)
+
+        report.inserted += len(inserts)
+        report.updated += len(updates)
+        failed = frame[frame["error"] != ""]
+        report.errors.extend(
+            RowError(row=int(row), csp_code=code, message=message)
+            for row, code, message in zip(failed.index, failed["csp_code"], failed["error"])
+        )
+
+    def _write(self, inserts, updates):
+        """Insert with one executemany and update with one per set of columns written"""
+        table = CSPLOB.__table__
+        inserts = list(inserts)
+        if inserts:
+            self.db.execute(insert(table), inserts)
+        groups: Dict[Tuple[str, ...], List[dict]] = {}
+        for record in updates:
+            groups.setdefault(tuple(name for name in record if name != "id"), []).append(record)
+        for names, records in groups.items():
+            stmt = update(table).where(table.c.id == _bind("id")).values({name: _bind(name) for name in names})
+            self.db.execute(stmt, [{f"b_{k}": v for k, v in r.items()} for r in records])
+
+    def _write_row_by_row(self, inserts: Dict[int, dict], updates: Dict[int, dict]) -> Dict[int, SQLAlchemyError]:
+        """Retry a failed chunk one row per savepoint; returns the rows that still fail"""
+        failed = {}
+        writes = [(row, [record], []) for row, record in inserts.items()]
+        writes += [(row, [], [record]) for row, record in updates.items()]
+        for row, insert_records, update_records in writes:
+            try:
+                with self.db.begin_nested():
+                    self._write(insert_records, update_records)
+            except SQLAlchemyError as e:
+                failed[row] = e
+        self.db.commit()
+        return failed
+
+    def _existing_projects(self, project_ids: List[int]) -> set:
+        """Ids in project_ids that exist in projects"""
+        found = set()
+        for start in range(0, len(project_ids), LOOKUP_BATCH_SIZE):
+            batch = project_ids[start:start + LOOKUP_BATCH_SIZE]
+            found.update(self.db.execute(select(_projects.c.id).where(_projects.c.id.in_(batch))).scalars())
+        return found
+
+    def _existing_mappings(self, codes: List[str]) -> Dict[Tuple[str, LOBType], tuple]:
+        """(csp_code, lob_type) -> (id, status, effective_date, termination_date) for mappings already stored"""
+        table = CSPLOB.__table__
+        found = {}
+        for start in range(0, len(codes), LOOKUP_BATCH_SIZE):
+            batch = codes[start:start + LOOKUP_BATCH_SIZE]
+            rows = self.db.execute(
+                select(
+                    table.c.id, table.c.csp_code, table.c.lob_type, table.c.status,
+                    table.c.effective_date, table.c.termination_date
+                ).where(table.c.csp_code.in_(batch))
+            ).all()
+            found.update({(code, lob): (id_, status, effective, termination)
+                          for id_, code, lob, status, effective, termination in rows})
+        return found
+
+def _bind(name: str):
+    # Bind names must differ from column names in UPDATE ... WHERE executemany
+    return bindparam(f"b_{name}")
+
+def _records(frame: pd.DataFrame) -> List[dict]:
+    """Frame rows as insert parameters, with NaN/NaT turned into None"""
+    records = []
+    for row in frame[list(_WRITE_COLUMNS)].itertuples(index=False):
+        record = {}
+        for name, value in zip(_WRITE_COLUMNS, row):
+            if pd.isna(value):
+                value = None
+            elif isinstance(value, pd.Timestamp):
+                value = value.to_pydatetime()
+            elif name == "project_id":
+                value = int(value)
+            record[name] = value
+        records.append(record)
+    return records
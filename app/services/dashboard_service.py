@@ -0,0 +1,93 @@
+"""Dashboard metrics service"""
+from dataclasses import dataclass, field
+from typing import List
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Display order used by the dashboard and reports; any other status sorts last
+STATUS_ORDER = ("New", "Active", "Review", "Completed")
+ACTIVE_STATUSES = ("New", "Active")
+PENDING_STATUS = "Review"
+
+# One scan of the project table: counts per status plus a conditional
+# aggregate for projects completed in the current calendar month
+DASHBOARD_METRICS_QUERY = """
+SELECT
+    Status,
+    COUNT(*) AS count,
+    SUM(
+        CASE
+            WHEN Status = 'Completed'
+            AND LastEditDate >= DATEADD(MONTH, DATEDIFF(MONTH, 0, GETDATE()), 0)
+            AND LastEditDate < DATEADD(MONTH, DATEDIFF(MONTH, 0, GETDATE()) + 1, 0)
+            THEN 1 ELSE 0
+        END
+    ) AS completed_this_month
+FROM CS_EXP_Project_Translation WITH (NOLOCK)
+GROUP BY Status
+"""
+
+
+@dataclass(frozen=True)
+class StatusCount:
+    """Number of projects in a single status"""
+    status: str
+    count: int
+
+
+@dataclass(frozen=True)
+class DashboardMetrics:
+    """Project metrics shown on the dashboard and reports pages"""
+    active: int = 0
+    pending: int = 0
+    completed_this_month: int = 0
+    status_distribution: List[StatusCount] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(item.count for item in self.status_distribution)
+
+    def distribution_frame(self) -> pd.DataFrame:
+        """Status distribution as a DataFrame with Status/count columns"""
+        return pd.DataFrame(
+            [{'Status': item.status, 'count': item.count} for item in self.status_distribution],
+            columns=['Status', 'count']
+        )
+
+
+def _status_sort_key(status: str):
+    if status in STATUS_ORDER:
+        return (STATUS_ORDER.index(status), '')
+    return (len(STATUS_ORDER), status or '')
+
+
+class DashboardService:
+    @staticmethod
+    def get_metrics(db: Session) -> DashboardMetrics:
+        """Compute all dashboard metrics in a single round-trip"""
+        rows = db.execute(text(DASHBOARD_METRICS_QUERY)).fetchall()
+        return DashboardService.build_metrics(rows)
+
+    @staticmethod
+    def build_metrics(rows) -> DashboardMetrics:
+        """Fold per-status aggregate rows into a DashboardMetrics result"""
+        distribution = []
+        active = pending = completed = 0
+
+        for row in rows:
+            status, count, completed_this_month = row[0], int(row[1] or 0), int(row[2] or 0)
+            distribution.append(StatusCount(status=status, count=count))
+            if status in ACTIVE_STATUSES:
+                active += count
+            elif status == PENDING_STATUS:
+                pending += count
+            completed += completed_this_month
+
+        distribution.sort(key=lambda item: _status_sort_key(item.status))
+        return DashboardMetrics(
+            active=active,
+            pending=pending,
+            completed_this_month=completed,
+            status_distribution=distribution
+        )
@@ -0,0 +1,186 @@
+"""Streaming table exports.
+
+Rows are read in partitions from a streamed result and encoded one batch at a
+time, so memory stays flat however large the table is. Y-Lines are read
+through y_line_repository's adapter, so the export comes from the same
+table (Y_LINE_STORAGE) as every other Y-Line view.
+"""
+import csv
+import io
+import re
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, Numeric, select
+
+from app.db.session import SessionLocal
+from app.models.competitor import Competitor
+from app.models.notes import ProjectNote
+from app.models.project import Project
+from app.models.service_area import ServiceArea
+from app.services.y_line_repository import YLineFilters, YLineRepository, build_query, y_line_repository
+
+# Rows fetched per round trip, and written per Parquet row group
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_TABLES = {
+    "projects": Project,
+    "competitors": Competitor,
+    "service-areas": ServiceArea,
+    "notes": ProjectNote,
+    "y-lines": y_line_repository,
+}
+
+# Anything else in a project id is replaced before it goes into a filename
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    @staticmethod
+    def validate(table: str, fmt: str, project_id: Optional[str] = None) -> None:
+        """Raise ValueError for an unknown table or format, a non-numeric Y-Line project, or missing pyarrow"""
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown export table: {table}")
+        y_lines = isinstance(EXPORT_TABLES[table], YLineRepository)
+        if y_lines and project_id is not None and not project_id.isdigit():
+            raise ValueError("Y-Line exports take the numeric project id")
+        if fmt not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet export requires pyarrow")
+
+    @staticmethod
+    def filename(table: str, fmt: str, project_id: Optional[str] = None) -> str:
+        """Attachment filename; project_id is reduced to [A-Za-z0-9_-] so it is header-safe"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        scope = _UNSAFE_FILENAME_CHARS.sub("_", project_id or "") or "all"
+        return f"{table}_{scope}_{stamp}.{fmt}"
+
+    @staticmethod
+    def stream(
+        table: str,
+        fmt: str,
+        project_id: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        session_factory=None,
+    ) -> Iterator[bytes]:
+        """Yield the encoded export of ``table``, optionally limited to one project.
+
+        The generator owns its session so it can outlive the request handler
+        that returned the StreamingResponse.
+        """
+        ExportService.validate(table, fmt, project_id)
+        stmt, convert = _export_query(EXPORT_TABLES[table], project_id)
+        columns = list(stmt.selected_columns)
+        stmt = stmt.execution_options(yield_per=batch_size)
+
+        encode = _encode_csv if fmt == "csv" else _encode_parquet
+        db = (session_factory or SessionLocal)()
+        try:
+            batches = db.execute(stmt).partitions()
+            if convert is not None:
+                batches = ([convert(row) for row in batch] for batch in batches)
+            yield from encode(columns, batches)
+        finally:
+            db.close()
+
+
+def _export_query(source, project_id: Optional[str]) -> Tuple[object, Optional[Callable]]:
+    """The export statement, and a per-row conversion where rows need one"""
+    if isinstance(source, YLineRepository):
+        adapter = source.adapter
+        filters = YLineFilters(project_id=int(project_id) if project_id is not None else None)
+
+        def convert(row):
+            record = adapter.to_record(row)
+            return tuple(record._replace(status=record.status.value if record.status else None))
+
+        return build_query(adapter, filters), convert
+
+    table = source.__table__
+    stmt = select(*table.columns).order_by(table.primary_key.columns)
+    if project_id is not None:
+        stmt = stmt.where(table.c.ProjectID == project_id)
+    return stmt, None
+
+
+def _encode_csv(columns, batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.name for c in columns])
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _arrow_type(column):
+    import pyarrow as pa
+
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _encode_parquet(columns, batches) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([pa.field(c.name, _arrow_type(c)) for c in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in batches:
+            arrays = [
+                pa.array([row[i] for row in batch], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,312 @@
+"""Full-text search over project notes (CS_EXP_ProjectNotes.Notes).
+
+Notes are only reachable by ProjectID, and a LIKE '%term%' over the Text
+column scans every note. This keeps an inverted index in memory: notes are
+tokenised, stop words dropped and words reduced to a crude stem, and
+queries are ranked with BM25. The index is written to NOTES_INDEX_PATH so a
+restart only reads notes edited since the saved watermark (the latest
+LastEditDate indexed). The notes routers update it directly on create,
+update and delete; writes made elsewhere (the Streamlit form) are picked up
+by the watermark check every NOTES_INDEX_REFRESH_SECONDS.
+"""
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.notes import ProjectNote
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the tokeniser or file layout changes; older files are rebuilt
+INDEX_FORMAT = 1
+# BM25 term frequency saturation and length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOP_WORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his i if in into is it its "
+    "me my no not of on or our she so that the their them they this to was we were will "
+    "with you your".split()
+)
+# (suffix, shortest stem left behind), checked in order after plurals are removed
+_SUFFIXES = (
+    ("ization", 3), ("ation", 3), ("ment", 3), ("ness", 3), ("ing", 3),
+    ("ied", 3), ("ed", 3), ("ly", 4), ("er", 3),
+)
+
+
+def stem(word: str) -> str:
+    """Reduce a word to a crude stem; applied the same to notes and queries"""
+    if word.isdigit() or len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "ches", "shes", "xes", "zes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix, shortest in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= shortest:
+            word = word[:-len(suffix)] + ("y" if suffix == "ied" else "")
+            break
+    # "planned" -> "plann" -> "plan", "update"/"updated" -> "updat"
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]
+    elif len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [
+        stem(word.replace("'", "")) for word in _WORD.findall((text or "").lower())
+        if word not in STOP_WORDS and len(word) > 1
+    ]
+
+
+class NoteHit(NamedTuple):
+    RecordID: int
+    ProjectID: Optional[str]
+    score: float
+
+
+class NoteSearchIndex:
+    def __init__(
+        self,
+        path: Optional[str] = settings.NOTES_INDEX_PATH,
+        refresh_seconds: float = settings.NOTES_INDEX_REFRESH_SECONDS,
+        save_seconds: float = settings.NOTES_INDEX_SAVE_SECONDS
+    ):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.save_seconds = save_seconds
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._docs: Dict[int, Tuple[Optional[str], int]] = {}
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._total_length = 0
+        self._watermark: Optional[datetime] = None
+        self._opened = False
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._checked_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        return self._watermark
+
+    def invalidate(self):
+        """Catch up with the notes table on next use, e.g. after a write outside the routers"""
+        self._checked_at = None
+
+    # Index maintenance
+
+    def add(self, record_id: int, project_id: Optional[str], text: Optional[str]):
+        """Index a note, replacing any earlier version of it"""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(record_id)
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[record_id] = tf
+            length = sum(counts.values())
+            self._docs[record_id] = (project_id, length)
+            self._doc_terms[record_id] = list(counts)
+            self._total_length += length
+            self._dirty = True
+
+    def remove(self, record_id: int):
+        with self._lock:
+            if self._remove(record_id):
+                self._dirty = True
+
+    def _remove(self, record_id: int) -> bool:
+        doc = self._docs.pop(record_id, None)
+        if doc is None:
+            return False
+        self._total_length -= doc[1]
+        for term in self._doc_terms.pop(record_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(record_id, None)
+                if not postings:
+                    del self._postings[term]
+        return True
+
+    # Router hooks; until the index is opened the first sync will see the change anyway
+
+    def index_note(self, note: ProjectNote):
+        """After a note is created or updated"""
+        if self._opened:
+            self.add(note.RecordID, note.ProjectID, note.Notes)
+            self.save_if_due()
+
+    def remove_note(self, record_id: int):
+        """After a note is deleted"""
+        if self._opened:
+            self.remove(record_id)
+            self.save_if_due()
+
+    # Keeping up with the table
+
+    def ensure_fresh(self, db: Session) -> "NoteSearchIndex":
+        """Open the saved index once, then re-read notes edited since the watermark when due"""
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.refresh_seconds:
+            return self
+        with self._lock:
+            if self._checked_at is checked_at:
+                if not self._opened:
+                    self._opened = True
+                    self.load()
+                self.sync(db)
+                self._checked_at = time.monotonic()
+                self.save_if_due()
+        return self
+
+    def sync(self, db: Session) -> int:
+        """Index notes edited at or after the watermark and drop deleted ones; returns notes read"""
+        query = select(ProjectNote.RecordID, ProjectNote.ProjectID, ProjectNote.Notes, ProjectNote.LastEditDate)
+        if self._watermark is not None:
+            # >= so a note saved in the same instant as the watermark is not missed
+            query = query.where(ProjectNote.LastEditDate >= self._watermark)
+        read = 0
+        watermark = self._watermark
+        for record_id, project_id, notes, edited in db.execute(query.execution_options(yield_per=1000)):
+            if edited == self._watermark and record_id in self._docs:
+                continue
+            self.add(record_id, project_id, notes)
+            if edited is not None and (watermark is None or edited > watermark):
+                watermark = edited
+            read += 1
+        self._watermark = watermark
+
+        # Deletes leave no timestamp; a count mismatch means some happened elsewhere
+        if db.execute(select(func.count()).select_from(ProjectNote)).scalar() != len(self._docs):
+            live = set(db.execute(select(ProjectNote.RecordID)).scalars())
+            for record_id in [r for r in self._docs if r not in live]:
+                self.remove(record_id)
+        if read:
+            logger.info(f"Indexed {read} notes for search")
+        return read
+
+    # Querying
+
+    def search(self, query: str, project_id: Optional[str] = None, limit: int = 20) -> List[NoteHit]:
+        """Notes ranked by BM25 over the query's terms, optionally within one project"""
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self._docs:
+                return []
+            n_docs = len(self._docs)
+            avg_length = self._total_length / n_docs or 1
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for record_id, tf in postings.items():
+                    doc_project, length = self._docs[record_id]
+                    if project_id is not None and doc_project != project_id:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    scores[record_id] = scores.get(record_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+            return [NoteHit(record_id, self._docs[record_id][0], score) for record_id, score in best]
+
+    # Persistence
+
+    def save_if_due(self):
+        if self._dirty and time.monotonic() - self._saved_at >= self.save_seconds:
+            self.save()
+
+    def save(self):
+        """Write the index atomically: a temp file in the same directory, then a rename"""
+        if not self.path:
+            return
+        with self._lock:
+            payload = {
+                "format": INDEX_FORMAT,
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+                "docs": {str(r): [project_id, length] for r, (project_id, length) in self._docs.items()},
+                "postings": {term: {str(r): tf for r, tf in postings.items()}
+                             for term, postings in self._postings.items()},
+            }
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".notes_index_")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self._dirty = True
+            logger.warning(f"Could not save notes index: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load(self) -> bool:
+        """Read a saved index; a missing, unreadable or outdated file means a full rebuild"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path) as f:
+                payload = json.load(f)
+            if payload.get("format") != INDEX_FORMAT:
+                logger.info("Notes index format changed; rebuilding")
+                return False
+            docs = {int(r): (project_id, length) for r, (project_id, length) in payload["docs"].items()}
+            postings = {term: {int(r): tf for r, tf in entries.items()}
+                        for term, entries in payload["postings"].items()}
+            watermark = payload["watermark"] and datetime.fromisoformat(payload["watermark"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable notes index {self.path}: {str(e)}")
+            return False
+
+        doc_terms: Dict[int, List[str]] = {r: [] for r in docs}
+        for term, entries in postings.items():
+            for record_id in entries:
+                doc_terms[record_id].append(term)
+        with self._lock:
+            self._docs, self._postings, self._doc_terms = docs, postings, doc_terms
+            self._total_length = sum(length for _, length in docs.values())
+            self._watermark = watermark or None
+            self._dirty = False
+        return True
+
+
+def search_notes(db: Session, query: str, project_id: Optional[str] = None,
+                 limit: int = 20) -> List[Tuple[ProjectNote, float]]:
+    """Ranked notes for ``query``, read from the table in one query"""
+    hits = note_search_index.ensure_fresh(db).search(query, project_id, limit)
+    if not hits:
+        return []
+    notes = {
+        note.RecordID: note
+        for note in db.execute(
+            select(ProjectNote).where(ProjectNote.RecordID.in_([hit.RecordID for hit in hits]))
+        ).scalars()
+    }
+    return [(notes[hit.RecordID], hit.score) for hit in hits if hit.RecordID in notes]
+
+
+note_search_index = NoteSearchIndex()
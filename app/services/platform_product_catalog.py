@@ -0,0 +1,171 @@
+"""In-memory catalog of CS_EXP_PlatformLoadProducts.
+
+The legacy CSP LOB screen pulled the whole table on every open and filtered
+Left(NWNW_ID, 2) = Left(ProjectID, 2) client-side. The catalog loads the
+table once per process and keeps it sorted by NWNW_ID and by NWPR_PFX, so a
+prefix lookup is two bisections. Later refreshes only fetch rows whose
+DataLoadDate is at or after the newest one already held.
+"""
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.platform_load_product import PlatformLoadProduct
+
+logger = logging.getLogger(__name__)
+
+# Sorts after every character, so prefix + _HIGH bounds all keys with that prefix
+_HIGH = "\U0010ffff"
+
+
+class PlatformProduct(NamedTuple):
+    RECORD_ID: int
+    NWNW_ID: Optional[str]
+    NWPR_PFX: Optional[str]
+    GRGR_ID: Optional[str]
+    GRGR_NAME: Optional[str]
+    DataLoadDate: Optional[datetime]
+
+
+_COLUMNS = [getattr(PlatformLoadProduct, name) for name in PlatformProduct._fields]
+
+
+def _normalise(value: Optional[str]) -> str:
+    return (value or "").strip().upper()
+
+
+class _PrefixIndex:
+    """Products sorted by one normalised column for prefix range scans"""
+
+    def __init__(self, products: Iterable[PlatformProduct], key: Callable[[PlatformProduct], str]):
+        self.products = sorted(products, key=lambda p: (key(p), p.RECORD_ID))
+        self.keys = [key(p) for p in self.products]
+
+    def prefix(self, prefix: str) -> List[PlatformProduct]:
+        prefix = _normalise(prefix)
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + _HIGH, lo)
+        return self.products[lo:hi]
+
+
+def _network_key(product: PlatformProduct) -> str:
+    return _normalise(product.NWNW_ID)
+
+
+def _product_key(product: PlatformProduct) -> str:
+    return _normalise(product.NWPR_PFX)
+
+
+class PlatformProductCatalog:
+    """Process-wide, incrementally refreshed copy of the platform load products"""
+
+    def __init__(self, refresh_seconds: float = settings.PLATFORM_CATALOG_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._products: Dict[int, PlatformProduct] = {}
+        # Replaced as a pair so readers never see one index without the other
+        self._indexes = (_PrefixIndex([], _network_key), _PrefixIndex([], _product_key))
+        self._watermark: Optional[datetime] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        return self._watermark
+
+    def ensure_fresh(self, db: Session) -> "PlatformProductCatalog":
+        """Refresh if the catalog was never loaded or the refresh interval has passed"""
+        checked_at = self._checked_at
+        if checked_at is None or time.monotonic() - checked_at >= self.refresh_seconds:
+            self.refresh(db)
+        return self
+
+    def refresh(self, db: Session, full: bool = False) -> int:
+        """Apply rows loaded since the watermark and return how many changed.
+
+        Deleted rows do not move the watermark, so the table's row count is
+        compared afterwards and a mismatch triggers a full reload.
+        """
+        with self._lock:
+            incremental = not full and self._checked_at is not None
+            products = dict(self._products) if incremental else {}
+            query = select(*_COLUMNS)
+            if incremental and self._watermark is not None:
+                # >= rather than >: rows stamped in the same instant may have
+                # arrived after the last read
+                query = query.where(PlatformLoadProduct.DataLoadDate >= self._watermark)
+            changed = 0
+            for row in db.execute(query):
+                product = PlatformProduct(*row)
+                if products.get(product.RECORD_ID) != product:
+                    products[product.RECORD_ID] = product
+                    changed += 1
+
+            if incremental:
+                total = db.execute(select(func.count()).select_from(PlatformLoadProduct)).scalar()
+                if total != len(products):
+                    logger.info("Platform product count changed; reloading catalog")
+                    products = {row[0]: PlatformProduct(*row) for row in db.execute(select(*_COLUMNS))}
+                    changed = len(self._products.keys() - products.keys()) + sum(
+                        1 for key, product in products.items() if self._products.get(key) != product
+                    )
+
+            if changed or not incremental:
+                self._indexes = (
+                    _PrefixIndex(products.values(), _network_key),
+                    _PrefixIndex(products.values(), _product_key),
+                )
+                self._products = products
+                dates = [p.DataLoadDate for p in products.values() if p.DataLoadDate is not None]
+                self._watermark = max(dates) if dates else None
+            self._checked_at = time.monotonic()
+            return changed
+
+    def by_network_prefix(self, prefix: str, limit: Optional[int] = None) -> List[PlatformProduct]:
+        return self._indexes[0].prefix(prefix)[:limit]
+
+    def by_product_prefix(self, prefix: str, limit: Optional[int] = None) -> List[PlatformProduct]:
+        return self._indexes[1].prefix(prefix)[:limit]
+
+    def for_project(self, project_id: str, limit: Optional[int] = None) -> List[PlatformProduct]:
+        """Products whose network shares the project's two-character prefix"""
+        return self.by_network_prefix(str(project_id)[:2], limit)
+
+    def search(
+        self,
+        network_prefix: Optional[str] = None,
+        product_prefix: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[PlatformProduct]:
+        """Products matching both prefixes; the narrower range is scanned"""
+        networks, products = self._indexes
+        if network_prefix is None and product_prefix is None:
+            return networks.products[:limit]
+        if product_prefix is None:
+            return networks.prefix(network_prefix)[:limit]
+        if network_prefix is None:
+            return products.prefix(product_prefix)[:limit]
+        by_network = networks.prefix(network_prefix)
+        by_product = products.prefix(product_prefix)
+        if len(by_product) < len(by_network):
+            wanted = _normalise(network_prefix)
+            matches = sorted(
+                (p for p in by_product if _network_key(p).startswith(wanted)),
+                key=lambda p: (_network_key(p), p.RECORD_ID)
+            )
+        else:
+            wanted = _normalise(product_prefix)
+            matches = [p for p in by_network if _product_key(p).startswith(wanted)]
+        return matches[:limit]
+
+
+platform_product_catalog = PlatformProductCatalog()
@@ -0,0 +1,144 @@
+"""Selected platform products per project (CS_EXP_Sel_PLProducts).
+
+The legacy LOB grid did a LookUp and a Patch for every checkbox toggle.
+Here the caller submits the full desired selection for a project; it is
+diffed against the stored rows read in one query, and only the inserts and
+deletes are applied, in one transaction. On SQL Server they go out as MERGE
+statements whose VALUES source carries an action flag per row.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db.crud.base import BULK_CHUNK_SIZE
+from app.models.selected_platform_product import SelectedPlatformProduct
+from app.services.service_area_service import DELETE_BATCH_SIZE
+
+# Columns copied from the platform product into the selection row
+SELECTION_COLUMNS = ("NWNW_ID", "NWPR_PFX", "GRGR_ID", "GRGR_NAME")
+# A selected product is identified by these within a project
+SELECTION_KEY = ("NWNW_ID", "NWPR_PFX", "GRGR_ID")
+# Each VALUES row binds 6 parameters; keeps a MERGE under SQL Server's 2100
+MERGE_ROWS_PER_BATCH = 300
+
+_MERGE_SQL = """
+MERGE CS_EXP_Sel_PLProducts AS T
+USING (VALUES {values})
+    AS S (SelAction, RECORD_ID, NWNW_ID, NWPR_PFX, GRGR_ID, GRGR_NAME)
+ON S.SelAction = 'D' AND T.RECORD_ID = S.RECORD_ID AND T.ProjectID = :project_id
+WHEN MATCHED THEN DELETE
+WHEN NOT MATCHED BY TARGET AND S.SelAction = 'I' THEN
+    INSERT (ProjectID, ProjectStatus, NWNW_ID, NWPR_PFX, GRGR_ID, GRGR_NAME, LastEditMSID, DataLoadDate)
+    VALUES (:project_id, :project_status, S.NWNW_ID, S.NWPR_PFX, S.GRGR_ID, S.GRGR_NAME, :user_msid, GETDATE());
+"""
+
+def selection_key(row: Any) -> Tuple[str, ...]:
+    """Case- and whitespace-insensitive key for a selection row object or dict"""
+    get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+    return tuple((get(name) or "").strip().upper() for name in SELECTION_KEY)
+
+@dataclass
+class SelectionChanges:
+    """Inserts and deletes that turn the stored selection into the desired one"""
+    to_insert: List[Dict[str, Any]] = field(default_factory=list)
+    to_delete: List[int] = field(default_factory=list)
+    unchanged: int = 0
+
+class PlatformSelectionService:
+    @staticmethod
+    def get_selection(db: Session, project_id: str) -> List[SelectedPlatformProduct]:
+        return db.execute(
+            select(SelectedPlatformProduct)
+            .where(SelectedPlatformProduct.ProjectID == project_id)
+            .order_by(SelectedPlatformProduct.NWNW_ID, SelectedPlatformProduct.NWPR_PFX)
+        ).scalars().all()
+
+    @staticmethod
+    def diff_selection(current: Iterable[Any], desired: Iterable[Dict[str, Any]]) -> SelectionChanges:
+        """Set difference between stored rows (with RECORD_ID) and desired product dicts"""
+        changes = SelectionChanges()
+        wanted = {}
+        for product in desired:
+            wanted.setdefault(selection_key(product), product)
+
+        matched = set()
+        for row in current:
+            key = selection_key(row)
+            if key in wanted and key not in matched:
+                matched.add(key)
+                changes.unchanged += 1
+            else:
+                changes.to_delete.append(row.RECORD_ID)
+
+        changes.to_insert = [
+            {name: product.get(name) for name in SELECTION_COLUMNS}
+            for key, product in wanted.items() if key not in matched
+        ]
+        return changes
+
+    @staticmethod
+    def save_selection(
+        db: Session,
+        project_id: str,
+        desired: Iterable[Dict[str, Any]],
+        project_status: Optional[str] = None,
+        user_msid: Optional[str] = None
+    ) -> SelectionChanges:
+        """Replace the project's selection with ``desired`` in one transaction"""
+        current = db.execute(
+            select(SelectedPlatformProduct.RECORD_ID,
+                   *[getattr(SelectedPlatformProduct, name) for name in SELECTION_KEY])
+            .where(SelectedPlatformProduct.ProjectID == project_id)
+        ).all()
+        changes = PlatformSelectionService.diff_selection(current, desired)
+        if not changes.to_insert and not changes.to_delete:
+            return changes
+
+        shared = {"project_id": project_id, "project_status": project_status, "user_msid": user_msid}
+        try:
+            if db.get_bind().dialect.name == "mssql":
+                PlatformSelectionService._merge(db, changes, shared)
+            else:
+                PlatformSelectionService._apply(db, changes, shared)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        return changes
+
+    @staticmethod
+    def _merge(db: Session, changes: SelectionChanges, shared: Dict[str, Any]):
+        rows = [("D", record_id, {}) for record_id in changes.to_delete]
+        rows += [("I", None, product) for product in changes.to_insert]
+        for start in range(0, len(rows), MERGE_ROWS_PER_BATCH):
+            values, params = [], dict(shared)
+            for i, (action, record_id, product) in enumerate(rows[start:start + MERGE_ROWS_PER_BATCH]):
+                values.append(f"(:a{i}, CAST(:r{i} AS INT), :n{i}, :p{i}, :g{i}, :gn{i})")
+                params.update({
+                    f"a{i}": action, f"r{i}": record_id,
+                    f"n{i}": product.get("NWNW_ID"), f"p{i}": product.get("NWPR_PFX"),
+                    f"g{i}": product.get("GRGR_ID"), f"gn{i}": product.get("GRGR_NAME"),
+                })
+            db.execute(text(_MERGE_SQL.format(values=", ".join(values))), params)
+
+    @staticmethod
+    def _apply(db: Session, changes: SelectionChanges, shared: Dict[str, Any]):
+        for start in range(0, len(changes.to_delete), DELETE_BATCH_SIZE):
+            batch = changes.to_delete[start:start + DELETE_BATCH_SIZE]
+            db.execute(
+                delete(SelectedPlatformProduct).where(
+                    SelectedPlatformProduct.ProjectID == shared["project_id"],
+                    SelectedPlatformProduct.RECORD_ID.in_(batch)
+                ),
+                execution_options={"synchronize_session": False}
+            )
+        rows = [
+            dict(product, ProjectID=shared["project_id"], ProjectStatus=shared["project_status"],
+                 LastEditMSID=shared["user_msid"])
+            for product in changes.to_insert
+        ]
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            db.execute(insert(SelectedPlatformProduct), rows[start:start + BULK_CHUNK_SIZE])
@@ -0,0 +1,235 @@
+"""Search-as-you-type over projects.
+
+The legacy app filtered CS_EXP_Project_Translation on every keystroke. Here
+ProjectID, ProjectDesc, Analyst, PM and BenchmarkFileID are broken into
+word trigrams held in memory, so a query only touches the projects sharing
+a trigram with it. Matches are ranked by the share of query trigrams found
+(which tolerates typos) plus a bonus when a field starts with the query.
+The last query word is treated as a prefix, so "hen" finds "Hennepin".
+
+Every PROJECT_SEARCH_REFRESH_SECONDS (or after invalidate()) the index reads
+projects edited since the latest LastEditDate it has seen, and rechecks the
+row count to drop deleted projects.
+"""
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from math import ceil
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+# Searched fields and the bonus when one starts with the query (doubled for an exact match)
+FIELD_WEIGHTS = (
+    ("ProjectID", 1.0),
+    ("BenchmarkFileID", 0.8),
+    ("ProjectDesc", 0.6),
+    ("Analyst", 0.5),
+    ("PM", 0.5),
+)
+SEARCH_FIELDS = tuple(name for name, _ in FIELD_WEIGHTS)
+# Share of the query's trigrams a project must contain to be returned
+MIN_SIMILARITY = 0.3
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# Sorts after any normalised text, closing a prefix range
+_HIGH = "\uffff"
+
+
+class ProjectEntry(NamedTuple):
+    RecordID: int
+    ProjectID: Optional[str]
+    BenchmarkFileID: Optional[str]
+    ProjectDesc: Optional[str]
+    Analyst: Optional[str]
+    PM: Optional[str]
+    Status: Optional[str]
+    LastEditDate: Optional[datetime]
+
+
+class ProjectMatch(NamedTuple):
+    project: ProjectEntry
+    score: float
+
+
+_COLUMNS = [getattr(Project, name) for name in ProjectEntry._fields]
+
+
+def normalise(text: Optional[str]) -> str:
+    return _NON_WORD.sub(" ", (text or "").lower()).strip()
+
+
+def trigrams(text: str, prefix: bool = False) -> Set[str]:
+    """Trigrams of each word padded with two leading and one trailing space.
+
+    With ``prefix`` the last word gets no trailing space, so a partly typed
+    word matches longer words that start with it.
+    """
+    words = text.split()
+    grams = set()
+    for i, word in enumerate(words):
+        padded = "  " + word + ("" if prefix and i == len(words) - 1 else " ")
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+def _word_starts(record_id: int, keys: Tuple[str, ...]) -> List[Tuple[str, int, int]]:
+    """(text from a word start to the end of the field, record, field) for each word"""
+    starts = []
+    for field, key in enumerate(keys):
+        for match in re.finditer(r"\S+", key):
+            starts.append((key[match.start():], record_id, field))
+    return starts
+
+
+class ProjectSearchIndex:
+    def __init__(self, refresh_seconds: float = settings.PROJECT_SEARCH_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._entries: Dict[int, ProjectEntry] = {}
+        self._keys: Dict[int, Tuple[str, ...]] = {}
+        self._grams: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        # Sorted so the fields starting with a query are one bisect range
+        self._starts: List[Tuple[str, int, int]] = []
+        self._watermark: Optional[datetime] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        return self._watermark
+
+    def invalidate(self):
+        """Catch up with the table on next use, e.g. after a project is saved"""
+        self._checked_at = None
+
+    def add(self, entry: ProjectEntry):
+        self.add_many([entry])
+
+    def add_many(self, entries: List[ProjectEntry]):
+        """Index projects, replacing earlier versions of them"""
+        with self._lock:
+            starts = []
+            for entry in entries:
+                keys = tuple(normalise(getattr(entry, name)) for name in SEARCH_FIELDS)
+                grams = set().union(*(trigrams(key) for key in keys))
+                self._remove(entry.RecordID)
+                self._entries[entry.RecordID] = entry
+                self._keys[entry.RecordID] = keys
+                self._grams[entry.RecordID] = grams
+                for gram in grams:
+                    self._postings.setdefault(gram, set()).add(entry.RecordID)
+                starts.extend(_word_starts(entry.RecordID, keys))
+            # A handful of edits are inserted in place; a bulk load is sorted once
+            if len(starts) < 100:
+                for start in starts:
+                    bisect.insort(self._starts, start)
+            else:
+                self._starts.extend(starts)
+                self._starts.sort()
+
+    def remove(self, record_id: int):
+        with self._lock:
+            self._remove(record_id)
+
+    def _remove(self, record_id: int):
+        if self._entries.pop(record_id, None) is None:
+            return
+        for start in _word_starts(record_id, self._keys.pop(record_id)):
+            del self._starts[bisect.bisect_left(self._starts, start)]
+        for gram in self._grams.pop(record_id):
+            postings = self._postings[gram]
+            postings.discard(record_id)
+            if not postings:
+                del self._postings[gram]
+
+    def ensure_fresh(self, db: Session) -> "ProjectSearchIndex":
+        """Read projects edited since the watermark when the refresh interval has passed"""
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.refresh_seconds:
+            return self
+        with self._lock:
+            if self._checked_at is checked_at:
+                self.sync(db)
+                self._checked_at = time.monotonic()
+        return self
+
+    def sync(self, db: Session) -> int:
+        """Index projects edited at or after the watermark and drop deleted ones; returns projects read"""
+        query = select(*_COLUMNS)
+        if self._watermark is not None:
+            # >= so a project saved in the same instant as the watermark is not missed
+            query = query.where(Project.LastEditDate >= self._watermark)
+        changed = []
+        watermark = self._watermark
+        for row in db.execute(query.execution_options(yield_per=1000)):
+            entry = ProjectEntry(*row)
+            if entry.LastEditDate is not None and (watermark is None or entry.LastEditDate > watermark):
+                watermark = entry.LastEditDate
+            if self._entries.get(entry.RecordID) != entry:
+                changed.append(entry)
+        self.add_many(changed)
+        self._watermark = watermark
+
+        # Deletes leave no timestamp; a count mismatch means some happened
+        if db.execute(select(func.count()).select_from(Project)).scalar() != len(self._entries):
+            live = set(db.execute(select(Project.RecordID)).scalars())
+            for record_id in [r for r in self._entries if r not in live]:
+                self.remove(record_id)
+        if changed:
+            logger.info(f"Indexed {len(changed)} projects for search")
+        return len(changed)
+
+    def search(self, query: str, limit: int = 10, min_similarity: float = MIN_SIMILARITY) -> List[ProjectMatch]:
+        """Best matches first; ties go to the most recently edited project"""
+        needle = normalise(query)
+        grams = trigrams(needle, prefix=not query.endswith(" "))
+        if not grams:
+            return []
+        with self._lock:
+            counts = Counter()
+            for gram in grams:
+                counts.update(self._postings.get(gram, ()))
+            needed = max(1, ceil(len(grams) * min_similarity))
+            bonus = self._prefix_bonus(needle)
+            entries = self._entries
+            ranked = [
+                (found / len(grams) + bonus.get(record_id, 0.0),
+                 entries[record_id].LastEditDate or datetime.min, record_id)
+                for record_id, found in counts.items() if found >= needed
+            ]
+            best = heapq.nlargest(limit, ranked)
+            return [ProjectMatch(entries[record_id], round(score, 4)) for score, _, record_id in best]
+
+    def _prefix_bonus(self, needle: str) -> Dict[int, float]:
+        """Per project, the best of: a field equal to the query (2x weight), a field
+        starting with it (1x) or a later word in a field starting with it (0.5x)"""
+        bonus: Dict[int, float] = {}
+        lo = bisect.bisect_left(self._starts, (needle,))
+        hi = bisect.bisect_left(self._starts, (needle + _HIGH,), lo)
+        for text, record_id, field in self._starts[lo:hi]:
+            weight = FIELD_WEIGHTS[field][1]
+            if text != self._keys[record_id][field]:
+                weight /= 2
+            elif text == needle:
+                weight *= 2
+            if weight > bonus.get(record_id, 0.0):
+                bonus[record_id] = weight
+        return bonus
+
+
+project_search_index = ProjectSearchIndex()
@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from app.db.crud.project import project as project_crud
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.project_search import ProjectMatch, project_search_index
+from app.utils.pagination import Page
 
 class ProjectService:
     @staticmethod
@@ -19,9 +21,29 @@ class ProjectService:
     ) -> List[Project]:
         return project_crud.get_multi(db=db, skip=skip, limit=limit)
     
+    @staticmethod
+    def get_projects_page(
+        db: Session, cursor: Optional[str] = None, limit: int = 100
+    ) -> Page:
+        """Most recently edited projects first, paged by (LastEditDate, RecordID)"""
+        return project_crud.get_multi_keyset(
+            db=db,
+            cursor=cursor,
+            limit=limit,
+            order_by=("LastEditDate", "RecordID"),
+            descending=True
+        )
+    
+    @staticmethod
+    def search_projects(db: Session, query: str, limit: int = 10) -> List[ProjectMatch]:
+        """Ranked prefix/fuzzy matches from the in-memory project search index"""
+        return project_search_index.ensure_fresh(db).search(query, limit=limit)
+    
     @staticmethod
     def create_project(db: Session, project: ProjectCreate) -> Project:
-        return project_crud.create(db=db, obj_in=project.dict())
+        created = project_crud.create(db=db, obj_in=project.dict())
+        project_search_index.invalidate()
+        return created
     
     @staticmethod
     def update_project(
@@ -29,11 +51,15 @@ class ProjectService:
     ) -> Optional[Project]:
         db_project = project_crud.get(db=db, record_id=record_id)
         if db_project:
-            return project_crud.update(
+            updated = project_crud.update(
                 db=db, db_obj=db_project, obj_in=project.dict(exclude_unset=True)
             )
+            project_search_index.invalidate()
+            return updated
         return None
     
     @staticmethod
     def delete_project(db: Session, record_id: int) -> Optional[Project]:
-        return project_crud.remove(db=db, record_id=record_id) 
\ No newline at end of file
+        removed = project_crud.remove(db=db, record_id=record_id)
+        project_search_index.invalidate()
+        return removed 
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""Process-wide reference data for dropdowns.
+
+Project types, project statuses, payors and the region/state/county list
+are read with a single UNION ALL query and held as immutable tuples,
+alongside the LOB type and CSP status enums. The registry re-reads them
+once REFERENCE_DATA_TTL_SECONDS have passed, or on next use after
+invalidate(). A version hash of the content lets HTTP clients and UI
+caches tell when it has changed. Forms read from the registry and never
+touch SQL while rendering.
+"""
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import String, cast, literal, null, select, true, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.county_centroid import CountyCentroid
+from app.models.csp_lob import CSPStatus, LOBType
+from app.models.project import Project
+from app.models.project_type import ProjectType
+from app.models.strenuus_product import StrenuusProduct
+
+logger = logging.getLogger(__name__)
+
+# Shown until the tables have been read, and merged ahead of statuses in use
+DEFAULT_PROJECT_STATUSES = ("New", "Active", "Review", "Completed")
+# After a failed load, ensure_loaded waits this long before trying again
+LOAD_RETRY_SECONDS = 60
+
+
+class ProjectTypeRef(NamedTuple):
+    code: str
+    description: str
+
+
+class CountyRef(NamedTuple):
+    state: str
+    county: str
+    region: Optional[str]
+
+
+DEFAULT_PROJECT_TYPES = (
+    ProjectTypeRef("T", "Translation"),
+    ProjectTypeRef("R", "Review"),
+    ProjectTypeRef("Q", "QA"),
+    ProjectTypeRef("O", "Other"),
+)
+
+
+class ReferenceData(NamedTuple):
+    project_types: Tuple[ProjectTypeRef, ...]
+    project_statuses: Tuple[str, ...]
+    lob_types: Tuple[str, ...]
+    csp_statuses: Tuple[str, ...]
+    payors: Tuple[str, ...]
+    regions: Tuple[str, ...]
+    states: Tuple[str, ...]
+    counties: Tuple[CountyRef, ...]
+    version: str
+    loaded_at: Optional[datetime]
+
+    def counties_for_state(self, state: str) -> List[CountyRef]:
+        state = (state or "").strip().upper()
+        return [c for c in self.counties if c.state.upper() == state]
+
+    def project_type_description(self, code: str) -> str:
+        return next((t.description for t in self.project_types if t.code == code), code)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "project_types": [t._asdict() for t in self.project_types],
+            "project_statuses": list(self.project_statuses),
+            "lob_types": list(self.lob_types),
+            "csp_statuses": list(self.csp_statuses),
+            "payors": list(self.payors),
+            "regions": list(self.regions),
+            "states": list(self.states),
+            "counties": [c._asdict() for c in self.counties],
+        }
+
+
+def _text(column):
+    return cast(column, String)
+
+
+def reference_query():
+    """Every reference table in one round trip, as (kind, a, b, c) rows"""
+    blank = cast(null(), String)
+    return union_all(
+        select(literal("project_type").label("kind"), _text(ProjectType.TypeCode).label("a"),
+               _text(ProjectType.Description).label("b"), blank.label("c"))
+        .where(ProjectType.IsActive == true()),
+        select(literal("project_status"), _text(Project.Status), blank, blank)
+        .where(Project.Status.is_not(None)).group_by(Project.Status),
+        select(literal("payor"), _text(StrenuusProduct.Payor), blank, blank)
+        .where(StrenuusProduct.Payor.is_not(None)).group_by(StrenuusProduct.Payor),
+        select(literal("county"), _text(CountyCentroid.State), _text(CountyCentroid.County),
+               _text(CountyCentroid.Region)),
+    )
+
+
+def _unique_sorted(values: Iterable[Optional[str]]) -> Tuple[str, ...]:
+    seen = {}
+    for value in values:
+        value = (value or "").strip()
+        if value:
+            seen.setdefault(value.upper(), value)
+    return tuple(sorted(seen.values(), key=str.upper))
+
+
+def build_reference_data(rows: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+                         loaded_at: Optional[datetime] = None) -> ReferenceData:
+    project_types, statuses, payors, counties = [], [], [], []
+    for kind, a, b, c in rows:
+        if kind == "project_type" and a:
+            project_types.append(ProjectTypeRef(a.strip(), (b or a).strip()))
+        elif kind == "project_status":
+            statuses.append(a)
+        elif kind == "payor":
+            payors.append(a)
+        elif kind == "county" and a and b:
+            counties.append(CountyRef(a.strip().upper(), b.strip(), (c or "").strip() or None))
+
+    defaults = {s.upper() for s in DEFAULT_PROJECT_STATUSES}
+    in_use = [s for s in _unique_sorted(statuses) if s.upper() not in defaults]
+    counties.sort(key=lambda c: (c.state, c.county.upper()))
+    data = dict(
+        project_types=tuple(sorted(project_types, key=lambda t: t.description.upper())) or DEFAULT_PROJECT_TYPES,
+        project_statuses=DEFAULT_PROJECT_STATUSES + tuple(in_use),
+        lob_types=tuple(t.value for t in LOBType),
+        csp_statuses=tuple(s.value for s in CSPStatus),
+        payors=_unique_sorted(payors),
+        regions=_unique_sorted(c.region for c in counties),
+        states=_unique_sorted(c.state for c in counties),
+        counties=tuple(counties),
+    )
+    version = hashlib.sha1(repr(sorted(data.items())).encode()).hexdigest()[:12]
+    return ReferenceData(version=version, loaded_at=loaded_at, **data)
+
+
+class ReferenceRegistry:
+    """Holds the current ReferenceData; readers get an immutable snapshot"""
+
+    def __init__(self, ttl_seconds: float = settings.REFERENCE_DATA_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._data = build_reference_data([])
+        self._loaded = False
+        self._checked_at: Optional[float] = None
+        self._failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> ReferenceData:
+        return self._data
+
+    def load(self, db: Session) -> ReferenceData:
+        """Read every reference table; on failure keep serving the previous data"""
+        try:
+            rows = db.execute(reference_query()).all()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not load reference data: {str(e)}")
+            self._failed_at = time.monotonic()
+            return self._data
+        data = build_reference_data(rows, loaded_at=datetime.now())
+        with self._lock:
+            if data.version != self._data.version:
+                logger.info(f"Reference data version {data.version} loaded")
+            self._data = data
+            self._loaded = True
+            self._checked_at = time.monotonic()
+        return data
+
+    def invalidate(self):
+        """Re-read on next use, e.g. after a load adds payors or counties"""
+        self._checked_at = None
+
+    def ensure_loaded(self, session_factory: Optional[Callable[[], Session]] = None) -> ReferenceData:
+        """Load on first use and again once the TTL has passed, opening a session from ``session_factory``"""
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.ttl_seconds:
+            return self._data
+        if self._failed_at is None or time.monotonic() - self._failed_at >= LOAD_RETRY_SECONDS:
+            db = (session_factory or SessionLocal)()
+            try:
+                self.load(db)
+            finally:
+                db.close()
+        return self._data
+
+
+reference_registry = ReferenceRegistry()
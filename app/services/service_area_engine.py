@@ -0,0 +1,285 @@
+"""In-process service-area radius engine.
+
+Replaces the uspCsExpProjectServiceAreaV2 round trip: county centroids are
+loaded once into NumPy arrays sorted by latitude, so a radius query only
+computes haversine distances for the latitude band that can possibly match.
+The project's footprint is stored in CS_EXP_zTrxServiceArea_Footprint. It
+is given by the caller, or captured on the first run from the project's
+original rows, and only while no radius has been applied yet: once
+uspCsExpProjectServiceAreaV2 or the engine has widened a project, its rows
+no longer tell the footprint apart from the radius. Every county within
+MaxMileage of any footprint centroid belongs in the service area. ReportInclude stays the analysts'
+flag and plays no part in the radius. Writes go through
+ServiceAreaService's set-difference sync.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.county_centroid import CountyCentroid
+from app.models.service_area import ServiceArea, ServiceAreaFootprint
+from app.services.service_area_service import ServiceAreaChanges, ServiceAreaService
+
+EARTH_RADIUS_MILES = 3958.8
+# ReportInclude of a project's original counties and of the rows the engine
+# inserts; analysts may change it
+FOOTPRINT_FLAG = "Y"
+ADDED_FLAG = "N"
+
+CountyKey = Tuple[str, str]
+
+
+def county_key(state: str, county: str) -> CountyKey:
+    return (state or "").strip().upper(), (county or "").strip().upper()
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """Great-circle distance in miles; arguments in radians, broadcast by NumPy"""
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class CountyIndex:
+    """County centroids held in latitude order for band-limited radius queries"""
+
+    def __init__(self, states: Sequence[str], counties: Sequence[str],
+                 regions: Sequence[Optional[str]], latitudes: Sequence[float],
+                 longitudes: Sequence[float]):
+        latitudes = np.asarray(latitudes, dtype=float)
+        order = np.argsort(latitudes, kind="stable")
+        self.states = np.asarray(states, dtype=object)[order]
+        self.counties = np.asarray(counties, dtype=object)[order]
+        self.regions = np.asarray(regions, dtype=object)[order]
+        self.lat_degrees = latitudes[order]
+        self.lat = np.radians(self.lat_degrees)
+        self.lon = np.radians(np.asarray(longitudes, dtype=float)[order])
+        self._positions = {
+            county_key(s, c): i for i, (s, c) in enumerate(zip(self.states, self.counties))
+        }
+
+    @classmethod
+    def load(cls, db: Session) -> "CountyIndex":
+        rows = db.execute(select(
+            CountyCentroid.State, CountyCentroid.County, CountyCentroid.Region,
+            CountyCentroid.Latitude, CountyCentroid.Longitude
+        )).all()
+        if not rows:
+            return cls([], [], [], [], [])
+        return cls(*zip(*rows))
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def positions(self, keys: Iterable[CountyKey]) -> Tuple[np.ndarray, List[CountyKey]]:
+        """Index positions for known counties, plus the keys that have no centroid"""
+        found, missing = [], []
+        for key in keys:
+            position = self._positions.get(county_key(*key))
+            if position is None:
+                missing.append(key)
+            else:
+                found.append(position)
+        return np.asarray(found, dtype=int), missing
+
+    def within(self, centers: np.ndarray, miles: float) -> np.ndarray:
+        """Positions of all counties within ``miles`` of any center position"""
+        mask = np.zeros(len(self), dtype=bool)
+        if len(centers) == 0 or len(self) == 0:
+            return np.flatnonzero(mask)
+        # A point within `miles` can differ in latitude by at most this much
+        band = np.degrees(miles / EARTH_RADIUS_MILES)
+        center_lat = self.lat_degrees[centers]
+        lows = np.searchsorted(self.lat_degrees, center_lat - band, side="left")
+        highs = np.searchsorted(self.lat_degrees, center_lat + band, side="right")
+        for center, lo, hi in zip(centers, lows, highs):
+            distances = haversine_miles(self.lat[center], self.lon[center], self.lat[lo:hi], self.lon[lo:hi])
+            mask[lo:hi] |= distances <= miles
+        return np.flatnonzero(mask)
+
+
+_county_index: Optional[CountyIndex] = None
+_county_index_lock = threading.Lock()
+
+
+def get_county_index(db: Session) -> CountyIndex:
+    """Process-wide county index, loaded from CS_EXP_CountyCentroid on first use"""
+    global _county_index
+    if _county_index is None:
+        with _county_index_lock:
+            if _county_index is None:
+                _county_index = CountyIndex.load(db)
+    return _county_index
+
+
+def reset_county_index() -> None:
+    """Forget the cached index, e.g. after reloading centroid data"""
+    global _county_index
+    with _county_index_lock:
+        _county_index = None
+
+
+@dataclass
+class ServiceAreaDiff:
+    project_id: str
+    max_mileage: float
+    changes: ServiceAreaChanges = field(default_factory=ServiceAreaChanges)
+    footprint: List[CountyKey] = field(default_factory=list)
+    missing_footprint: List[CountyKey] = field(default_factory=list)
+    # True when the footprint is new or replaced and apply() should store it
+    save_footprint: bool = False
+    applied: bool = False
+
+    @property
+    def to_add(self) -> List[dict]:
+        return self.changes.to_insert
+
+    @property
+    def to_remove(self) -> List[int]:
+        return self.changes.to_delete
+
+    @property
+    def removed_counties(self) -> List[CountyKey]:
+        return [(row["State"], row["County"]) for row in self.changes.deleted_rows]
+
+    @property
+    def kept(self) -> int:
+        return self.changes.unchanged
+
+    def summary(self) -> dict:
+        return {
+            "project_id": self.project_id,
+            "max_mileage": self.max_mileage,
+            "added": [(row["State"], row["County"]) for row in self.to_add],
+            "removed": self.removed_counties,
+            "kept": self.kept,
+            "footprint": self.footprint,
+            "missing_footprint": self.missing_footprint,
+            "applied": self.applied,
+        }
+
+
+def load_footprint(db: Session, project_id: str) -> List[CountyKey]:
+    """The project's stored footprint counties, empty if none was captured yet"""
+    return [tuple(row) for row in db.execute(
+        select(ServiceAreaFootprint.State, ServiceAreaFootprint.County)
+        .where(ServiceAreaFootprint.ProjectID == project_id)
+        .order_by(ServiceAreaFootprint.RecordID)
+    )]
+
+
+def _replace_footprint(db: Session, project_id: str, footprint: Sequence[CountyKey]) -> None:
+    """Stage the stored footprint; the caller commits"""
+    db.execute(delete(ServiceAreaFootprint).where(ServiceAreaFootprint.ProjectID == project_id))
+    rows, seen = [], set()
+    for state, county in footprint:
+        key = county_key(state, county)
+        if key[1] and key not in seen:
+            seen.add(key)
+            rows.append({"ProjectID": project_id, "State": (state or "").strip(), "County": county.strip()})
+    if rows:
+        db.execute(insert(ServiceAreaFootprint), rows)
+
+
+def _original_footprint(project_id: str, current) -> List[CountyKey]:
+    """Footprint captured from a project no radius has been applied to yet"""
+    if any(r.ReportInclude == ADDED_FLAG or (r.MaxMileage or 0) > 0 for r in current):
+        raise ValueError(
+            f"Project {project_id} already has a radius applied and no stored footprint; "
+            "give its footprint counties"
+        )
+    return [(r.State, r.County) for r in current if r.ReportInclude == FOOTPRINT_FLAG]
+
+
+class ServiceAreaEngine:
+    @staticmethod
+    def preview(
+        db: Session,
+        project_id: str,
+        max_mileage: float,
+        footprint: Optional[Sequence[CountyKey]] = None
+    ) -> ServiceAreaDiff:
+        """Work out which service-area rows the new radius adds and removes.
+
+        Footprint counties are always kept; other rows are kept only while
+        they stay within range, whatever their ReportInclude flag. Without a
+        ``footprint`` the stored one is used, or, on the first run, the rows
+        flagged FOOTPRINT_FLAG. A given or captured footprint is stored by
+        apply(). Raises ValueError if the project has no footprint, or has
+        none stored and its rows already carry a radius to capture one from.
+        """
+        if max_mileage < 0:
+            raise ValueError("Max mileage must not be negative")
+        current = db.execute(
+            select(ServiceArea.RecordID, ServiceArea.Region, ServiceArea.State,
+                   ServiceArea.County, ServiceArea.ReportInclude, ServiceArea.MaxMileage,
+                   ServiceArea.ProjectStatus)
+            .where(ServiceArea.ProjectID == project_id)
+        ).all()
+
+        save_footprint = footprint is not None
+        if footprint is None:
+            footprint = load_footprint(db, project_id)
+        if not footprint and not save_footprint:
+            footprint = _original_footprint(project_id, current)
+            save_footprint = True
+        if not footprint:
+            raise ValueError(f"Project {project_id} has no footprint counties")
+
+        footprint_keys = {county_key(*key) for key in footprint}
+        index = get_county_index(db)
+        centers, missing = index.positions(footprint)
+        in_range = {county_key(index.states[i], index.counties[i]): i for i in index.within(centers, max_mileage)}
+
+        # Rows to keep are passed through unchanged so the service sees them as matches
+        target, present = [], set()
+        for row in current:
+            key = county_key(row.State, row.County)
+            if key in in_range or key in footprint_keys:
+                target.append({"Region": row.Region, "State": row.State, "County": row.County})
+                present.add(key)
+
+        status = next((r.ProjectStatus for r in current if r.ProjectStatus), None)
+        for key, i in in_range.items():
+            if key not in present:
+                target.append({
+                    "Region": index.regions[i],
+                    "State": index.states[i],
+                    "County": index.counties[i],
+                    "ReportInclude": FOOTPRINT_FLAG if key in footprint_keys else ADDED_FLAG,
+                    "MaxMileage": int(round(max_mileage)),
+                    "ProjectStatus": status,
+                })
+
+        changes = ServiceAreaService.diff_service_areas(current, target)
+        return ServiceAreaDiff(
+            project_id, max_mileage, changes, footprint=list(footprint),
+            missing_footprint=missing, save_footprint=save_footprint
+        )
+
+    @staticmethod
+    def apply(
+        db: Session,
+        project_id: str,
+        max_mileage: float,
+        footprint: Optional[Sequence[CountyKey]] = None
+    ) -> ServiceAreaDiff:
+        """Preview, then write only the differences, and any new footprint, in one transaction"""
+        diff = ServiceAreaEngine.preview(db, project_id, max_mileage, footprint)
+        if diff.save_footprint:
+            try:
+                _replace_footprint(db, project_id, diff.footprint)
+            except SQLAlchemyError:
+                db.rollback()
+                raise
+        ServiceAreaService.apply_service_area_changes(
+            db, project_id, diff.changes, values={"MaxMileage": int(round(max_mileage))}
+        )
+        diff.applied = True
+        return diff
@@ -1,8 +1,35 @@
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from app.db.crud.base import BULK_CHUNK_SIZE, BulkResult
 from app.db.crud.service_area import service_area as service_area_crud
 from app.models.service_area import ServiceArea
 from app.schemas.service_area import ServiceAreaCreate, ServiceAreaUpdate
+from app.utils.pagination import Page
+
+# Columns identifying a county row within a project's service area
+SERVICE_AREA_KEY = ("Region", "State", "County")
+# Keeps RecordID IN lists under SQL Server's 2100-parameter limit
+DELETE_BATCH_SIZE = 2000
+
+def service_area_key(row: Any, key_columns: Sequence[str] = SERVICE_AREA_KEY) -> Tuple[str, ...]:
+    """Case- and whitespace-insensitive key for a row object or dict"""
+    get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+    return tuple((get(name) or "").strip().upper() for name in key_columns)
+
+@dataclass
+class ServiceAreaChanges:
+    """Inserts and deletes needed to turn the current rows into the target set"""
+    to_insert: List[Dict[str, Any]] = field(default_factory=list)
+    to_delete: List[int] = field(default_factory=list)
+    deleted_rows: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def write_count(self) -> int:
+        return len(self.to_insert) + len(self.to_delete)
 
 class ServiceAreaService:
     @staticmethod
@@ -19,6 +46,12 @@ class ServiceAreaService:
     ) -> List[ServiceArea]:
         return service_area_crud.get_multi(db=db, skip=skip, limit=limit)
     
+    @staticmethod
+    def get_service_areas_page(
+        db: Session, cursor: Optional[str] = None, limit: int = 100
+    ) -> Page:
+        return service_area_crud.get_multi_keyset(db=db, cursor=cursor, limit=limit)
+    
     @staticmethod
     def create_service_area(db: Session, service_area: ServiceAreaCreate) -> ServiceArea:
         return service_area_crud.create(db=db, obj_in=service_area.dict())
@@ -36,4 +69,95 @@ class ServiceAreaService:
     
     @staticmethod
     def delete_service_area(db: Session, record_id: int) -> Optional[ServiceArea]:
-        return service_area_crud.remove(db=db, record_id=record_id) 
\ No newline at end of file
+        return service_area_crud.remove(db=db, record_id=record_id)
+    
+    @staticmethod
+    def bulk_create_service_areas(
+        db: Session, rows: List[Dict[str, Any]], return_ids: bool = False
+    ) -> BulkResult:
+        return service_area_crud.bulk_create(db=db, objs_in=rows, return_ids=return_ids)
+    
+    @staticmethod
+    def bulk_update_service_areas(db: Session, rows: List[Dict[str, Any]]) -> BulkResult:
+        """Each row must carry its RecordID"""
+        return service_area_crud.bulk_update(db=db, objs_in=rows)
+    
+    @staticmethod
+    def bulk_delete_service_areas(db: Session, record_ids: List[int]) -> BulkResult:
+        return service_area_crud.bulk_delete(db=db, ids=record_ids)
+    
+    @staticmethod
+    def diff_service_areas(
+        current: Iterable[Any],
+        target: Iterable[Dict[str, Any]],
+        key_columns: Sequence[str] = SERVICE_AREA_KEY
+    ) -> ServiceAreaChanges:
+        """Set difference between current rows (with RecordID) and target dicts.
+
+        Rows present in both are left alone, so their RecordID and flags
+        such as ReportInclude survive. Duplicate target keys are ignored.
+        """
+        changes = ServiceAreaChanges()
+        wanted = {}
+        for row in target:
+            wanted.setdefault(service_area_key(row, key_columns), row)
+        
+        matched = set()
+        for row in current:
+            key = service_area_key(row, key_columns)
+            if key in wanted and key not in matched:
+                matched.add(key)
+                changes.unchanged += 1
+            else:
+                changes.to_delete.append(row.RecordID)
+                changes.deleted_rows.append({name: getattr(row, name) for name in key_columns})
+        
+        changes.to_insert = [row for key, row in wanted.items() if key not in matched]
+        return changes
+    
+    @staticmethod
+    def apply_service_area_changes(
+        db: Session,
+        project_id: str,
+        changes: ServiceAreaChanges,
+        values: Optional[Dict[str, Any]] = None
+    ) -> ServiceAreaChanges:
+        """Write the changes, plus optional column values for every project row, in one transaction"""
+        try:
+            for start in range(0, len(changes.to_delete), DELETE_BATCH_SIZE):
+                batch = changes.to_delete[start:start + DELETE_BATCH_SIZE]
+                db.execute(
+                    delete(ServiceArea).where(ServiceArea.RecordID.in_(batch)),
+                    execution_options={"synchronize_session": False}
+                )
+            rows = [dict(row, ProjectID=project_id) for row in changes.to_insert]
+            for start in range(0, len(rows), BULK_CHUNK_SIZE):
+                db.execute(insert(ServiceArea), rows[start:start + BULK_CHUNK_SIZE])
+            if values:
+                db.execute(
+                    update(ServiceArea).where(ServiceArea.ProjectID == project_id).values(**values),
+                    execution_options={"synchronize_session": False}
+                )
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        return changes
+    
+    @staticmethod
+    def sync_service_areas(
+        db: Session,
+        project_id: str,
+        target: Iterable[Dict[str, Any]],
+        values: Optional[Dict[str, Any]] = None,
+        key_columns: Sequence[str] = SERVICE_AREA_KEY
+    ) -> ServiceAreaChanges:
+        """Make the project's service area match ``target`` with the fewest writes.
+
+        Replaces delete-everything-and-regenerate: existing rows that are
+        still wanted keep their RecordID and ReportInclude flag.
+        """
+        columns = [getattr(ServiceArea, name) for name in dict.fromkeys(("RecordID",) + tuple(key_columns))]
+        current = db.execute(select(*columns).where(ServiceArea.ProjectID == project_id)).all()
+        changes = ServiceAreaService.diff_service_areas(current, target, key_columns)
+        return ServiceAreaService.apply_service_area_changes(db, project_id, changes, values)
@@ -0,0 +1,330 @@
+"""Staged bulk loads into CS_EXP_zTrxServiceArea.
+
+Grid edits and CSV uploads are written to CS_EXP_zTrxServiceArea_Stage in
+chunks (fast_executemany on SQL Server), so the live table is not touched
+while a load is being built. Promotion applies the whole load with one
+set-based MERGE in a single short transaction, replacing the row-by-row
+PATCH calls and uspCsExpZtrxServiceAreaV4. Each load has a
+CS_EXP_zTrxServiceArea_Load row recording its status and row counts.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db.crud.base import BULK_CHUNK_SIZE
+from app.models.service_area import ServiceArea
+from app.models.service_area_stage import ServiceAreaLoad, ServiceAreaStage
+from app.services.service_area_service import DELETE_BATCH_SIZE, service_area_key
+
+# Rows validated and written to the stage table per transaction
+STAGE_CHUNK_SIZE = 5000
+STAGE_COLUMNS = ("Region", "State", "County", "ReportInclude", "MaxMileage", "ProjectStatus")
+REQUIRED_COLUMNS = ("State", "County")
+# A county is identified by these within the load's project; Region is
+# nullable, so it is updated rather than matched on
+MATCH_COLUMNS = ("State", "County")
+# Blank staged values leave the live column as it is
+UPDATE_COLUMNS = ("Region", "ReportInclude", "MaxMileage", "ProjectStatus")
+DEFAULT_REPORT_INCLUDE = "N"
+_MAX_LENGTHS = {"Region": 30, "State": 2, "County": 75, "ProjectStatus": 10}
+
+STAGING = "staging"
+PROMOTED = "promoted"
+FAILED = "failed"
+DISCARDED = "discarded"
+
+_MERGE_SQL = """
+WITH target AS (
+    SELECT * FROM CS_EXP_zTrxServiceArea WHERE ProjectID = :project_id
+),
+source AS (
+    SELECT ProjectID, Region, State, County, ReportInclude, MaxMileage, ProjectStatus
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY State, County ORDER BY StageID DESC) AS rn
+        FROM CS_EXP_zTrxServiceArea_Stage
+        WHERE LoadID = :load_id
+    ) staged
+    WHERE rn = 1
+)
+MERGE target AS T
+USING source AS S
+    ON T.State = S.State AND T.County = S.County
+WHEN MATCHED AND EXISTS (
+    SELECT ISNULL(S.Region, T.Region), ISNULL(S.ReportInclude, T.ReportInclude),
+           ISNULL(S.MaxMileage, T.MaxMileage), ISNULL(S.ProjectStatus, T.ProjectStatus)
+    EXCEPT
+    SELECT T.Region, T.ReportInclude, T.MaxMileage, T.ProjectStatus
+) THEN UPDATE SET
+    Region = ISNULL(S.Region, T.Region),
+    ReportInclude = ISNULL(S.ReportInclude, T.ReportInclude),
+    MaxMileage = ISNULL(S.MaxMileage, T.MaxMileage),
+    ProjectStatus = ISNULL(S.ProjectStatus, T.ProjectStatus),
+    DataLoadDate = GETDATE()
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (ProjectID, Region, State, County, ReportInclude, MaxMileage, ProjectStatus, DataLoadDate)
+    VALUES (S.ProjectID, S.Region, S.State, S.County, ISNULL(S.ReportInclude, :default_report_include),
+            S.MaxMileage, S.ProjectStatus, GETDATE())
+{delete_clause}
+OUTPUT $action;
+"""
+
+@dataclass
+class StageRowError:
+    row: int  # grid row (1-based) or CSV line number, header is line 1
+    county: str
+    message: str
+
+@dataclass
+class StageReport:
+    load_id: int
+    staged: int = 0
+    errors: List[StageRowError] = field(default_factory=list)
+
+    def error_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [(e.row, e.county, e.message) for e in self.errors],
+            columns=["Row", "County", "Error"]
+        )
+
+def validate_stage_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Normalise service area rows and add an ``error`` column ('' when valid)"""
+    frame = frame.reindex(columns=list(STAGE_COLUMNS))
+    out = pd.DataFrame(index=frame.index)
+    for name in ("Region", "State", "County", "ReportInclude", "ProjectStatus"):
+        out[name] = frame[name].fillna("").astype(str).str.strip()
+    out["State"] = out["State"].str.upper()
+    out["ReportInclude"] = out["ReportInclude"].str.upper()
+
+    raw_mileage = frame["MaxMileage"]
+    blank_mileage = raw_mileage.isna() | (raw_mileage.astype(str).str.strip() == "")
+    out["MaxMileage"] = pd.to_numeric(raw_mileage.where(~blank_mileage), errors="coerce")
+
+    error = pd.Series("", index=frame.index)
+    checks = [
+        (out["County"] == "", "County is required"),
+        (out["State"].str.len() != 2, "State must be a two-letter code"),
+        (~out["ReportInclude"].isin(["Y", "N", ""]), "ReportInclude must be Y or N"),
+        (~blank_mileage & (out["MaxMileage"].isna() | (out["MaxMileage"] < 0)),
+         "MaxMileage must be a non-negative number"),
+    ]
+    checks += [
+        (out[name].str.len() > limit, f"{name} is longer than {limit} characters")
+        for name, limit in _MAX_LENGTHS.items() if name != "State"
+    ]
+    # Report the first failing check per row
+    for failed, message in reversed(checks):
+        error = error.mask(failed, message)
+    out["error"] = error
+    return out
+
+def _stage_records(frame: pd.DataFrame, load: ServiceAreaLoad) -> List[Dict[str, Any]]:
+    records = []
+    for row in frame[list(STAGE_COLUMNS)].itertuples(index=False):
+        record = {"LoadID": load.LoadID, "ProjectID": load.ProjectID}
+        for name, value in zip(STAGE_COLUMNS, row):
+            if name == "MaxMileage":
+                value = None if pd.isna(value) else int(round(value))
+            elif value == "":
+                value = None
+            record[name] = value
+        records.append(record)
+    return records
+
+class ServiceAreaStageService:
+    @staticmethod
+    def get_load(db: Session, load_id: int) -> Optional[ServiceAreaLoad]:
+        return db.get(ServiceAreaLoad, load_id)
+
+    @staticmethod
+    def start_load(
+        db: Session, project_id: str, source: str = "grid", user_msid: Optional[str] = None
+    ) -> ServiceAreaLoad:
+        load = ServiceAreaLoad(
+            ProjectID=project_id, Source=source, Status=STAGING,
+            RowsStaged=0, RowsRejected=0, LastEditMSID=user_msid
+        )
+        db.add(load)
+        db.commit()
+        db.refresh(load)
+        return load
+
+    @staticmethod
+    def stage_rows(
+        db: Session,
+        load_id: int,
+        rows: Union[pd.DataFrame, Iterable[Dict[str, Any]]],
+        chunk_size: int = STAGE_CHUNK_SIZE
+    ) -> StageReport:
+        """Stage grid rows (a DataFrame or dicts); may be called repeatedly for one load"""
+        load = ServiceAreaStageService._open_load(db, load_id)
+        frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        frame = frame.reset_index(drop=True)
+        frame.index = frame.index + load.RowsStaged + load.RowsRejected + 1
+        report = StageReport(load_id=load_id)
+        for start in range(0, len(frame), chunk_size):
+            ServiceAreaStageService._stage_chunk(db, load, frame.iloc[start:start + chunk_size], report)
+        return report
+
+    @staticmethod
+    def stage_csv(
+        db: Session, load_id: int, source: Union[str, IO], chunk_size: int = STAGE_CHUNK_SIZE
+    ) -> StageReport:
+        """Stream a CSV with Region, State, County, ReportInclude, MaxMileage columns into the load"""
+        load = ServiceAreaStageService._open_load(db, load_id)
+        report = StageReport(load_id=load_id)
+        reader = pd.read_csv(
+            source, dtype=str, keep_default_na=False, chunksize=chunk_size,
+            skipinitialspace=True
+        )
+        columns = {name.lower(): name for name in STAGE_COLUMNS}
+        for chunk in reader:
+            chunk.columns = [columns.get(c.strip().lower(), c.strip()) for c in chunk.columns]
+            missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}")
+            chunk.index = chunk.index + 2
+            ServiceAreaStageService._stage_chunk(db, load, chunk, report)
+        return report
+
+    @staticmethod
+    def promote(db: Session, load_id: int, replace: bool = False) -> ServiceAreaLoad:
+        """Apply the staged rows to CS_EXP_zTrxServiceArea in one transaction.
+
+        Staged counties are inserted or, when their values differ, updated;
+        blank staged values keep the live value and unchanged rows are not
+        written. With ``replace`` the load is the
+        project's complete service area and live counties missing from it
+        are deleted. A failed promotion rolls back, marks the load failed
+        and keeps its staged rows so it can be retried.
+        """
+        load = db.get(ServiceAreaLoad, load_id)
+        if load is None or load.Status not in (STAGING, FAILED):
+            raise ValueError(f"Load {load_id} cannot be promoted")
+        try:
+            if db.get_bind().dialect.name == "mssql":
+                inserted, updated, deleted = ServiceAreaStageService._merge(db, load, replace)
+            else:
+                inserted, updated, deleted = ServiceAreaStageService._merge_portable(db, load, replace)
+            db.execute(delete(ServiceAreaStage).where(ServiceAreaStage.LoadID == load_id))
+            load.Status = PROMOTED
+            load.RowsInserted, load.RowsUpdated, load.RowsDeleted = inserted, updated, deleted
+            load.Message = None
+            load.CompletedAt = datetime.now()
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            load = db.get(ServiceAreaLoad, load_id)
+            load.Status = FAILED
+            load.Message = str(e)[:500]
+            db.commit()
+            raise
+        db.refresh(load)
+        return load
+
+    @staticmethod
+    def discard(db: Session, load_id: int) -> ServiceAreaLoad:
+        """Drop a load's staged rows without promoting them"""
+        load = db.get(ServiceAreaLoad, load_id)
+        if load is None or load.Status not in (STAGING, FAILED):
+            raise ValueError(f"Load {load_id} cannot be discarded")
+        db.execute(delete(ServiceAreaStage).where(ServiceAreaStage.LoadID == load_id))
+        load.Status = DISCARDED
+        load.CompletedAt = datetime.now()
+        db.commit()
+        db.refresh(load)
+        return load
+
+    @staticmethod
+    def _open_load(db: Session, load_id: int) -> ServiceAreaLoad:
+        load = db.get(ServiceAreaLoad, load_id)
+        if load is None or load.Status != STAGING:
+            raise ValueError(f"Load {load_id} is not accepting rows")
+        return load
+
+    @staticmethod
+    def _stage_chunk(db: Session, load: ServiceAreaLoad, chunk: pd.DataFrame, report: StageReport):
+        frame = validate_stage_frame(chunk)
+        valid = frame["error"] == ""
+        records = _stage_records(frame[valid], load)
+        rejected = frame[~valid]
+        try:
+            if records:
+                db.execute(insert(ServiceAreaStage), records)
+            # Progress is committed with each chunk so status polling sees it
+            load.RowsStaged += len(records)
+            load.RowsRejected += len(rejected)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        report.staged += len(records)
+        report.errors.extend(
+            StageRowError(row=int(row), county=county, message=message)
+            for row, county, message in zip(rejected.index, rejected["County"], rejected["error"])
+        )
+
+    @staticmethod
+    def _merge(db: Session, load: ServiceAreaLoad, replace: bool) -> Tuple[int, int, int]:
+        delete_clause = "WHEN NOT MATCHED BY SOURCE THEN DELETE" if replace else ""
+        actions = db.execute(
+            text(_MERGE_SQL.format(delete_clause=delete_clause)),
+            {"project_id": load.ProjectID, "load_id": load.LoadID,
+             "default_report_include": DEFAULT_REPORT_INCLUDE}
+        ).scalars().all()
+        counts = Counter(actions)
+        return counts["INSERT"], counts["UPDATE"], counts["DELETE"]
+
+    @staticmethod
+    def _merge_portable(db: Session, load: ServiceAreaLoad, replace: bool) -> Tuple[int, int, int]:
+        """MERGE equivalent for backends without it, computed from one read of each side"""
+        staged = db.execute(
+            select(*[getattr(ServiceAreaStage, c) for c in STAGE_COLUMNS])
+            .where(ServiceAreaStage.LoadID == load.LoadID)
+            .order_by(ServiceAreaStage.StageID)
+        ).all()
+        # Later rows for the same county win, as in the MERGE source
+        latest = {service_area_key(row, MATCH_COLUMNS): row for row in staged}
+        current = db.execute(
+            select(ServiceArea.RecordID, *[getattr(ServiceArea, c) for c in STAGE_COLUMNS])
+            .where(ServiceArea.ProjectID == load.ProjectID)
+        ).all()
+        existing = {service_area_key(row, MATCH_COLUMNS): row for row in current}
+
+        inserts, updates = [], []
+        for key, row in latest.items():
+            live = existing.get(key)
+            if live is None:
+                record = dict(row._mapping, ProjectID=load.ProjectID)
+                record["ReportInclude"] = record["ReportInclude"] or DEFAULT_REPORT_INCLUDE
+                inserts.append(record)
+                continue
+            merged = {
+                c: getattr(live, c) if getattr(row, c) is None else getattr(row, c)
+                for c in UPDATE_COLUMNS
+            }
+            if any(merged[c] != getattr(live, c) for c in UPDATE_COLUMNS):
+                params = {f"b_{c}": value for c, value in merged.items()}
+                params["b_RecordID"] = live.RecordID
+                updates.append(params)
+        deletes = [live.RecordID for key, live in existing.items() if key not in latest] if replace else []
+
+        for start in range(0, len(inserts), BULK_CHUNK_SIZE):
+            db.execute(insert(ServiceArea), inserts[start:start + BULK_CHUNK_SIZE])
+        if updates:
+            table = ServiceArea.__table__
+            stmt = update(table).where(table.c.RecordID == bindparam("b_RecordID")).values(
+                dict({c: bindparam(f"b_{c}") for c in UPDATE_COLUMNS}, DataLoadDate=func.now())
+            )
+            db.execute(stmt, updates)
+        for start in range(0, len(deletes), DELETE_BATCH_SIZE):
+            db.execute(
+                delete(ServiceArea).where(ServiceArea.RecordID.in_(deletes[start:start + DELETE_BATCH_SIZE])),
+                execution_options={"synchronize_session": False}
+            )
+        return len(inserts), len(updates), len(deletes)
@@ -0,0 +1,141 @@
+"""Process-wide cache of the Strenuus_Product reference table.
+
+Competitor entry used to resolve EI/CS/MR with a LookUp per row and filter
+products by payor with another query. The table is small and changes only
+on vendor loads, so it is held in memory indexed by payor, product and
+product code. Every STRENUUS_CACHE_TTL_SECONDS (or after invalidate()) the
+cache compares the table's row count and latest LoadDate with the version
+it holds and reloads only when they differ.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.strenuus_product import StrenuusProduct
+from app.services.reference_data import reference_registry
+
+logger = logging.getLogger(__name__)
+
+FLAG_COLUMNS = ("EI", "CS", "MR")
+
+# (row count, latest LoadDate) identifying what the cache was built from
+Version = Tuple[int, Optional[datetime]]
+
+
+class StrenuusProductRef(NamedTuple):
+    KeyId: int
+    StrenuusProductCode: Optional[str]
+    Payor: Optional[str]
+    Product: Optional[str]
+    EI: bool
+    CS: bool
+    MR: bool
+    LoadDate: Optional[datetime]
+    IFP: Optional[int]
+
+    def flags(self) -> Dict[str, bool]:
+        return {name: bool(getattr(self, name)) for name in FLAG_COLUMNS}
+
+
+_COLUMNS = [getattr(StrenuusProduct, name) for name in StrenuusProductRef._fields]
+
+
+def _normalise(value: Optional[str]) -> str:
+    return (value or "").strip().upper()
+
+
+class _Snapshot:
+    """Immutable indexes over one load of the table"""
+
+    def __init__(self, products: List[StrenuusProductRef], version: Optional[Version]):
+        self.version = version
+        self.by_code: Dict[str, StrenuusProductRef] = {}
+        self.by_product: Dict[str, List[StrenuusProductRef]] = {}
+        self.by_payor: Dict[str, List[StrenuusProductRef]] = {}
+        payor_names: Dict[str, str] = {}
+        for product in sorted(products, key=lambda p: (_normalise(p.Product), p.KeyId)):
+            if product.StrenuusProductCode:
+                self.by_code.setdefault(_normalise(product.StrenuusProductCode), product)
+            self.by_product.setdefault(_normalise(product.Product), []).append(product)
+            payor = _normalise(product.Payor)
+            self.by_payor.setdefault(payor, []).append(product)
+            if payor:
+                payor_names.setdefault(payor, product.Payor.strip())
+        self.payors = sorted(payor_names.values(), key=str.upper)
+
+
+class StrenuusProductCache:
+    def __init__(self, ttl_seconds: float = settings.STRENUUS_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot = _Snapshot([], None)
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[Version]:
+        return self._snapshot.version
+
+    def invalidate(self):
+        """Check the table version on next use, e.g. after a vendor load"""
+        self._checked_at = None
+
+    def ensure_fresh(self, db: Session) -> "StrenuusProductCache":
+        """Reload when the TTL has passed (or after invalidate) and the table version changed"""
+        checked_at = self._checked_at
+        if checked_at is not None and time.monotonic() - checked_at < self.ttl_seconds:
+            return self
+        with self._lock:
+            if self._checked_at is checked_at:
+                version = tuple(db.execute(
+                    select(func.count(), func.max(StrenuusProduct.LoadDate))
+                ).one())
+                if version != self._snapshot.version:
+                    products = [StrenuusProductRef(*row) for row in db.execute(select(*_COLUMNS))]
+                    if self._snapshot.version is not None:
+                        # Payor dropdowns come from the reference registry
+                        reference_registry.invalidate()
+                    self._snapshot = _Snapshot(products, version)
+                    logger.info(f"Loaded {len(products)} Strenuus products")
+                self._checked_at = time.monotonic()
+        return self
+
+    def payors(self) -> List[str]:
+        return list(self._snapshot.payors)
+
+    def products_for_payor(self, payor: str) -> List[StrenuusProductRef]:
+        return list(self._snapshot.by_payor.get(_normalise(payor), ()))
+
+    def get_by_code(self, code: str) -> Optional[StrenuusProductRef]:
+        return self._snapshot.by_code.get(_normalise(code))
+
+    def get_by_product(self, product: str, payor: Optional[str] = None) -> List[StrenuusProductRef]:
+        matches = self._snapshot.by_product.get(_normalise(product), [])
+        if payor is not None:
+            matches = [p for p in matches if _normalise(p.Payor) == _normalise(payor)]
+        return list(matches)
+
+    def resolve(
+        self,
+        code: Optional[str] = None,
+        product: Optional[str] = None,
+        payor: Optional[str] = None
+    ) -> Optional[StrenuusProductRef]:
+        """The product a competitor row refers to: by code, else an unambiguous product name"""
+        if code:
+            found = self.get_by_code(code)
+            if found is not None:
+                return found
+        if product:
+            matches = self.get_by_product(product, payor)
+            if len(matches) == 1:
+                return matches[0]
+        return None
+
+
+strenuus_product_cache = StrenuusProductCache()
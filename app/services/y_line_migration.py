@@ -0,0 +1,196 @@
+"""One-shot, resumable copy of CS_EXP_YLine_Translation into y_lines.
+
+Legacy rows are read through the translation adapter, in RecordID order,
+batch_size at a time. Each batch's inserts, its rollup deltas and the
+advanced checkpoint commit in one transaction, so a job stopped at any
+point resumes after the last committed batch without copying a row twice.
+Rows with no IPA or product code, or an ipa_number already in y_lines, are
+skipped and counted. Rows whose ProjectID has no legacy_project_map entry
+are skipped too, counted as unmapped and their ProjectIDs logged; once the
+mappings are added, --restart runs the job again from the first RecordID
+and copies just the rows it skipped.
+
+Run with ``python -m app.services.y_line_migration [--batch-size N] [--max-batches N] [--restart]``,
+then set Y_LINE_STORAGE=y_lines.
+"""
+import argparse
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Set
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.crud.base import BULK_CHUNK_SIZE
+from app.db.session import SessionLocal
+from app.models.y_line import YLine
+from app.models.y_line_migration import YLineMigrationCheckpoint
+from app.models.yline import YLine as TranslationYLine
+from app.services.y_line_repository import ADAPTERS, YLineFilters, YLineRecord, YLineRepository
+from app.services.y_line_rollup import RollupDeltas
+from app.services.y_line_service import IN_LIST_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_JOB = "translation_to_y_lines"
+MIGRATION_BATCH_SIZE = BULK_CHUNK_SIZE
+
+_lines = YLine.__table__
+_checkpoints = YLineMigrationCheckpoint.__table__
+
+
+@dataclass
+class MigrationProgress:
+    job: str
+    last_record_id: int = 0
+    copied: int = 0
+    skipped: int = 0
+    unmapped: int = 0  # skipped for want of a legacy_project_map entry
+    batches: int = 0  # committed by this run
+    completed_at: Optional[datetime] = None
+    unmapped_projects: Set[str] = field(default_factory=set)  # seen by this run
+
+    @property
+    def completed(self) -> bool:
+        return self.completed_at is not None
+
+
+def _load_checkpoint(db: Session, job: str, restart: bool = False) -> MigrationProgress:
+    row = db.execute(select(_checkpoints).where(_checkpoints.c.job == job)).first()
+    if row is None:
+        db.execute(insert(_checkpoints).values(job=job, last_record_id=0, copied=0, skipped=0, unmapped=0))
+        db.commit()
+        return MigrationProgress(job)
+    if restart:
+        db.execute(update(_checkpoints).where(_checkpoints.c.job == job).values(
+            last_record_id=0, copied=0, skipped=0, unmapped=0, completed_at=None,
+        ))
+        db.commit()
+        return MigrationProgress(job)
+    return MigrationProgress(
+        job, row.last_record_id, row.copied, row.skipped, row.unmapped, completed_at=row.completed_at
+    )
+
+
+def _existing_ipa_numbers(db: Session, ipa_numbers: List[str]) -> set:
+    existing = set()
+    for start in range(0, len(ipa_numbers), IN_LIST_BATCH_SIZE):
+        batch = ipa_numbers[start:start + IN_LIST_BATCH_SIZE]
+        existing.update(ipa.upper() for ipa in db.execute(
+            select(_lines.c.ipa_number).where(_lines.c.ipa_number.in_(batch))
+        ).scalars())
+    return existing
+
+
+def _unmapped_projects(db: Session, records: List[YLineRecord]) -> Set[str]:
+    """Legacy ProjectIDs of the given translation records"""
+    record_ids = [r.id for r in records]
+    codes = set()
+    for start in range(0, len(record_ids), IN_LIST_BATCH_SIZE):
+        batch = record_ids[start:start + IN_LIST_BATCH_SIZE]
+        codes.update(db.execute(
+            select(TranslationYLine.ProjectID).where(TranslationYLine.RecordID.in_(batch)).distinct()
+        ).scalars())
+    return codes
+
+
+def _copyable(db: Session, records: List[YLineRecord]) -> List[YLineRecord]:
+    candidates = [r for r in records if r.project_id is not None and r.ipa_number and r.product_code]
+    seen = _existing_ipa_numbers(db, [r.ipa_number for r in candidates])
+    copyable = []
+    for record in candidates:
+        key = record.ipa_number.upper()
+        if key not in seen:
+            seen.add(key)
+            copyable.append(record)
+    return copyable
+
+
+def migrate_translation_y_lines(
+    db: Session,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    job: str = TRANSLATION_JOB,
+    restart: bool = False
+) -> MigrationProgress:
+    """Copy legacy Y-Lines after the checkpoint, up to max_batches batches (all when None).
+
+    restart rewinds the checkpoint to the first RecordID, e.g. after adding
+    legacy_project_map entries for the ProjectIDs reported as unmapped.
+    """
+    source = YLineRepository(ADAPTERS["translation"])
+    target = YLineRepository(ADAPTERS["y_lines"])
+    progress = _load_checkpoint(db, job, restart)
+    while not progress.completed and (max_batches is None or progress.batches < max_batches):
+        records = source.fetch(db, YLineFilters(after=progress.last_record_id, limit=batch_size))
+        copyable = _copyable(db, records)
+        unmapped = [r for r in records if r.project_id is None]
+        progress.unmapped_projects |= _unmapped_projects(db, unmapped)
+        rows = [
+            # y_lines assigns new ids; created_at is required downstream
+            dict(r._asdict(), created_at=r.created_at or datetime.now())
+            for r in copyable
+        ]
+        for row in rows:
+            del row["id"]
+        deltas = RollupDeltas()
+        for r in copyable:
+            deltas.add(r.project_id, r.status, r.estimated_value, r.actual_value)
+
+        if records:
+            progress.last_record_id = records[-1].id
+        progress.copied += len(rows)
+        progress.skipped += len(records) - len(rows)
+        progress.unmapped += len(unmapped)
+        if len(records) < batch_size:
+            progress.completed_at = datetime.now()
+        try:
+            for start in range(0, len(rows), BULK_CHUNK_SIZE):
+                db.execute(insert(_lines), rows[start:start + BULK_CHUNK_SIZE])
+            deltas.apply(db)
+            db.execute(update(_checkpoints).where(_checkpoints.c.job == job).values(
+                last_record_id=progress.last_record_id, copied=progress.copied,
+                skipped=progress.skipped, unmapped=progress.unmapped, completed_at=progress.completed_at,
+            ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        progress.batches += 1
+        target.invalidate()
+        logger.info(
+            f"Y-Line migration {job}: {progress.copied} copied, {progress.skipped} skipped "
+            f"({progress.unmapped} unmapped), through RecordID {progress.last_record_id}"
+        )
+    if progress.unmapped_projects:
+        logger.warning(
+            f"Y-Line migration {job}: no legacy_project_map entry for ProjectID "
+            f"{', '.join(sorted(progress.unmapped_projects))}; their rows were skipped"
+        )
+    return progress
+
+
+def main(argv: Optional[List[str]] = None) -> MigrationProgress:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=MIGRATION_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--restart", action="store_true", help="start again from the first RecordID")
+    args = parser.parse_args(argv)
+    db = SessionLocal()
+    try:
+        progress = migrate_translation_y_lines(
+            db, batch_size=args.batch_size, max_batches=args.max_batches, restart=args.restart
+        )
+    finally:
+        db.close()
+    print(f"{progress.copied} copied, {progress.skipped} skipped ({progress.unmapped} unmapped), "
+          f"through RecordID {progress.last_record_id}" + (" (complete)" if progress.completed else ""))
+    if progress.unmapped_projects:
+        print(f"Unmapped ProjectIDs: {', '.join(sorted(progress.unmapped_projects))}")
+    return progress
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
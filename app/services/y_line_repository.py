@@ -0,0 +1,219 @@
+"""One read path for Y-Lines, whichever table holds them.
+
+Y-Lines live in y_lines (YLineService) and in the legacy
+CS_EXP_YLine_Translation table, whose projects are mapped to projects.id by
+legacy_project_map. Each table has an adapter that exposes its columns
+under the same field names, so one query builder serves both and every
+read comes back as a YLineRecord. Reads go through the shared
+query_cache, tagged with the adapter's tables, so writers invalidate them
+the same way as the Streamlit queries.
+
+Y_LINE_STORAGE selects the table that is read. Once y_line_migration has
+copied the legacy rows, "y_lines" is the only store read or written.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import String, case, cast, func, literal, null, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.y_line import YLine, YLineStatus
+from app.models.y_line_migration import LegacyProjectMapping
+from app.models.yline import YLine as TranslationYLine
+from app.utils.query_cache import QueryCache, query_cache
+
+# Legacy status labels (compared lower-cased); anything else reads as PENDING
+LEGACY_STATUSES = {
+    "new": YLineStatus.PENDING,
+    "pending": YLineStatus.PENDING,
+    "active": YLineStatus.ACTIVE,
+    "complete": YLineStatus.COMPLETED,
+    "completed": YLineStatus.COMPLETED,
+    "closed": YLineStatus.COMPLETED,
+    "inactive": YLineStatus.CANCELLED,
+    "cancelled": YLineStatus.CANCELLED,
+    "canceled": YLineStatus.CANCELLED,
+}
+LEGACY_DEFAULT_STATUS = YLineStatus.PENDING
+
+# pre_award_status / post_award_status values for the legacy PreAward flag
+# and the Y-Line form's checkboxes
+AWARD_YES, AWARD_NO = "Yes", "No"
+
+
+class YLineRecord(NamedTuple):
+    id: int
+    project_id: Optional[int]
+    ipa_number: Optional[str]
+    product_code: Optional[str]
+    description: Optional[str]
+    pre_award_status: Optional[str]
+    post_award_status: Optional[str]
+    estimated_value: Optional[float]
+    actual_value: Optional[float]
+    status: Optional[YLineStatus]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+FIELDS = YLineRecord._fields
+
+_project_map = LegacyProjectMapping.__table__
+
+
+def legacy_status(label: Optional[str]) -> YLineStatus:
+    return LEGACY_STATUSES.get((label or "").strip().lower(), LEGACY_DEFAULT_STATUS)
+
+
+def award_flag(status: Optional[str]) -> bool:
+    """pre_award_status or post_award_status as a checkbox value"""
+    return (status or "").strip().lower() in ("yes", "y", "true", "1")
+
+
+class YLineAdapter(ABC):
+    """Maps YLineRecord fields onto one table"""
+    name: str
+    # Tables read, used as query_cache tags
+    tables: Tuple[str, ...]
+
+    @abstractmethod
+    def columns(self) -> Dict[str, object]:
+        """SQL expression for each YLineRecord field"""
+
+    def select_from(self, query):
+        return query
+
+    def status_condition(self, status: YLineStatus):
+        return self.columns()["status"] == status
+
+    def to_record(self, row) -> YLineRecord:
+        return YLineRecord(*row)
+
+
+class NativeYLineAdapter(YLineAdapter):
+    name = "y_lines"
+    tables = (YLine.__tablename__,)
+
+    def columns(self) -> Dict[str, object]:
+        return {name: YLine.__table__.c[name] for name in FIELDS}
+
+
+class TranslationYLineAdapter(YLineAdapter):
+    """CS_EXP_YLine_Translation, keyed to projects.id through legacy_project_map.
+
+    Rows whose ProjectID has no mapping read with project_id None. The
+    legacy table repeats an IPA across projects, products and markets, so
+    ipa_number is "<ProjectID>/<IPA>/<product>/<market>", which is unique
+    where y_lines.ipa_number must be. PreAward = 1 reads as pre-award and
+    anything else as post-award.
+    """
+    name = "translation"
+    tables = (TranslationYLine.__tablename__, LegacyProjectMapping.__tablename__)
+
+    def columns(self) -> Dict[str, object]:
+        t = TranslationYLine
+        text = lambda column: func.coalesce(cast(column, String), "")
+        return {
+            "id": t.RecordID,
+            "project_id": _project_map.c.project_id,
+            "ipa_number": case(
+                (t.NDB_Yline_IPA.is_(None), null()),
+                else_=text(t.ProjectID) + "/" + text(t.NDB_Yline_IPA) + "/"
+                + text(t.NDB_Yline_ProdCd) + "/" + text(t.NDB_Yline_MktNum),
+            ),
+            "product_code": t.NDB_Yline_ProdCd,
+            "description": null(),
+            "pre_award_status": case((t.PreAward == 1, literal(AWARD_YES)), else_=literal(AWARD_NO)),
+            "post_award_status": case((t.PreAward == 1, literal(AWARD_NO)), else_=literal(AWARD_YES)),
+            "estimated_value": null(),
+            "actual_value": null(),
+            "status": t.ProjectStatus,
+            "created_at": t.DataLoadDate,
+            "updated_at": t.LastEditDate,
+        }
+
+    def select_from(self, query):
+        return query.select_from(TranslationYLine).outerjoin(
+            _project_map, _project_map.c.legacy_project_id == TranslationYLine.ProjectID
+        )
+
+    def status_condition(self, status: YLineStatus):
+        label = func.lower(TranslationYLine.ProjectStatus)
+        if status is LEGACY_DEFAULT_STATUS:
+            others = [key for key, value in LEGACY_STATUSES.items() if value is not status]
+            return or_(TranslationYLine.ProjectStatus.is_(None), label.not_in(others))
+        return label.in_([key for key, value in LEGACY_STATUSES.items() if value is status])
+
+    def to_record(self, row) -> YLineRecord:
+        record = YLineRecord(*row)
+        return record._replace(status=legacy_status(record.status))
+
+
+@dataclass(frozen=True)
+class YLineFilters:
+    id: Optional[int] = None
+    project_id: Optional[int] = None
+    status: Optional[YLineStatus] = None
+    product_code: Optional[str] = None
+    after: Optional[int] = None  # return ids greater than this
+    limit: Optional[int] = None
+
+
+def build_query(adapter: YLineAdapter, filters: YLineFilters):
+    """Select YLineRecord fields from the adapter's table, in id order"""
+    columns = adapter.columns()
+    query = adapter.select_from(select(*(expression.label(name) for name, expression in columns.items())))
+    if filters.id is not None:
+        query = query.where(columns["id"] == filters.id)
+    if filters.project_id is not None:
+        query = query.where(columns["project_id"] == filters.project_id)
+    if filters.status is not None:
+        query = query.where(adapter.status_condition(filters.status))
+    if filters.product_code is not None:
+        query = query.where(columns["product_code"] == filters.product_code)
+    if filters.after is not None:
+        query = query.where(columns["id"] > filters.after)
+    query = query.order_by(columns["id"])
+    if filters.limit is not None:
+        query = query.limit(filters.limit)
+    return query
+
+
+class YLineRepository:
+    def __init__(self, adapter: YLineAdapter, cache: QueryCache = query_cache, ttl: Optional[float] = None):
+        self.adapter = adapter
+        self.cache = cache
+        self.ttl = ttl
+
+    def fetch(self, db: Session, filters: YLineFilters) -> List[YLineRecord]:
+        """Read without the cache"""
+        return [self.adapter.to_record(row) for row in db.execute(build_query(self.adapter, filters))]
+
+    def find(self, db: Session, **filters) -> List[YLineRecord]:
+        """Y-Lines matching YLineFilters fields, in id order, through the cache"""
+        filters = YLineFilters(**filters)
+        key = ("y_lines", self.adapter.name, filters)
+        return self.cache.get_or_load(key, lambda: self.fetch(db, filters), ttl=self.ttl, tags=self.adapter.tables)
+
+    def get(self, db: Session, y_line_id: int) -> Optional[YLineRecord]:
+        records = self.find(db, id=y_line_id)
+        return records[0] if records else None
+
+    def invalidate(self) -> int:
+        """Drop cached reads after a write to the adapter's tables"""
+        return self.cache.invalidate(*self.adapter.tables)
+
+
+ADAPTERS = {adapter.name: adapter for adapter in (NativeYLineAdapter(), TranslationYLineAdapter())}
+
+
+def _configured_repository() -> YLineRepository:
+    if settings.Y_LINE_STORAGE not in ADAPTERS:
+        raise ValueError(f"Y_LINE_STORAGE must be one of {', '.join(ADAPTERS)}, not {settings.Y_LINE_STORAGE!r}")
+    return YLineRepository(ADAPTERS[settings.Y_LINE_STORAGE])
+
+
+y_line_repository = _configured_repository()
@@ -0,0 +1,236 @@
+"""Per-project, per-status totals of Y-Line values, kept as lines change.
+
+Award dashboards read y_line_rollups (one row per project and status with
+the line count and the estimated and actual totals) instead of summing a
+project's Y-Lines. YLineService records the effect of every create, update,
+delete, ingest and bulk status change in a RollupDeltas and applies it in
+the same transaction as the change itself.
+
+Rows written outside the service and floating-point rounding can still make
+the totals drift, so reconcile_rollups recomputes them from y_lines; the
+RollupReconciler runs it every Y_LINE_ROLLUP_RECONCILE_SECONDS.
+"""
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.y_line import YLine, YLineStatus
+from app.models.y_line_rollup import YLineRollup
+
+logger = logging.getLogger(__name__)
+
+# Totals closer than this are treated as equal when reconciling
+TOTAL_TOLERANCE = 0.005
+
+_lines = YLine.__table__
+_rollups = YLineRollup.__table__
+
+RollupKey = Tuple[int, YLineStatus]
+
+
+@dataclass
+class RollupTotals:
+    status: YLineStatus
+    line_count: int = 0
+    estimated_total: float = 0.0
+    actual_total: float = 0.0
+
+    @property
+    def variance(self) -> float:
+        """Actual less estimated; negative when lines came in under estimate"""
+        return self.actual_total - self.estimated_total
+
+
+@dataclass
+class ProjectRollup:
+    project_id: int
+    line_count: int = 0
+    estimated_total: float = 0.0
+    actual_total: float = 0.0
+    updated_at: Optional[datetime] = None
+    by_status: List[RollupTotals] = field(default_factory=list)
+
+    @property
+    def variance(self) -> float:
+        return self.actual_total - self.estimated_total
+
+
+@dataclass
+class ReconcileResult:
+    checked: int = 0  # (project, status) groups compared
+    corrected: int = 0  # groups whose stored totals had drifted
+
+
+class RollupDeltas:
+    """Changes to rollup rows from one transaction, combined per (project, status)"""
+
+    def __init__(self):
+        self._changes: Dict[RollupKey, List[float]] = {}
+
+    def add(self, project_id: int, status: Optional[YLineStatus], estimated: Optional[float] = None,
+            actual: Optional[float] = None, count: int = 1):
+        # A NULL status counts as the column default
+        change = self._changes.setdefault((project_id, status or YLineStatus.PENDING), [0, 0.0, 0.0])
+        change[0] += count
+        change[1] += estimated or 0.0
+        change[2] += actual or 0.0
+
+    def remove(self, project_id: int, status: Optional[YLineStatus], estimated: Optional[float] = None,
+               actual: Optional[float] = None, count: int = 1):
+        self.add(project_id, status, -(estimated or 0.0), -(actual or 0.0), -count)
+
+    def totals(self) -> Dict[RollupKey, Tuple[int, float, float]]:
+        return {key: tuple(change) for key, change in self._changes.items()}
+
+    def apply(self, db: Session):
+        """Add the changes to y_line_rollups; the caller commits"""
+        for (project_id, status), (count, estimated, actual) in self._changes.items():
+            if not (count or estimated or actual):
+                continue
+            stmt = update(_rollups).where(
+                _rollups.c.project_id == project_id, _rollups.c.status == status
+            ).values(
+                line_count=_rollups.c.line_count + count,
+                estimated_total=_rollups.c.estimated_total + estimated,
+                actual_total=_rollups.c.actual_total + actual,
+            )
+            if db.execute(stmt).rowcount:
+                continue
+            try:
+                with db.begin_nested():
+                    db.execute(insert(_rollups).values(
+                        project_id=project_id, status=status, line_count=count,
+                        estimated_total=estimated, actual_total=actual,
+                    ))
+            except IntegrityError:
+                # Another transaction created the row first
+                db.execute(stmt)
+        self._changes.clear()
+
+
+def get_project_rollup(db: Session, project_id: int) -> ProjectRollup:
+    """A project's totals overall and by status, from its rollup rows"""
+    rollup = ProjectRollup(project_id=project_id)
+    query = select(_rollups).where(_rollups.c.project_id == project_id, _rollups.c.line_count != 0)
+    for row in db.execute(query):
+        rollup.by_status.append(RollupTotals(row.status, row.line_count, row.estimated_total, row.actual_total))
+        rollup.line_count += row.line_count
+        rollup.estimated_total += row.estimated_total
+        rollup.actual_total += row.actual_total
+        if row.updated_at is not None and (rollup.updated_at is None or row.updated_at > rollup.updated_at):
+            rollup.updated_at = row.updated_at
+    rollup.by_status.sort(key=lambda totals: list(YLineStatus).index(totals.status))
+    return rollup
+
+
+def locked_rollups_query(project_id: Optional[int] = None):
+    """Stored rollups, locked until commit against updates and new (project, status) rows.
+
+    SQL Server ignores FOR UPDATE, so it takes UPDLOCK, HOLDLOCK (a
+    serializable range lock) from a table hint instead.
+    """
+    query = select(_rollups).with_for_update().with_hint(_rollups, "WITH (UPDLOCK, HOLDLOCK)", "mssql")
+    if project_id is not None:
+        query = query.where(_rollups.c.project_id == project_id)
+    return query
+
+
+def reconcile_rollups(db: Session, project_id: Optional[int] = None) -> ReconcileResult:
+    """Recompute rollups from y_lines, for one project or all, and commit any corrections.
+
+    The stored rows are locked before y_lines is read, so a concurrent writer
+    either committed before the read (and is counted in it) or applies its
+    delta after this commits.
+    """
+    stored_query = locked_rollups_query(project_id)
+    source_query = select(
+        _lines.c.project_id, _lines.c.status, func.count(),
+        func.sum(_lines.c.estimated_value), func.sum(_lines.c.actual_value),
+    ).group_by(_lines.c.project_id, _lines.c.status)
+    if project_id is not None:
+        source_query = source_query.where(_lines.c.project_id == project_id)
+
+    try:
+        stored = {(row.project_id, row.status): row for row in db.execute(stored_query)}
+        source = RollupDeltas()
+        for line_project_id, status, count, estimated, actual in db.execute(source_query):
+            source.add(line_project_id, status, estimated, actual, count)
+        source = source.totals()
+        result = ReconcileResult()
+        for key in stored.keys() | source.keys():
+            result.checked += 1
+            count, estimated, actual = source.get(key, (0, 0.0, 0.0))
+            row = stored.get(key)
+            if row is not None and row.line_count == count \
+                    and abs(row.estimated_total - estimated) <= TOTAL_TOLERANCE \
+                    and abs(row.actual_total - actual) <= TOTAL_TOLERANCE:
+                continue
+            result.corrected += 1
+            values = dict(line_count=count, estimated_total=estimated, actual_total=actual)
+            if row is None:
+                db.execute(insert(_rollups).values(project_id=key[0], status=key[1], **values))
+            else:
+                db.execute(update(_rollups).where(
+                    _rollups.c.project_id == key[0], _rollups.c.status == key[1]
+                ).values(**values))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if result.corrected:
+        logger.warning(f"Corrected {result.corrected} of {result.checked} Y-Line rollups")
+    return result
+
+
+class RollupReconciler:
+    """Runs reconcile_rollups on a daemon thread every interval_seconds (0 disables)"""
+
+    def __init__(self, interval_seconds: float = settings.Y_LINE_ROLLUP_RECONCILE_SECONDS,
+                 session_factory: Optional[Callable[[], Session]] = None):
+        self.interval_seconds = interval_seconds
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> ReconcileResult:
+        db = (self.session_factory or SessionLocal)()
+        try:
+            return reconcile_rollups(db)
+        finally:
+            db.close()
+
+    def start(self):
+        if self.interval_seconds <= 0 or self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="y-line-rollup-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                # Try again next interval; the incremental totals are still served
+                logger.error(f"Y-Line rollup reconcile failed: {str(e)}")
+
+
+rollup_reconciler = RollupReconciler()
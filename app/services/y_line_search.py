@@ -0,0 +1,172 @@
+"""Search over Y-Lines that returns a keyset page, the total and facet counts.
+
+get_filtered_y_lines matches ``%term%`` on three columns, which scans the
+table, and pages with OFFSET. Here a search term is a prefix match on
+ipa_number and product_code, which seeks the unique IPA index and
+ix_y_lines_product_code. The description is searched only with CONTAINS,
+when a SQL Server full-text index exists (Y_LINE_FULLTEXT_SEARCH, see
+FULLTEXT_INDEX_DDL). Without it the description is left out: a
+``%term%`` branch in the OR would turn the whole predicate into a scan.
+get_filtered_y_lines still offers that substring search.
+
+The page and a count of matching rows grouped by status and value bucket
+come back from one UNION ALL statement; the total is the sum of the
+counts. Pages continue after the last id returned rather than skipping rows.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import Row, case, cast, func, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.y_line import YLine, YLineStatus
+
+# Upper bounds of the estimated_value facet buckets; larger values fall in "1m_plus"
+VALUE_BUCKETS = (
+    (10_000, "under_10k"),
+    (100_000, "10k_100k"),
+    (1_000_000, "100k_1m"),
+)
+TOP_BUCKET = "1m_plus"
+NO_VALUE_BUCKET = "none"
+
+# Run once per database before turning on Y_LINE_FULLTEXT_SEARCH; pk_name is
+# the name of the y_lines primary key index (sys.indexes, is_primary_key = 1)
+FULLTEXT_INDEX_DDL = """
+IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = 'ftc_y_lines')
+    CREATE FULLTEXT CATALOG ftc_y_lines;
+CREATE FULLTEXT INDEX ON y_lines (description) KEY INDEX {pk_name} ON ftc_y_lines
+    WITH CHANGE_TRACKING AUTO;
+"""
+
+_table = YLine.__table__
+_LIKE_SPECIAL = re.compile(r"([\\%_\[])")
+
+
+@dataclass
+class YLineSearchResult:
+    y_lines: List[Row]
+    next_after: Optional[int] = None  # pass back as ``after`` for the next page
+    total: Optional[int] = None  # None when facets were not requested
+    status_counts: Dict[str, int] = field(default_factory=dict)
+    value_counts: Dict[str, int] = field(default_factory=dict)
+
+
+def _like_escape(term: str) -> str:
+    # [ is a wildcard on SQL Server
+    return _LIKE_SPECIAL.sub(r"\\\1", term)
+
+
+def fulltext_condition(term: str) -> str:
+    """CONTAINS condition matching every word of term as a prefix"""
+    words = re.findall(r'[^\s"]+', term)
+    return " AND ".join(f'"{word}*"' for word in words)
+
+
+def value_bucket():
+    """estimated_value as its facet bucket label"""
+    return case(
+        (_table.c.estimated_value.is_(None), NO_VALUE_BUCKET),
+        *((_table.c.estimated_value < bound, label) for bound, label in VALUE_BUCKETS),
+        else_=TOP_BUCKET,
+    )
+
+
+def search_conditions(
+    project_id: Optional[int] = None,
+    status: Optional[YLineStatus] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    q: Optional[str] = None,
+    fulltext: Optional[bool] = None,
+) -> list:
+    t = _table
+    conditions = []
+    if project_id is not None:
+        conditions.append(t.c.project_id == project_id)
+    if status is not None:
+        conditions.append(t.c.status == status)
+    if min_value is not None:
+        conditions.append(t.c.estimated_value >= min_value)
+    if max_value is not None:
+        conditions.append(t.c.estimated_value <= max_value)
+    term = (q or "").strip()
+    if term:
+        # LIKE rather than ilike: the column collation is already case-insensitive
+        # on SQL Server, and lower() on the column would rule out an index seek
+        prefix = _like_escape(term) + "%"
+        matches = [
+            t.c.ipa_number.like(prefix, escape="\\"),
+            t.c.product_code.like(prefix, escape="\\"),
+        ]
+        if settings.Y_LINE_FULLTEXT_SEARCH if fulltext is None else fulltext:
+            matches.append(func.CONTAINS(t.c.description, fulltext_condition(term)))
+        conditions.append(or_(*matches))
+    return conditions
+
+
+def search_query(conditions: list, after: Optional[int], limit: int, facets: bool):
+    """The next limit + 1 matches by id and, with facets, (status, bucket) counts.
+
+    Rows are tagged by ``kind``: "row" rows carry a Y-Line, "facet" rows carry
+    status, bucket and n.
+    """
+    t = _table
+    page = select(*t.c).where(*conditions)
+    if after is not None:
+        page = page.where(t.c.id > after)
+    page = page.order_by(t.c.id).limit(limit + 1).subquery("page")
+    rows = select(literal("row").label("kind"), cast(null(), t.c.product_code.type).label("bucket"),
+                  cast(null(), t.c.id.type).label("n"), *page.c)
+    if not facets:
+        return rows
+
+    # The bucket CASE binds its bounds as parameters; SQL Server would see a
+    # copy in both SELECT and GROUP BY as two expressions, so group the
+    # derived table's column instead
+    matched = select(t.c.status, value_bucket().label("bucket")).where(*conditions).subquery("matched")
+    counts = select(
+        literal("facet"), matched.c.bucket, func.count(),
+        *(matched.c.status if c.name == "status" else cast(null(), c.type) for c in t.c)
+    ).group_by(matched.c.status, matched.c.bucket)
+    return union_all(rows, counts)
+
+
+def search_y_lines(
+    db: Session,
+    project_id: Optional[int] = None,
+    status: Optional[YLineStatus] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    q: Optional[str] = None,
+    after: Optional[int] = None,
+    limit: int = 50,
+    facets: bool = True,
+) -> YLineSearchResult:
+    """Y-Lines matching the filters with id > after, in id order.
+
+    Counts cover every match, not just the page, so they only need asking
+    for with the first page.
+    """
+    conditions = search_conditions(project_id, status, min_value, max_value, q)
+    y_lines, status_counts, value_counts = [], {}, {}
+    for row in db.execute(search_query(conditions, after, limit, facets)):
+        if row.kind == "row":
+            y_lines.append(row)
+            continue
+        key = row.status.value if row.status is not None else "none"
+        status_counts[key] = status_counts.get(key, 0) + row.n
+        value_counts[row.bucket] = value_counts.get(row.bucket, 0) + row.n
+
+    # The branches of a UNION ALL come back in no particular order
+    y_lines.sort(key=lambda row: row.id)
+    result = YLineSearchResult(y_lines=y_lines[:limit])
+    if len(y_lines) > limit:
+        result.next_after = y_lines[limit - 1].id
+    if facets:
+        result.total = sum(status_counts.values())
+        result.status_counts = status_counts
+        result.value_counts = value_counts
+    return result
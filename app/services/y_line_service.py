@@ -1,13 +1,105 @@
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Union
+import pandas as pd
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from fastapi import HTTPException
-from sqlalchemy import or_
+from sqlalchemy import Row, String, column, func, insert, or_, select, table as table_clause, update
 
-from app.models import YLine, Project
-from app.models.y_line import YLineStatus
+from app.db.crud.base import BULK_CHUNK_SIZE
+from app.models import Project
+from app.models.y_line import YLine, YLineStatus
 from app.schemas.y_line import YLineCreate, YLineUpdate
-from app.utils.validators import validate_ipa_number, validate_y_line_values
+from app.services.y_line_repository import YLineRecord, y_line_repository
+from app.services.y_line_rollup import (
+    ProjectRollup, ReconcileResult, RollupDeltas, get_project_rollup, reconcile_rollups
+)
+from app.services.y_line_search import YLineSearchResult, search_y_lines
+from app.utils.validators import (
+    invalid_ipa_number_mask, invalid_y_line_values_mask, validate_ipa_number, validate_y_line_values
+)
+
+# Values bound per IN list; stays under SQL Server's 2100-parameter limit
+IN_LIST_BATCH_SIZE = 2000
+
+# Columns a caller may supply when ingesting Y-Lines
+INGEST_COLUMNS = (
+    "ipa_number", "product_code", "description", "pre_award_status", "post_award_status",
+    "estimated_value", "actual_value", "status",
+)
+# Per-row outcomes in an ingest report
+INSERTED, REJECTED, SKIPPED = "inserted", "rejected", "skipped"
+
+# Target of y_lines.project_id; the legacy Project model maps a different table
+_projects = table_clause("projects", column("id"))
+
+@dataclass
+class YLineIngestRow:
+    row: int  # position in the submitted list, from 1
+    ipa_number: Optional[str]
+    status: str
+    message: Optional[str] = None
+
+@dataclass
+class YLineIngestReport:
+    """Per-row outcome of ingest_y_lines.
+
+    Rows are INSERTED, REJECTED with a message, or SKIPPED: valid but not
+    written because another row was rejected and partial acceptance was off.
+    """
+    project_id: int
+    received: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    rows: List[YLineIngestRow] = field(default_factory=list)
+
+def validate_y_line_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Normalise submitted Y-Line rows and add an ``error`` column ('' when valid)"""
+    frame = frame.reindex(columns=list(INGEST_COLUMNS))
+    out = pd.DataFrame(index=frame.index)
+    for name in ("ipa_number", "product_code", "description", "pre_award_status", "post_award_status"):
+        out[name] = frame[name].fillna("").astype(str).str.strip()
+
+    checks = [
+        (invalid_ipa_number_mask(out["ipa_number"]), "Invalid IPA number format"),
+        (out["product_code"] == "", "Product code is required"),
+    ]
+    for name in ("estimated_value", "actual_value"):
+        raw = frame[name]
+        blank = raw.isna() | (raw.astype(str).str.strip() == "")
+        out[name] = pd.to_numeric(raw.where(~blank), errors="coerce")
+        checks.append((~blank & out[name].isna(), f"{name} must be a number"))
+    checks.append((invalid_y_line_values_mask(out["estimated_value"], out["actual_value"]),
+                   "Invalid monetary values"))
+
+    statuses = {s.value: s for s in YLineStatus}
+    statuses.update({s.name.lower(): s for s in YLineStatus})
+    raw_status = frame["status"].map(lambda v: v.value if isinstance(v, YLineStatus) else v)
+    status_text = raw_status.fillna("").astype(str).str.strip().str.lower()
+    out["status"] = status_text.replace("", YLineStatus.PENDING.value).map(statuses)
+    checks.append((out["status"].isna(), "Unknown status"))
+
+    table = YLine.__table__
+    checks += [
+        (out[c.name].str.len() > c.type.length, f"{c.name} is longer than {c.type.length} characters")
+        for c in table.c if c.name in out and isinstance(c.type, String) and c.type.length
+    ]
+    error = pd.Series("", index=frame.index)
+    # Report the first failing check per row
+    for failed, message in reversed(checks):
+        error = error.mask(failed, message)
+    out["error"] = error
+    return out
+
+@dataclass
+class StatusUpdateResult:
+    """Outcome of a bulk status change; rows only when requested"""
+    status: YLineStatus
+    requested: int = 0
+    updated: int = 0
+    missing_ids: List[int] = field(default_factory=list)
+    y_lines: Optional[List[Dict[str, Any]]] = None
 
 class YLineService:
     def __init__(self, db: Session):
@@ -34,7 +126,11 @@ class YLineService:
                 **y_line_data.dict()
             )
             self.db.add(y_line)
+            deltas = RollupDeltas()
+            deltas.add(project_id, y_line.status, y_line.estimated_value, y_line.actual_value)
+            deltas.apply(self.db)
             self.db.commit()
+            y_line_repository.invalidate()
             self.db.refresh(y_line)
             return y_line
         except IntegrityError:
@@ -48,9 +144,9 @@ class YLineService:
             raise HTTPException(status_code=404, detail="Y-Line not found")
         return y_line
 
-    def get_project_y_lines(self, project_id: int) -> List[YLine]:
-        """Get all Y-Lines for a project"""
-        return self.db.query(YLine).filter(YLine.project_id == project_id).all()
+    def get_project_y_lines(self, project_id: int) -> List[YLineRecord]:
+        """Get all Y-Lines for a project from the configured Y-Line store"""
+        return y_line_repository.find(self.db, project_id=project_id)
 
     def update_y_line(self, y_line_id: int, y_line_data: YLineUpdate) -> YLine:
         """Update a Y-Line entry"""
@@ -64,10 +160,15 @@ class YLineService:
             if not validate_y_line_values(est_val, act_val):
                 raise HTTPException(status_code=400, detail="Invalid monetary values")
 
-        for field, value in update_data.items():
-            setattr(y_line, field, value)
+        deltas = RollupDeltas()
+        deltas.remove(y_line.project_id, y_line.status, y_line.estimated_value, y_line.actual_value)
+        for name, value in update_data.items():
+            setattr(y_line, name, value)
+        deltas.add(y_line.project_id, y_line.status, y_line.estimated_value, y_line.actual_value)
+        deltas.apply(self.db)
             
         self.db.commit()
+        y_line_repository.invalidate()
         self.db.refresh(y_line)
         return y_line
 
@@ -75,49 +176,202 @@ class YLineService:
         """Delete a Y-Line entry"""
         y_line = self.get_y_line(y_line_id)
         self.db.delete(y_line)
+        deltas = RollupDeltas()
+        deltas.remove(y_line.project_id, y_line.status, y_line.estimated_value, y_line.actual_value)
+        deltas.apply(self.db)
         self.db.commit()
+        y_line_repository.invalidate()
         return True 
 
-    def bulk_create_y_lines(self, project_id: int, y_lines_data: List[YLineCreate]) -> List[YLine]:
-        """Create multiple Y-Lines in a single transaction"""
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-        if not project:
+    def bulk_create_y_lines(self, project_id: int, y_lines_data: List[YLineCreate]) -> List[Row]:
+        """Create multiple Y-Lines in a single transaction; any bad row rejects them all"""
+        report = self.ingest_y_lines(project_id, y_lines_data)
+        if report.rejected:
+            raise HTTPException(status_code=400, detail=[
+                {"row": r.row, "ipa_number": r.ipa_number, "message": r.message}
+                for r in report.rows if r.status == REJECTED
+            ])
+        table = YLine.__table__
+        ipa_numbers = [r.ipa_number for r in report.rows]
+        created = []
+        for start in range(0, len(ipa_numbers), IN_LIST_BATCH_SIZE):
+            created.extend(self.db.execute(
+                select(table).where(table.c.ipa_number.in_(ipa_numbers[start:start + IN_LIST_BATCH_SIZE]))
+            ))
+        return sorted(created, key=lambda row: row.id)
+
+    def ingest_y_lines(
+        self,
+        project_id: int,
+        rows: Iterable[Union[YLineCreate, Dict[str, Any]]],
+        partial: bool = False
+    ) -> YLineIngestReport:
+        """Validate a whole Y-Line file up front, then insert it in executemany chunks.
+
+        Rows are checked column-wise, IPA numbers are checked for repeats
+        within the batch and against the table, and the accepted rows are
+        inserted in chunks of BULK_CHUNK_SIZE in one transaction. Without
+        ``partial`` a single rejected row means nothing is inserted.
+        """
+        exists = self.db.execute(select(_projects.c.id).where(_projects.c.id == project_id)).first()
+        if exists is None:
             raise HTTPException(status_code=404, detail="Project not found")
-        
-        y_lines = []
+
+        records = [row.dict() if isinstance(row, BaseModel) else dict(row) for row in rows]
+        report = YLineIngestReport(project_id=project_id, received=len(records))
+        if not records:
+            return report
+        frame = validate_y_line_frame(pd.DataFrame.from_records(records))
+        error = frame["error"]
+
+        # SQL Server's default collation compares IPA numbers case-insensitively
+        ipa_key = frame["ipa_number"].str.upper()
+        repeated = (error == "") & ipa_key.where(error == "").duplicated(keep="first") & (ipa_key != "")
+        error = error.mask(repeated, "Duplicate IPA number in this batch")
+
+        table = YLine.__table__
+        candidates = frame.loc[error == "", "ipa_number"].tolist()
+        existing = set()
+        for start in range(0, len(candidates), IN_LIST_BATCH_SIZE):
+            batch = candidates[start:start + IN_LIST_BATCH_SIZE]
+            existing.update(ipa.upper() for ipa in self.db.execute(
+                select(table.c.ipa_number).where(table.c.ipa_number.in_(batch))
+            ).scalars())
+        error = error.mask((error == "") & ipa_key.isin(existing), "IPA number already exists")
+
+        accepted = error == ""
+        report.rejected = int((~accepted).sum())
+        write = partial or report.rejected == 0
+        outcome = accepted.map({True: INSERTED if write else SKIPPED, False: REJECTED})
+        report.rows = [
+            YLineIngestRow(row=i + 1, ipa_number=ipa or None, status=status, message=message or None)
+            for i, (ipa, status, message) in enumerate(zip(frame["ipa_number"], outcome, error))
+        ]
+        if not write or not accepted.any():
+            return report
+
+        values = frame.loc[accepted, list(INGEST_COLUMNS)]
+        values = values.astype(object).where(values.notna(), None)
+        for name in ("description", "pre_award_status", "post_award_status"):
+            values[name] = values[name].replace("", None)
+        insert_rows = [dict(zip(INGEST_COLUMNS, row), project_id=project_id) for row in values.itertuples(index=False)]
+        deltas = RollupDeltas()
+        for row in insert_rows:
+            deltas.add(project_id, row["status"], row["estimated_value"], row["actual_value"])
         try:
-            for y_line_data in y_lines_data:
-                if not validate_ipa_number(y_line_data.ipa_number):
-                    raise ValueError(f"Invalid IPA number: {y_line_data.ipa_number}")
-                    
-                y_line = YLine(
-                    project_id=project_id,
-                    **y_line_data.dict()
-                )
-                self.db.add(y_line)
-                y_lines.append(y_line)
-                
+            for start in range(0, len(insert_rows), BULK_CHUNK_SIZE):
+                self.db.execute(insert(table), insert_rows[start:start + BULK_CHUNK_SIZE])
+            deltas.apply(self.db)
             self.db.commit()
-            return y_lines
-        except Exception as e:
+            y_line_repository.invalidate()
+        except IntegrityError:
+            # Another writer took one of the IPA numbers after the check
+            self.db.rollback()
+            raise HTTPException(status_code=400, detail="IPA number already exists")
+        except SQLAlchemyError as e:
             self.db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
+        report.inserted = len(insert_rows)
+        return report
 
-    def bulk_update_status(self, y_line_ids: List[int], status: YLineStatus) -> List[YLine]:
-        """Update status for multiple Y-Lines"""
-        y_lines = self.db.query(YLine).filter(YLine.id.in_(y_line_ids)).all()
-        if len(y_lines) != len(y_line_ids):
-            raise HTTPException(status_code=404, detail="Some Y-Lines not found")
-        
+    def bulk_update_status(
+        self,
+        y_line_ids: List[int],
+        status: YLineStatus,
+        return_rows: bool = False,
+        strict: bool = False
+    ) -> StatusUpdateResult:
+        """Set status with set-based UPDATEs, without loading Y-Lines.
+
+        IDs are deduplicated and sent in batches of IN_LIST_BATCH_SIZE,
+        all in one transaction. Where the backend supports it the matched IDs
+        (or whole rows, with ``return_rows``) come back from the UPDATE itself
+        via OUTPUT/RETURNING; otherwise they are read back per batch. IDs that
+        matched nothing are reported in ``missing_ids``, or with ``strict``
+        the change is rolled back and 404 raised.
+        """
+        table = YLine.__table__
+        ids = sorted(set(y_line_ids))
+        result = StatusUpdateResult(status=status, requested=len(ids))
+        returning = self.db.get_bind().dialect.update_returning
+        columns = list(table.c) if return_rows else [table.c.id]
+        found = set()
+        rows = []
+        deltas = RollupDeltas()
         try:
-            for y_line in y_lines:
-                y_line.status = status
+            for start in range(0, len(ids), IN_LIST_BATCH_SIZE):
+                batch = ids[start:start + IN_LIST_BATCH_SIZE]
+                # Totals of the lines changing status, to move between rollup rows
+                moving = self.db.execute(
+                    select(table.c.project_id, table.c.status, func.count(),
+                           func.sum(table.c.estimated_value), func.sum(table.c.actual_value))
+                    .where(table.c.id.in_(batch), or_(table.c.status != status, table.c.status.is_(None)))
+                    .group_by(table.c.project_id, table.c.status)
+                )
+                for project_id, old_status, count, estimated, actual in moving:
+                    deltas.remove(project_id, old_status, estimated, actual, count)
+                    deltas.add(project_id, status, estimated, actual, count)
+                stmt = update(table).where(table.c.id.in_(batch)).values(status=status)
+                if returning:
+                    matched = self.db.execute(stmt.returning(*columns))
+                else:
+                    self.db.execute(stmt)
+                    matched = self.db.execute(select(*columns).where(table.c.id.in_(batch)))
+                for row in matched:
+                    found.add(row.id)
+                    if return_rows:
+                        rows.append(dict(row._mapping))
+
+            result.updated = len(found)
+            result.missing_ids = [i for i in ids if i not in found]
+            if strict and result.missing_ids:
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=404,
+                    detail={"message": "Some Y-Lines not found", "missing_ids": result.missing_ids}
+                )
+            deltas.apply(self.db)
             self.db.commit()
-            return y_lines
-        except Exception as e:
+            y_line_repository.invalidate()
+        except SQLAlchemyError as e:
             self.db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
 
+        if return_rows:
+            result.y_lines = sorted(rows, key=lambda row: row["id"])
+        return result
+
+    def get_project_rollup(self, project_id: int) -> ProjectRollup:
+        """A project's Y-Line totals overall and by status, without reading its lines"""
+        exists = self.db.execute(select(_projects.c.id).where(_projects.c.id == project_id)).first()
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return get_project_rollup(self.db, project_id)
+
+    def reconcile_rollups(self, project_id: Optional[int] = None) -> ReconcileResult:
+        """Recompute Y-Line rollups from source, correcting any drift"""
+        try:
+            return reconcile_rollups(self.db, project_id)
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def search_y_lines(
+        self,
+        project_id: Optional[int] = None,
+        status: Optional[YLineStatus] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        q: Optional[str] = None,
+        after: Optional[int] = None,
+        limit: int = 50,
+        facets: bool = True
+    ) -> YLineSearchResult:
+        """Indexed Y-Line search with keyset paging, total and facet counts"""
+        return search_y_lines(
+            self.db, project_id=project_id, status=status, min_value=min_value, max_value=max_value,
+            q=q, after=after, limit=limit, facets=facets
+        )
+
     def get_filtered_y_lines(
         self,
         project_id: Optional[int] = None,
@@ -1,7 +1,13 @@
+import getpass
 import streamlit as st
+import pandas as pd
 from datetime import datetime
 from typing import Optional
 from app.services.csp_lob_service import CSPLOBService
+from app.services.platform_product_catalog import platform_product_catalog
+from app.services.platform_selection_service import (
+    SELECTION_COLUMNS, PlatformSelectionService, selection_key
+)
 from app.models.csp_lob import LOBType, CSPStatus
 from app.schemas.csp_lob import CSPLOBCreate, CSPLOBUpdate
 
@@ -19,6 +25,19 @@ def render_csp_lob_page(db_session):
             ["View/Edit Mappings", "Create New Mapping", "Bulk Operations"]
         )
         
+        # Platform products are keyed by the ProjectID code (e.g. MN24HMO),
+        # CSP LOB mappings by the numeric projects.id
+        st.subheader("Project")
+        project_code = st.text_input(
+            "Project ID", value=st.session_state.get('selected_project') or "",
+            help="Project code used for platform products"
+        ).strip() or None
+        st.session_state.selected_project = project_code
+        mapping_project_id = st.number_input(
+            "Mapping Project Number", min_value=1, step=1, value=None,
+            help="projects.id the CSP LOB mappings belong to"
+        )
+        
         # Filters
         st.subheader("Filters")
         selected_lob = st.selectbox(
@@ -37,7 +56,7 @@ def render_csp_lob_page(db_session):
     if action == "Create New Mapping":
         render_create_form(csp_service)
     elif action == "View/Edit Mappings":
-        render_mapping_list(csp_service, selected_lob, selected_status)
+        render_mapping_list(csp_service, mapping_project_id, project_code, selected_lob, selected_status)
     else:
         render_bulk_operations(csp_service)
 
@@ -75,15 +94,25 @@ def render_create_form(csp_service):
             except Exception as e:
                 st.error(f"Error creating mapping: {str(e)}")
 
-def render_mapping_list(csp_service, lob_type: Optional[LOBType], status: Optional[CSPStatus]):
+def render_mapping_list(
+    csp_service,
+    project_id: Optional[int],
+    project_code: Optional[str],
+    lob_type: Optional[LOBType],
+    status: Optional[CSPStatus]
+):
     st.subheader("CSP LOB Mappings")
     
     # Get mappings with filters
-    mappings = csp_service.get_project_csp_lobs(
-        project_id=st.session_state.get('current_project_id'),
-        lob_type=lob_type,
-        status=status
-    )
+    try:
+        mappings = csp_service.get_project_csp_lobs(
+            project_id=project_id,
+            lob_type=lob_type,
+            status=status
+        ) if project_id else []
+    except Exception as e:
+        st.error(f"Error loading mappings: {str(e)}")
+        mappings = []
     
     # Display mappings in a dataframe
     if mappings:
@@ -104,8 +133,52 @@ def render_mapping_list(csp_service, lob_type: Optional[LOBType], status: Option
             selected_rows = df.index[df['Selected']].tolist()
             if selected_rows:
                 render_edit_form(csp_service, mappings[selected_rows[0]])
+    elif not project_id:
+        st.info("Enter a mapping project number to list its mappings.")
     else:
         st.info("No mappings found with the selected filters.")
+    
+    with st.expander("Platform Load Products"):
+        render_platform_products(csp_service.db, project_code)
+
+def render_platform_products(db_session, project_id: Optional[str]):
+    # Served from the in-memory catalog; only rows loaded since the last
+    # check are fetched from CS_EXP_PlatformLoadProducts
+    catalog = platform_product_catalog.ensure_fresh(db_session)
+    product_prefix = st.text_input("Product Prefix (NWPR_PFX)", key="platform_product_prefix")
+    network_prefix = project_id[:2] if project_id else None
+    products = catalog.search(network_prefix, product_prefix or None, limit=500)
+    if not products:
+        st.info("No platform products match.")
+        return
+    
+    df = pd.DataFrame(products, columns=products[0]._fields)
+    if not project_id:
+        st.dataframe(df)
+        return
+    
+    stored = PlatformSelectionService.get_selection(db_session, project_id)
+    selected = {selection_key(row) for row in stored}
+    df.insert(0, "Selected", [selection_key(p._asdict()) in selected for p in products])
+    with st.form("platform_product_selection"):
+        edited = st.data_editor(
+            df, disabled=[c for c in df.columns if c != "Selected"], hide_index=True
+        )
+        if st.form_submit_button("Save Selection"):
+            # Products outside the current filter keep their stored selection
+            shown = {selection_key(p._asdict()) for p in products}
+            kept = [
+                {name: getattr(row, name) for name in SELECTION_COLUMNS}
+                for row in stored if selection_key(row) not in shown
+            ]
+            chosen = edited.loc[edited["Selected"], list(SELECTION_COLUMNS)].to_dict("records")
+            changes = PlatformSelectionService.save_selection(
+                db_session, project_id, kept + chosen, user_msid=getpass.getuser()
+            )
+            st.success(
+                f"Selection saved: {len(changes.to_insert)} added, "
+                f"{len(changes.to_delete)} removed"
+            )
 
 def render_bulk_operations(csp_service):
     st.subheader("Bulk Operations")
@@ -123,6 +196,29 @@ def render_bulk_operations(csp_service):
             
     elif operation == "Bulk Import":
         uploaded_file = st.file_uploader("Upload CSV", type=['csv'])
-        if uploaded_file is not None:
-            # Implementation for bulk import
-            pass 
\ No newline at end of file
+        st.caption(
+            "Columns: csp_code, lob_type, project_id, and optionally description, "
+            "status, effective_date, termination_date"
+        )
+        update_existing = st.checkbox("Update existing mappings")
+        if uploaded_file is not None and st.button("Import"):
+            try:
+                with st.spinner("Importing..."):
+                    report = csp_service.bulk_import(uploaded_file, update_existing=update_existing)
+            except ValueError as e:
+                st.error(str(e))
+                return
+
+            st.success(
+                f"Processed {report.total_rows} rows: {report.inserted} inserted, "
+                f"{report.updated} updated, {len(report.errors)} rejected"
+            )
+            if report.errors:
+                errors = report.error_frame()
+                st.dataframe(errors)
+                st.download_button(
+                    "Download error report",
+                    errors.to_csv(index=False),
+                    file_name="csp_lob_import_errors.csv",
+                    mime="text/csv"
+                ) 
\ No newline at end of file
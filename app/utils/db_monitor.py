@@ -1,11 +1,14 @@
 """Database operations monitoring and verification"""
 import logging
-from datetime import datetime
+import time
+from datetime import timedelta
 from functools import wraps
 from typing import Any, Callable
 import pandas as pd
 import streamlit as st
 from sqlalchemy.exc import SQLAlchemyError
+from app.utils.metrics import MetricsRegistry, metrics
+from app.utils.slow_queries import current_operation, slow_query_log
 
 # Set up logging
 logging.basicConfig(
@@ -15,33 +18,45 @@ logging.basicConfig(
 )
 
 class DatabaseMonitor:
-    """Monitor and verify database operations"""
+    """Monitor and verify database operations.
+
+    Every instance records into the process-wide metrics registry, so stats
+    accumulate across calls, threads and Streamlit reruns.
+    """
+    
+    def __init__(self, registry: MetricsRegistry = metrics):
+        self.registry = registry
+    
+    @property
+    def operation_count(self) -> int:
+        return self.registry.totals("operation")[0]
     
-    def __init__(self):
-        self.operation_count = 0
-        self.error_count = 0
-        self.start_time = datetime.now()
+    @property
+    def error_count(self) -> int:
+        return self.registry.totals("operation")[1]
     
-    def log_operation(self, operation_type: str, status: str, details: str = None):
+    def log_operation(self, operation_type: str, status: str, details: str = None,
+                      duration: float = 0.0):
         """Log database operations"""
         logging.info(
             f"Operation: {operation_type} | Status: {status} | Details: {details}"
         )
-        self.operation_count += 1
+        self.registry.observe("operation", operation_type, duration)
     
-    def log_error(self, operation_type: str, error: Exception):
+    def log_error(self, operation_type: str, error: Exception, duration: float = 0.0):
         """Log database errors"""
         logging.error(
             f"Operation: {operation_type} | Error: {str(error)} | Type: {type(error)}"
         )
-        self.error_count += 1
+        self.registry.observe("operation", operation_type, duration, error=True)
     
     def get_stats(self) -> dict:
         """Get database operation statistics"""
+        operations, errors = self.registry.totals("operation")
         return {
-            'operations': self.operation_count,
-            'errors': self.error_count,
-            'uptime': datetime.now() - self.start_time
+            'operations': operations,
+            'errors': errors,
+            'uptime': timedelta(seconds=time.time() - self.registry.start_time)
         }
 
 def monitor_db_operation(operation_type: str) -> Callable:
@@ -50,13 +65,19 @@ def monitor_db_operation(operation_type: str) -> Callable:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             monitor = DatabaseMonitor()
+            token = current_operation.set(operation_type)
+            start = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
-                monitor.log_operation(operation_type, 'SUCCESS')
+                monitor.log_operation(
+                    operation_type, 'SUCCESS', duration=time.perf_counter() - start
+                )
                 return result
             except Exception as e:
-                monitor.log_error(operation_type, e)
+                monitor.log_error(operation_type, e, duration=time.perf_counter() - start)
                 raise
+            finally:
+                current_operation.reset(token)
         return wrapper
     return decorator
 
@@ -117,7 +138,22 @@ def display_db_monitor():
         st.metric("Errors", stats['errors'])
     
     with col3:
-        st.metric("Uptime", f"{stats['uptime'].seconds // 3600}h {(stats['uptime'].seconds // 60) % 60}m")
+        uptime = int(stats['uptime'].total_seconds())
+        st.metric("Uptime", f"{uptime // 3600}h {(uptime // 60) % 60}m")
+    
+    latency = pd.DataFrame(metrics.snapshot())
+    if latency.empty:
+        st.info("No database activity recorded yet")
+    else:
+        st.markdown("**Latency by operation and query (ms)**")
+        kinds = st.multiselect(
+            "Show", ["operation", "query"], default=["operation", "query"],
+            key="db_monitor_kinds"
+        )
+        st.dataframe(latency[latency['kind'].isin(kinds)].round(2))
+    
+    if st.checkbox("Show Slow Queries"):
+        display_slow_queries()
     
     if st.checkbox("Show Table Integrity Check"):
         integrity_df = verify_table_integrity()
@@ -129,4 +165,23 @@ def display_db_monitor():
             if errors:
                 st.error("\n".join(errors[-5:]))  # Show last 5 errors
             else:
-                st.success("No recent errors found") 
\ No newline at end of file
+                st.success("No recent errors found")
+
+def display_slow_queries():
+    """Table of recent slow statements with their captured plans"""
+    events = slow_query_log.recent()
+    st.caption(f"Statements at or over {slow_query_log.threshold_ms} ms (newest first)")
+    if not events:
+        st.success("No slow queries recorded")
+        return
+    
+    st.dataframe(pd.DataFrame([event.to_dict() for event in events]))
+    
+    with_plan = [event for event in events if event.plan]
+    if with_plan:
+        chosen = st.selectbox(
+            "View plan",
+            with_plan,
+            format_func=lambda e: f"#{e.id} {e.duration_ms:.0f} ms - {e.caller or e.fingerprint[:60]}"
+        )
+        st.code(chosen.plan, language="xml")
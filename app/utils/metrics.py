@@ -0,0 +1,206 @@
+"""Process-wide operation and query metrics.
+
+Counts, errors and latency histograms are kept per (kind, name) series:
+kind is "operation" for @monitor_db_operation calls and "query" for SQL
+statements, which are grouped by fingerprint (literals replaced with ?).
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.utils.slow_queries import slow_query_log
+
+# Histogram bucket upper bounds in seconds (Prometheus defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Recent samples kept per series for percentile estimates
+SAMPLE_WINDOW = 1024
+# Distinct query fingerprints tracked before new ones are folded together
+MAX_QUERY_SERIES = 500
+OTHER_QUERIES = "(other)"
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|%s|:\w+|@P\d+")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalise SQL so statements differing only in literals share a series"""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _BIND_PARAM.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PARAM_LIST.sub("(?, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class _Series:
+    __slots__ = ("count", "errors", "total", "buckets", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, seconds: float, error: bool):
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.samples.append(seconds)
+
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-series counters and latency histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._query_series = 0
+        self.start_time = time.time()
+
+    def observe(self, kind: str, name: str, seconds: float, error: bool = False):
+        key = (kind, name)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if kind == "query":
+                    if self._query_series >= MAX_QUERY_SERIES:
+                        key = (kind, OTHER_QUERIES)
+                    else:
+                        self._query_series += 1
+                series = self._series.setdefault(key, _Series())
+            series.observe(seconds, error)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._query_series = 0
+            self.start_time = time.time()
+
+    def totals(self, kind: str) -> Tuple[int, int]:
+        """(calls, errors) summed over every series of ``kind``"""
+        with self._lock:
+            series = [s for (k, _), s in self._series.items() if k == kind]
+            return sum(s.count for s in series), sum(s.errors for s in series)
+
+    def snapshot(self, kind: Optional[str] = None) -> List[dict]:
+        """One row per series, slowest p95 first; latencies in milliseconds"""
+        with self._lock:
+            items = [
+                (k, n, s.count, s.errors, s.total, sorted(s.samples))
+                for (k, n), s in self._series.items()
+                if kind is None or k == kind
+            ]
+        rows = []
+        for k, name, count, errors, total, ordered in items:
+            rows.append({
+                "kind": k,
+                "name": name,
+                "count": count,
+                "errors": errors,
+                "mean_ms": total / count * 1000 if count else None,
+                "p50_ms": _ms(_percentile(ordered, 0.50)),
+                "p95_ms": _ms(_percentile(ordered, 0.95)),
+                "p99_ms": _ms(_percentile(ordered, 0.99)),
+            })
+        rows.sort(key=lambda row: row["p95_ms"] or 0, reverse=True)
+        return rows
+
+    def render_prometheus(self) -> str:
+        """Text exposition format (version 0.0.4)"""
+        with self._lock:
+            items = sorted(
+                ((k, n, s.count, s.errors, s.total, list(s.buckets))
+                 for (k, n), s in self._series.items()),
+                key=lambda item: item[:2]
+            )
+        lines = [
+            "# HELP axis_db_calls_total Calls per operation or query fingerprint.",
+            "# TYPE axis_db_calls_total counter",
+        ]
+        lines += [f'axis_db_calls_total{_labels(k, n)} {c}' for k, n, c, _, _, _ in items]
+        lines += [
+            "# HELP axis_db_errors_total Failed calls per operation or query fingerprint.",
+            "# TYPE axis_db_errors_total counter",
+        ]
+        lines += [f'axis_db_errors_total{_labels(k, n)} {e}' for k, n, _, e, _, _ in items]
+        lines += [
+            "# HELP axis_db_latency_seconds Call latency.",
+            "# TYPE axis_db_latency_seconds histogram",
+        ]
+        for k, n, count, _, total, buckets in items:
+            cumulative = 0
+            for bound, hits in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+                cumulative += hits
+                lines.append(
+                    f'axis_db_latency_seconds_bucket{_labels(k, n, le=bound)} {cumulative}'
+                )
+            lines.append(f'axis_db_latency_seconds_sum{_labels(k, n)} {total}')
+            lines.append(f'axis_db_latency_seconds_count{_labels(k, n)} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1000
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(kind: str, name: str, **extra) -> str:
+    pairs = [("kind", kind), ("name", name)] + [(k, str(v)) for k, v in extra.items()]
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+metrics = MetricsRegistry()
+
+_START_KEY = "metrics_query_start"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if starts:
+        elapsed = time.perf_counter() - starts.pop()
+        key = fingerprint(statement)
+        metrics.observe("query", key, elapsed)
+        slow_query_log.maybe_record(
+            conn, cursor, statement, parameters, executemany, elapsed, key
+        )
+
+
+def _handle_error(context):
+    conn = context.connection
+    starts = conn.info.get(_START_KEY) if conn is not None else None
+    if starts and context.statement:
+        elapsed = time.perf_counter() - starts.pop()
+        metrics.observe("query", fingerprint(context.statement), elapsed, error=True)
+
+
+def instrument_engine(engine) -> None:
+    """Record every statement run through ``engine`` (safe to call repeatedly)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,224 @@
+"""Process-wide cache for read query results"""
+import copy
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+import pandas as pd
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    __slots__ = ('value', 'size', 'expires_at', 'tags')
+
+    def __init__(self, value: Any, size: int, expires_at: float, tags: Tuple[str, ...]):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.tags = tags
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    return sys.getsizeof(value)
+
+
+def _copy_value(value: Any) -> Any:
+    # Callers routinely mutate returned frames (date formatting etc.),
+    # so never hand out the cached object itself
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class QueryCache:
+    """Thread-safe TTL cache with LRU eviction under a memory budget.
+
+    Entries are keyed on SQL text plus parameters and tagged with the tables
+    they read, so writers can invalidate every cached read of a table after
+    commit. The cache lives at module level and is shared by all Streamlit
+    sessions and API requests in the process.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        default_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._tag_keys: Dict[str, set] = {}
+        self._tag_generations: Dict[str, int] = {}
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(sql: str, params: Optional[Sequence[Any]] = None) -> Hashable:
+        """Build a cache key from SQL text (whitespace-normalised) and parameters"""
+        normalized = " ".join(sql.split())
+        if params is None:
+            return (normalized, ())
+        if isinstance(params, dict):
+            return (normalized, tuple(sorted(params.items())))
+        return (normalized, tuple(params))
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a key, dropping it if expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        generations: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """Store a value; skipped if too large or a tag was invalidated meanwhile"""
+        tags = tuple(tags)
+        size = estimate_size(value)
+        with self._lock:
+            if generations is not None and any(
+                self._tag_generations.get(tag, 0) != generations.get(tag, 0) for tag in tags
+            ):
+                # A writer invalidated one of our tables while we were loading
+                return False
+            if size > self.max_bytes:
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+            expires_at = self._clock() + (self.default_ttl if ttl is None else ttl)
+            self._entries[key] = _CacheEntry(value, size, expires_at, tags)
+            self._size += size
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+
+            while self._size > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            return True
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Return a copy of the cached value, loading it at most once per key concurrently"""
+        tags = tuple(tags)
+        found, value = self.get(key)
+        if found:
+            with self._lock:
+                self.hits += 1
+            return _copy_value(value)
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another session may have loaded it while we waited
+            found, value = self.get(key)
+            with self._lock:
+                if found:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                generations = {tag: self._tag_generations.get(tag, 0) for tag in tags}
+            if not found:
+                value = loader()
+                self.set(key, value, ttl=ttl, tags=tags, generations=generations)
+
+        with self._lock:
+            if self._load_locks.get(key) is load_lock and not load_lock.locked():
+                del self._load_locks[key]
+        return _copy_value(value)
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry tagged with any of the given tables"""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._tag_generations[tag] = self._tag_generations.get(tag, 0) + 1
+                for key in list(self._tag_keys.get(tag, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+        if removed:
+            logger.debug(f"Invalidated {removed} cached queries for {', '.join(tags)}")
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_keys.clear()
+            self._size = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        for tag in entry.tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+
+query_cache = QueryCache(
+    max_bytes=settings.QUERY_CACHE_MAX_MB * 1024 * 1024,
+    default_ttl=settings.QUERY_CACHE_DEFAULT_TTL
+)
+
+
+def cached_read_sql(
+    query: str,
+    bind,
+    params: Optional[Sequence[Any]] = None,
+    ttl: Optional[float] = None,
+    tags: Iterable[str] = ()
+) -> pd.DataFrame:
+    """pd.read_sql backed by the shared query cache"""
+    key = QueryCache.make_key(query, params)
+    return query_cache.get_or_load(
+        key,
+        lambda: pd.read_sql(query, bind, params=params),
+        ttl=ttl,
+        tags=tags
+    )
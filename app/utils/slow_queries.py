@@ -0,0 +1,231 @@
+"""Slow query capture.
+
+Statements that run at or over SLOW_QUERY_THRESHOLD_MS are recorded in a
+ring buffer with redacted parameters, row count and the application code
+that issued them. On SQL Server the estimated plan is fetched afterwards
+with SET SHOWPLAN_XML on a separate pooled connection, in a background
+thread, so the slow request is not delayed further.
+"""
+import itertools
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Set by @monitor_db_operation so events show which UI operation ran the query
+current_operation: ContextVar[Optional[str]] = ContextVar("current_operation", default=None)
+
+# Plans are reused for this long before the same fingerprint is re-explained
+PLAN_CACHE_TTL = 600
+PLAN_CACHE_SIZE = 256
+
+# Frames from these modules are infrastructure, not the caller we want to report
+_INFRA_MODULES = ("app.db", "app.utils.metrics", "app.utils.slow_queries", "app.utils.query_cache")
+
+
+@dataclass
+class SlowQueryEvent:
+    id: int
+    timestamp: datetime
+    duration_ms: float
+    statement: str
+    fingerprint: str
+    parameters: Any
+    batch_size: int
+    rowcount: Optional[int]
+    caller: Optional[str]
+    operation: Optional[str]
+    plan_status: str
+    plan: Optional[str] = field(default=None, repr=False)
+
+    def to_dict(self, include_plan: bool = False) -> dict:
+        data = {
+            "id": self.id,
+            "timestamp": self.timestamp.isoformat(),
+            "duration_ms": round(self.duration_ms, 1),
+            "statement": self.statement,
+            "fingerprint": self.fingerprint,
+            "parameters": self.parameters,
+            "batch_size": self.batch_size,
+            "rowcount": self.rowcount,
+            "caller": self.caller,
+            "operation": self.operation,
+            "plan_status": self.plan_status,
+        }
+        if include_plan:
+            data["plan"] = self.plan
+        return data
+
+
+def redact(parameters: Any) -> Any:
+    """Keep parameter shape and non-text values; replace text with its length"""
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _redact_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (bytes, bytearray)):
+        return f"<bytes:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def find_caller() -> Optional[str]:
+    """Innermost application frame outside the database plumbing"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if (module.startswith("app.") or module == "__main__") and \
+                not module.startswith(_INFRA_MODULES):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def fetch_showplan(engine, statement: str, parameters: Any) -> Optional[str]:
+    """Estimated plan XML for ``statement``; the statement itself is not executed"""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("SET SHOWPLAN_XML ON")
+        try:
+            cursor.execute(statement, parameters or ())
+            row = cursor.fetchone()
+        finally:
+            cursor.execute("SET SHOWPLAN_XML OFF")
+        return row[0] if row else None
+    except Exception:
+        # Never hand a connection that may still be in SHOWPLAN mode back to the pool
+        raw.invalidate()
+        raise
+    finally:
+        raw.close()
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of the most recent slow statements"""
+
+    def __init__(self, size: int = settings.SLOW_QUERY_LOG_SIZE,
+                 threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS,
+                 capture_plan: bool = settings.SLOW_QUERY_CAPTURE_PLAN):
+        self.threshold_ms = threshold_ms
+        self.capture_plan = capture_plan
+        self._events = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._plans = OrderedDict()
+        self._pending = set()
+        self._executor = None
+
+    def maybe_record(self, conn, cursor, statement: str, parameters: Any,
+                     executemany: bool, seconds: float, fingerprint: str) -> Optional[SlowQueryEvent]:
+        """Record the statement if it crossed the threshold"""
+        duration_ms = seconds * 1000
+        if duration_ms < self.threshold_ms:
+            return None
+
+        first = parameters[0] if executemany and parameters else parameters
+        rowcount = getattr(cursor, "rowcount", -1)
+        event = SlowQueryEvent(
+            id=next(self._ids),
+            timestamp=datetime.now(),
+            duration_ms=duration_ms,
+            statement=statement,
+            fingerprint=fingerprint,
+            parameters=redact(first),
+            batch_size=len(parameters) if executemany and parameters else 1,
+            rowcount=rowcount if isinstance(rowcount, int) and rowcount >= 0 else None,
+            caller=find_caller(),
+            operation=current_operation.get(),
+            plan_status="skipped",
+        )
+        logger.warning(
+            f"Slow query ({duration_ms:.0f} ms) from {event.caller or 'unknown'}: {fingerprint}"
+        )
+
+        if self.capture_plan and not executemany and conn.dialect.name == "mssql":
+            cached = self._cached_plan(fingerprint)
+            if cached is not None:
+                event.plan, event.plan_status = cached, "captured"
+            else:
+                event.plan_status = "pending"
+                self._submit_plan(event, conn.engine, statement, first)
+
+        with self._lock:
+            self._events.append(event)
+        return event
+
+    def recent(self, limit: Optional[int] = None) -> List[SlowQueryEvent]:
+        """Newest first"""
+        with self._lock:
+            events = list(reversed(self._events))
+        return events[:limit] if limit else events
+
+    def get(self, event_id: int) -> Optional[SlowQueryEvent]:
+        with self._lock:
+            return next((e for e in self._events if e.id == event_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._plans.clear()
+
+    def _cached_plan(self, fingerprint: str) -> Optional[str]:
+        with self._lock:
+            entry = self._plans.get(fingerprint)
+            if entry is None or time.monotonic() - entry[0] > PLAN_CACHE_TTL:
+                return None
+            self._plans.move_to_end(fingerprint)
+            return entry[1]
+
+    def _submit_plan(self, event: SlowQueryEvent, engine, statement: str, parameters: Any):
+        with self._lock:
+            if event.fingerprint in self._pending:
+                # Already being explained; the plan cache serves later events
+                event.plan_status = "skipped"
+                return
+            self._pending.add(event.fingerprint)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="showplan")
+        self._executor.submit(self._capture_plan, event, engine, statement, parameters)
+
+    def _capture_plan(self, event: SlowQueryEvent, engine, statement: str, parameters: Any):
+        plan, status = None, "error"
+        try:
+            plan = fetch_showplan(engine, statement, parameters)
+            status = "captured" if plan else "unavailable"
+        except Exception as e:
+            logger.warning(f"Could not capture plan for slow query {event.id}: {str(e)}")
+        with self._lock:
+            self._pending.discard(event.fingerprint)
+            if plan:
+                self._plans[event.fingerprint] = (time.monotonic(), plan)
+                while len(self._plans) > PLAN_CACHE_SIZE:
+                    self._plans.popitem(last=False)
+        event.plan, event.plan_status = plan, status
+
+
+slow_query_log = SlowQueryLog()
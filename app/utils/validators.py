@@ -3,6 +3,7 @@ from app.models.yline import YLineItem
 from typing import Optional
 from app.models import YLine
 from datetime import datetime
+import pandas as pd
 from fastapi import HTTPException
 from app.models.csp_lob import CSPLOB, LOBType, CSPStatus
 
@@ -34,7 +35,21 @@ def validate_y_line_values(estimated_value: Optional[float], actual_value: Optio
         return False
     return True 
 
+def invalid_ipa_number_mask(ipa_numbers: pd.Series) -> pd.Series:
+    """Vectorized validate_ipa_number; True where the IPA number is rejected"""
+    return ipa_numbers.fillna("").astype(str).str.strip() == ""
+
+def invalid_y_line_values_mask(estimated: pd.Series, actual: pd.Series) -> pd.Series:
+    """Vectorized validate_y_line_values over numeric columns (NaN = not given)"""
+    return (estimated < 0) | (actual < 0)
+
 class CSPLOBValidator:
+    # Transitions rejected by validate_status_transition
+    INVALID_TRANSITIONS = {
+        (CSPStatus.INACTIVE, CSPStatus.PENDING),
+        (CSPStatus.ACTIVE, CSPStatus.PENDING),
+    }
+
     @staticmethod
     def validate_dates(
         effective_date: datetime,
@@ -60,16 +75,68 @@ class CSPLOBValidator:
         new_status: CSPStatus
     ) -> bool:
         """Validate status transitions"""
-        invalid_transitions = {
-            CSPStatus.INACTIVE: [CSPStatus.PENDING],
-            CSPStatus.ACTIVE: [CSPStatus.PENDING]
-        }
-        
-        if current_status in invalid_transitions and \
-           new_status in invalid_transitions[current_status]:
+        if (current_status, new_status) in CSPLOBValidator.INVALID_TRANSITIONS:
             raise ValueError(f"Invalid status transition from {current_status} to {new_status}")
         return True
 
+    @staticmethod
+    def invalid_transition_mask(current: pd.Series, new: pd.Series) -> pd.Series:
+        """Vectorized validate_status_transition; True where the move is not allowed"""
+        pairs = pd.Series(list(zip(current, new)), index=current.index)
+        return pairs.isin(CSPLOBValidator.INVALID_TRANSITIONS)
+
+    @staticmethod
+    def validate_frame(frame: pd.DataFrame) -> pd.DataFrame:
+        """Validate and normalise an import frame in whole-column operations.
+
+        Expects string columns csp_code, lob_type and project_id, plus optional
+        description, status, effective_date and termination_date. Returns a
+        copy with lob_type/status as enums, parsed dates and an ``error``
+        column holding "; "-joined messages ("" for valid rows).
+        """
+        out = frame.copy()
+        errors = pd.Series("", index=out.index)
+
+        def flag(mask, message):
+            nonlocal errors
+            errors = errors.mask(mask, errors + "; " + message)
+
+        for column in ("description", "status", "effective_date", "termination_date"):
+            if column not in out:
+                out[column] = ""
+        text = out.fillna("").astype(str).apply(lambda col: col.str.strip())
+
+        code = text["csp_code"]
+        flag(code.str.len() < 3, "CSP code must be at least 3 characters")
+        flag((code != "") & ~code.str.isalnum(), "CSP code must be alphanumeric")
+        out["csp_code"] = code
+
+        lob_types = {t.value: t for t in LOBType}
+        out["lob_type"] = text["lob_type"].str.lower().map(lob_types)
+        flag(out["lob_type"].isna(), "Unknown LOB type")
+
+        statuses = {s.value: s for s in CSPStatus}
+        status = text["status"].str.lower().replace("", CSPStatus.ACTIVE.value)
+        out["status"] = status.map(statuses)
+        flag(out["status"].isna(), "Unknown status")
+
+        project_id = pd.to_numeric(text["project_id"], errors="coerce")
+        flag(project_id.isna() | (project_id % 1 != 0), "Project ID must be an integer")
+        out["project_id"] = project_id
+
+        for column in ("effective_date", "termination_date"):
+            parsed = pd.to_datetime(text[column], errors="coerce")
+            flag(parsed.isna() & (text[column] != ""), f"Invalid {column.replace('_', ' ')}")
+            out[column] = parsed
+        flag(
+            out["termination_date"].notna() & (out["effective_date"] > out["termination_date"]),
+            "Effective date must be before termination date"
+        )
+
+        out["description"] = text["description"].where(text["description"] != "", None)
+        out["error"] = errors.str.lstrip("; ")
+        return out
+
     @staticmethod
     def validate_lob_compatibility(
         project_id: int,
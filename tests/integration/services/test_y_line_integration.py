@@ -56,11 +56,13 @@ class TestYLineIntegration:
 
         # Test bulk status update
         y_line_ids = [y.id for y in created_y_lines]
-        updated_y_lines = self.service.bulk_update_status(
+        result = self.service.bulk_update_status(
             y_line_ids, 
-            YLineStatus.ACTIVE
+            YLineStatus.ACTIVE,
+            return_rows=True
         )
-        assert all(y.status == YLineStatus.ACTIVE for y in updated_y_lines)
+        assert result.updated == 3 and result.missing_ids == []
+        assert all(y["status"] == YLineStatus.ACTIVE for y in result.y_lines)
 
     def test_y_line_filtering(self):
         """Test advanced filtering capabilities"""
@@ -0,0 +1,30 @@
+"""Wall-clock budgets for the in-memory project typeahead index"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.project_search import ProjectEntry, ProjectSearchIndex
+
+pytestmark = pytest.mark.performance
+
+def test_search_answers_within_typeahead_budget():
+    """Test searches over 5,000 projects stay under 20 ms"""
+    # Arrange
+    words = "network adequacy review rural county provider directory dental vision refresh".split()
+    index = ProjectSearchIndex()
+    index.add_many([
+        ProjectEntry(i, f"P{i:06d}", f"BM{i % 997:05d}", " ".join(words[(i + k) % 10] for k in range(4)),
+                     "Olson", "Garcia", "Active", datetime(2024, 1, 1) + timedelta(minutes=i))
+        for i in range(5000)
+    ])
+
+    # Act
+    slowest = 0.0
+    for query in ("p", "P0042", "net adeq", "olson rural", "BM00012"):
+        start = time.perf_counter()
+        assert index.search(query)
+        slowest = max(slowest, time.perf_counter() - start)
+
+    # Assert
+    assert slowest < 0.02
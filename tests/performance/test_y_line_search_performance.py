@@ -0,0 +1,29 @@
+"""Wall-clock budgets for the indexed Y-Line search"""
+import time
+
+import pytest
+
+from app.models.y_line import YLineStatus
+from app.services.y_line_search import search_y_lines
+from tests.test_y_line_search import _session_factory
+
+pytestmark = pytest.mark.performance
+
+def test_search_stays_fast_on_300k_rows():
+    """Test filtered searches with facets answer within a second at 300k Y-Lines"""
+    # Arrange
+    engine, factory = _session_factory(300_000)
+    db = factory()
+
+    # Act
+    slowest = 0.0
+    for filters in ({"q": "IPA0421"}, {"project_id": 2, "status": YLineStatus.ACTIVE}, {"q": "dent", "limit": 100}):
+        start = time.perf_counter()
+        result = search_y_lines(db, **filters)
+        slowest = max(slowest, time.perf_counter() - start)
+        assert result.y_lines
+
+    # Assert
+    db.close()
+    engine.dispose()
+    assert slowest < 1.0
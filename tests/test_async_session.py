@@ -0,0 +1,53 @@
+"""Test the async database path"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.config import Settings
+from app.db import async_session, session
+from app.models.notes import ProjectNote
+
+pytest.importorskip("aiosqlite")
+
+def test_async_url_uses_async_driver(monkeypatch):
+    """Test mapping sync URLs to their async drivers"""
+    settings = Settings()
+    monkeypatch.setattr(settings, "DB_ASYNC_URL", "")
+    monkeypatch.setattr(settings, "DB_URL", "sqlite:///./local.db")
+    assert settings.ASYNC_DATABASE_URL == "sqlite+aiosqlite:///./local.db"
+
+    monkeypatch.setattr(settings, "DB_URL", "")
+    assert settings.ASYNC_DATABASE_URL.startswith("mssql+aioodbc:///?odbc_connect=")
+
+    monkeypatch.setattr(settings, "DB_ASYNC_URL", "sqlite+aiosqlite://")
+    assert settings.ASYNC_DATABASE_URL == "sqlite+aiosqlite://"
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Async notes router backed by a throwaway SQLite database"""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    monkeypatch.setattr(Settings, "DATABASE_URL", property(lambda self: url))
+    monkeypatch.setattr(async_session, "_async_engine", None)
+    session.dispose_engine()
+    ProjectNote.__table__.create(session.get_engine())
+
+    from app.api.endpoints import notes_async
+    app = FastAPI()
+    app.include_router(notes_async.router)
+    with TestClient(app) as test_client:
+        yield test_client
+    session.dispose_engine()
+
+def test_async_notes_round_trip(client):
+    """Test create, read, update and delete through the async router"""
+    response = client.post("/notes/", json={"ProjectID": "P1", "Notes": "first"})
+    assert response.status_code == 200
+
+    notes = client.get("/notes/P1").json()
+    assert [note["Notes"] for note in notes] == ["first"]
+
+    response = client.put("/notes/1", json={"Notes": "edited"})
+    assert response.json()["Notes"] == "edited"
+
+    assert client.delete("/notes/1").status_code == 200
+    assert client.get("/notes/P1").json() == []
+    assert client.delete("/notes/1").status_code == 404
@@ -0,0 +1,78 @@
+"""Test the CRUDBase bulk operations"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.crud.competitor import competitor as competitor_crud
+from app.models.competitor import Competitor
+
+@pytest.fixture
+def db():
+    """Throwaway in-memory SQLite session"""
+    engine = create_engine("sqlite://")
+    Competitor.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+def test_bulk_create_returns_ids_in_input_order(db):
+    """Test inserted keys come back in the order rows were given"""
+    # Arrange
+    rows = [{"ProjectID": "P1", "Payor": f"Payor {i}"} for i in range(5)]
+
+    # Act
+    result = competitor_crud.bulk_create(db, objs_in=rows, chunk_size=2, return_ids=True)
+
+    # Assert
+    assert result.ok
+    assert result.affected == 5
+    payors = {c.RecordID: c.Payor for c in db.query(Competitor)}
+    assert [payors[record_id] for record_id in result.ids] == [r["Payor"] for r in rows]
+    assert all(c.EI is False for c in db.query(Competitor))
+
+def test_bulk_create_isolates_failing_chunk(db):
+    """Test a bad chunk is rolled back while the others commit"""
+    # Arrange: the second chunk repeats a primary key
+    rows = [
+        {"RecordID": 1, "ProjectID": "P1"},
+        {"RecordID": 2, "ProjectID": "P1"},
+        {"RecordID": 3, "ProjectID": "P1"},
+        {"RecordID": 3, "ProjectID": "P1"},
+        {"RecordID": 5, "ProjectID": "P1"},
+    ]
+
+    # Act
+    result = competitor_crud.bulk_create(db, objs_in=rows, chunk_size=2)
+
+    # Assert
+    assert not result.ok
+    assert [(f.offset, f.size) for f in result.failures] == [(2, 2)]
+    assert result.affected == 3
+    assert sorted(c.RecordID for c in db.query(Competitor)) == [1, 2, 5]
+
+def test_bulk_update_and_delete(db):
+    """Test updating and deleting rows by primary key; missing keys are not counted"""
+    # Arrange
+    ids = competitor_crud.bulk_create(
+        db, objs_in=[{"ProjectID": "P1", "Payor": "Old"} for _ in range(4)], return_ids=True
+    ).ids
+
+    # Act
+    updated = competitor_crud.bulk_update(
+        db, objs_in=[
+            {"RecordID": ids[0], "Payor": "New"},
+            {"RecordID": ids[1], "MR": True},
+            {"RecordID": 999, "Payor": "Gone"},
+        ]
+    )
+    deleted = competitor_crud.bulk_delete(db, ids=ids[2:] + [999], chunk_size=1)
+
+    # Assert
+    assert (updated.affected, updated.ids) == (2, ids[:2])
+    assert deleted.affected == 2
+    db.expire_all()
+    rows = {c.RecordID: c for c in db.query(Competitor)}
+    assert set(rows) == set(ids[:2])
+    assert rows[ids[0]].Payor == "New"
+    assert rows[ids[1]].Payor == "Old" and rows[ids[1]].MR is True
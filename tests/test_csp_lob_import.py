@@ -0,0 +1,160 @@
+"""Test CSP LOB bulk import"""
+import io
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.csp_lob import CSPLOB, CSPStatus, LOBType
+from app.services.csp_lob_service import CSPLOBService
+from app.utils.validators import CSPLOBValidator
+
+CSV_HEADER = "csp_code,lob_type,project_id,status,effective_date,termination_date\n"
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    # csp_lob references projects.id; a stand-in table satisfies the foreign key
+    metadata = MetaData()
+    Table("projects", metadata, Column("id", Integer, primary_key=True))
+    CSPLOB.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables["projects"].insert(), [{"id": 1}, {"id": 2}])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+def _store(db, **values):
+    values = {"project_id": 1, "status": CSPStatus.ACTIVE, "description": "stored", **values}
+    db.execute(CSPLOB.__table__.insert().values(**values))
+    db.commit()
+
+def _stored(db):
+    """csp_code -> (project_id, status, description, termination_date)"""
+    t = CSPLOB.__table__
+    rows = db.execute(select(t.c.csp_code, t.c.project_id, t.c.status, t.c.description, t.c.termination_date))
+    return {code: tuple(rest) for code, *rest in rows}
+
+def test_validate_frame_flags_each_rule():
+    """Test the column-wise checks report every failing rule per row"""
+    # Arrange
+    frame = pd.DataFrame({
+        "csp_code": ["ABC1", "a!", "XYZ"],
+        "lob_type": ["Medical", "unknown", "dental"],
+        "project_id": ["1", "x", "2"],
+        "effective_date": ["2024-01-01", "", "2024-05-01"],
+        "termination_date": ["2024-12-31", "", "2024-01-01"],
+    })
+
+    # Act
+    result = CSPLOBValidator.validate_frame(frame)
+
+    # Assert
+    assert result.loc[0, "error"] == ""
+    assert result.loc[0, "lob_type"] is LOBType.MEDICAL
+    assert result.loc[0, "status"] is CSPStatus.ACTIVE
+    assert result.loc[1, "error"].split("; ") == [
+        "CSP code must be at least 3 characters",
+        "CSP code must be alphanumeric",
+        "Unknown LOB type",
+        "Project ID must be an integer",
+    ]
+    assert result.loc[2, "error"] == "Effective date must be before termination date"
+
+def test_invalid_transition_mask_matches_scalar_rule():
+    """Test the vectorized transition check agrees with validate_status_transition"""
+    statuses = list(CSPStatus)
+    pairs = [(a, b) for a in statuses for b in statuses]
+    current = pd.Series([a for a, _ in pairs])
+    new = pd.Series([b for _, b in pairs])
+
+    mask = CSPLOBValidator.invalid_transition_mask(current, new)
+
+    for (a, b), blocked in zip(pairs, mask):
+        if blocked:
+            with pytest.raises(ValueError):
+                CSPLOBValidator.validate_status_transition(a, b)
+        else:
+            assert CSPLOBValidator.validate_status_transition(a, b)
+
+def test_bulk_import_reports_rejected_rows(db):
+    """Test duplicates, unknown projects and bad rows are rejected by row number"""
+    # Arrange
+    _store(db, csp_code="OLD1", lob_type=LOBType.MEDICAL)
+    upload = io.StringIO(
+        CSV_HEADER
+        + "OLD1,medical,1,,,\n"
+        + "NEW1,dental,1,,2024-01-01,\n"
+        + "NEW1,dental,1,,2024-01-01,\n"
+        + "bad!,vision,2,,,\n"
+        + "NEW2,vision,2,active,,\n"
+        + "NEW3,vision,9,,,\n"
+    )
+
+    # Act
+    report = CSPLOBService(db).bulk_import(upload, chunk_size=2)
+
+    # Assert
+    assert (report.total_rows, report.inserted, report.updated) == (6, 2, 0)
+    assert [(e.row, e.message) for e in report.errors] == [
+        (2, "CSP LOB mapping already exists"),
+        (4, "Duplicate CSP code and LOB type in file"),
+        (5, "CSP code must be alphanumeric"),
+        (7, "Project not found"),
+    ]
+    assert _stored(db) == {
+        "OLD1": (1, CSPStatus.ACTIVE, "stored", None),
+        "NEW1": (1, CSPStatus.ACTIVE, None, None),
+        "NEW2": (2, CSPStatus.ACTIVE, None, None),
+    }
+
+def test_bulk_import_updates_only_supplied_columns(db):
+    """Test update_existing keeps blank cells and enforces status transitions"""
+    # Arrange
+    _store(db, csp_code="OLD1", lob_type=LOBType.MEDICAL, status=CSPStatus.INACTIVE)
+    _store(db, csp_code="OLD2", lob_type=LOBType.DENTAL)
+    _store(db, csp_code="OLD3", lob_type=LOBType.VISION, effective_date=datetime(2024, 6, 1))
+    upload = io.StringIO(
+        CSV_HEADER
+        + "OLD1,medical,2,,,2025-01-31\n"
+        + "OLD2,dental,1,pending,,\n"
+        + "OLD3,vision,1,,,2024-01-01\n"
+    )
+
+    # Act
+    report = CSPLOBService(db).bulk_import(upload, update_existing=True)
+
+    # Assert
+    assert (report.inserted, report.updated) == (0, 1)
+    assert [(e.row, e.message) for e in report.errors] == [
+        (3, "Invalid status transition"),
+        (4, "Effective date must be before termination date"),
+    ]
+    stored = _stored(db)
+    assert stored["OLD1"] == (2, CSPStatus.INACTIVE, "stored", datetime(2025, 1, 31))
+    assert stored["OLD2"] == (1, CSPStatus.ACTIVE, "stored", None)
+
+def test_bulk_import_reports_database_errors_per_row(db, monkeypatch):
+    """Test a chunk that fails as a whole is retried so only the failing row is rejected"""
+    # Arrange: the lookup misses a row stored by a concurrent writer
+    service = CSPLOBService(db)
+    _store(db, csp_code="RACE", lob_type=LOBType.MEDICAL)
+    monkeypatch.setattr(service, "_existing_mappings", lambda codes: {})
+    upload = io.StringIO(CSV_HEADER + "NEW1,medical,1,,,\n" + "RACE,medical,1,,,\n")
+
+    # Act
+    report = service.bulk_import(upload)
+
+    # Assert
+    assert report.inserted == 1
+    assert [(e.row, e.message) for e in report.errors] == [(3, "Database error: IntegrityError")]
+    assert set(_stored(db)) == {"NEW1", "RACE"}
+
+def test_bulk_import_requires_key_columns(db):
+    """Test a file without the key columns is rejected outright"""
+    with pytest.raises(ValueError, match="project_id"):
+        CSPLOBService(db).bulk_import(io.StringIO("csp_code,lob_type\nABC,medical\n"))
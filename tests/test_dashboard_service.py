@@ -0,0 +1,34 @@
+"""Test dashboard metrics aggregation"""
+from unittest.mock import MagicMock
+from app.services.dashboard_service import DashboardService, DashboardMetrics
+
+def test_metrics_from_single_query():
+    """Test that all metrics come from one grouped query"""
+    # Arrange
+    mock_db = MagicMock()
+    mock_db.execute.return_value.fetchall.return_value = [
+        ("Completed", 7, 3),
+        ("Active", 4, 0),
+        ("Review", 2, 0),
+        ("On Hold", 1, 0),
+        ("New", 5, 0),
+    ]
+
+    # Act
+    metrics = DashboardService.get_metrics(mock_db)
+
+    # Assert
+    assert mock_db.execute.call_count == 1
+    assert metrics.active == 9
+    assert metrics.pending == 2
+    assert metrics.completed_this_month == 3
+    assert metrics.total == 19
+    assert [item.status for item in metrics.status_distribution] == [
+        "New", "Active", "Review", "Completed", "On Hold"
+    ]
+
+def test_empty_metrics_frame():
+    """Test distribution frame for an empty result"""
+    frame = DashboardMetrics().distribution_frame()
+    assert frame.empty
+    assert list(frame.columns) == ["Status", "count"]
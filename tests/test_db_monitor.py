@@ -1,7 +1,10 @@
 """Test database monitoring"""
+import threading
 import pytest
 from unittest.mock import MagicMock
-from app.utils.db_monitor import verify_database_connection
+from sqlalchemy import create_engine, text
+from app.utils.db_monitor import DatabaseMonitor, monitor_db_operation, verify_database_connection
+from app.utils.metrics import MetricsRegistry, fingerprint, instrument_engine, metrics
 
 def test_database_connection_failure():
     """Test database connection failure"""
@@ -13,4 +16,89 @@ def test_database_connection_failure():
     result = verify_database_connection(mock_db)
     
     # Assert
-    assert result is False 
\ No newline at end of file
+    assert result is False
+
+@pytest.fixture
+def registry():
+    """Start each test with an empty process-wide registry"""
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+def test_monitor_accumulates_across_calls(registry):
+    """Test decorated calls share one registry instead of a fresh monitor each"""
+    # Arrange
+    @monitor_db_operation("load")
+    def load(fail=False):
+        if fail:
+            raise RuntimeError("boom")
+        return "ok"
+
+    # Act
+    load()
+    load()
+    with pytest.raises(RuntimeError):
+        load(fail=True)
+
+    # Assert
+    stats = DatabaseMonitor().get_stats()
+    assert (stats['operations'], stats['errors']) == (3, 1)
+    [row] = registry.snapshot("operation")
+    assert row["name"] == "load" and row["p50_ms"] is not None
+
+def test_registry_is_thread_safe():
+    """Test concurrent observations are all counted"""
+    registry = MetricsRegistry()
+
+    def work():
+        for _ in range(1000):
+            registry.observe("operation", "op", 0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.totals("operation") == (8000, 0)
+
+def test_percentiles_and_prometheus_output():
+    """Test percentile estimates and the histogram exposition"""
+    # Arrange
+    registry = MetricsRegistry()
+    for ms in range(1, 101):
+        registry.observe("query", "SELECT ?", ms / 1000)
+
+    # Act
+    [row] = registry.snapshot()
+    body = registry.render_prometheus()
+
+    # Assert
+    assert (row["p50_ms"], row["p95_ms"], row["p99_ms"]) == pytest.approx((51, 96, 100))
+    assert 'axis_db_calls_total{kind="query",name="SELECT ?"} 100' in body
+    assert 'axis_db_latency_seconds_bucket{kind="query",name="SELECT ?",le="0.05"} 50' in body
+    assert 'axis_db_latency_seconds_bucket{kind="query",name="SELECT ?",le="+Inf"} 100' in body
+
+def test_fingerprint_strips_literals():
+    """Test statements differing only in literals share a fingerprint"""
+    assert fingerprint("SELECT * FROM t WHERE a = 'x' AND b IN (1, 2, 3)") == \
+        fingerprint("SELECT *  FROM t WHERE a = 'yy' AND b IN (4, 5)")
+
+def test_instrumented_engine_records_queries(registry):
+    """Test cursor events feed query series, including failures"""
+    # Arrange
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+
+    # Act
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+        with pytest.raises(Exception):
+            conn.execute(text("SELECT * FROM missing_table"))
+
+    # Assert
+    rows = {row["name"]: row for row in registry.snapshot("query")}
+    assert rows["SELECT ?"]["count"] == 2
+    assert rows["SELECT * FROM missing_table"]["errors"] == 1
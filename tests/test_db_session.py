@@ -0,0 +1,48 @@
+"""Test lazy engine creation and pooling"""
+import pytest
+from sqlalchemy import text
+from app.core.config import Settings
+from app.db import session
+
+@pytest.fixture
+def sqlite_url(tmp_path, monkeypatch):
+    """Point the session module at a throwaway SQLite database"""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    monkeypatch.setattr(Settings, "DATABASE_URL", property(lambda self: url))
+    session.dispose_engine()
+    yield url
+    session.dispose_engine()
+
+def test_import_does_not_create_engine(sqlite_url):
+    """Test that no engine exists until first use"""
+    assert session._engine is None
+
+def test_engine_created_once_on_first_use(sqlite_url):
+    """Test lazy creation and reuse of the engine"""
+    engine = session.get_engine()
+    assert session.get_engine() is engine
+    assert session.engine is engine
+    assert str(engine.url) == sqlite_url
+
+def test_get_db_yields_working_session(sqlite_url):
+    """Test that get_db binds sessions to the lazy engine"""
+    db = next(session.get_db())
+    try:
+        assert db.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        db.close()
+
+def test_pool_reset_after_fork(sqlite_url, monkeypatch):
+    """Test that a new process resets the inherited pool"""
+    engine = session.get_engine()
+    disposed = []
+    monkeypatch.setattr(engine, "dispose", lambda close=True: disposed.append(close))
+    monkeypatch.setattr(session.os, "getpid", lambda: session._engine_pid + 1)
+
+    assert session.get_engine() is engine
+    assert disposed == [False]
+
+def test_warm_up_pool(sqlite_url):
+    """Test pre-opening pooled connections"""
+    assert session.warm_up_pool(2) == 2
+    assert session.warm_up_pool(0) == 0
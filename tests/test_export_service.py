@@ -0,0 +1,131 @@
+"""Test streaming exports"""
+import csv
+import io
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.competitor import Competitor
+from app.services import export_service
+from app.services.export_service import ExportService
+
+@pytest.fixture
+def session_factory():
+    """Session factory over an in-memory SQLite database with five competitors"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Competitor.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add_all(
+            Competitor(ProjectID="P1" if i < 3 else "P2", Payor=f"Payor {i}", EI=i % 2 == 0,
+                       DataLoadDate=datetime(2024, 1, i + 1))
+            for i in range(5)
+        )
+        db.commit()
+    yield factory
+    engine.dispose()
+
+def test_csv_export_streams_in_batches(session_factory):
+    """Test CSV output arrives one chunk per batch and parses back"""
+    # Act
+    chunks = list(ExportService.stream(
+        "competitors", "csv", batch_size=2, session_factory=session_factory
+    ))
+
+    # Assert
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [row["Payor"] for row in rows] == [f"Payor {i}" for i in range(5)]
+
+def test_csv_export_filters_by_project(session_factory):
+    """Test an export limited to one project, and an empty result keeps the header"""
+    data = b"".join(ExportService.stream(
+        "competitors", "csv", project_id="P2", session_factory=session_factory
+    )).decode()
+    assert [row["ProjectID"] for row in csv.DictReader(io.StringIO(data))] == ["P2", "P2"]
+
+    empty = b"".join(ExportService.stream(
+        "competitors", "csv", project_id="none", session_factory=session_factory
+    )).decode()
+    assert empty.splitlines() == [",".join(c.name for c in Competitor.__table__.columns)]
+
+def test_parquet_export_round_trip(session_factory):
+    """Test Parquet output is written one row group per batch with typed columns"""
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    data = b"".join(ExportService.stream(
+        "competitors", "parquet", batch_size=2, session_factory=session_factory
+    ))
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("EI").to_pylist() == [True, False, True, False, True]
+    assert table.column("DataLoadDate").to_pylist()[0] == datetime(2024, 1, 1)
+
+def test_export_endpoint(session_factory, monkeypatch):
+    """Test the endpoint streams an attachment and rejects unknown tables"""
+    from app.api.endpoints import exports
+    monkeypatch.setattr(export_service, "SessionLocal", session_factory)
+    app = FastAPI()
+    app.include_router(exports.router)
+    client = TestClient(app)
+
+    response = client.get("/exports/competitors", params={"project_id": "P1"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="competitors_P1_' in response.headers["content-disposition"]
+    assert len(response.text.splitlines()) == 4
+
+    assert client.get("/exports/unknown").status_code == 400
+    assert client.get("/exports/notes", params={"format": "xlsx"}).status_code == 400
+
+def test_filename_strips_header_characters():
+    """Test quotes, CRLF and path characters in project_id cannot reach the header"""
+    name = ExportService.filename("notes", "csv", 'P1"\r\nX-Evil: 1/../')
+
+    assert name.startswith("notes_P1___X-Evil__1____")
+    assert name.endswith(".csv")
+    assert ExportService.filename("notes", "csv").startswith("notes_all_")
+
+def test_y_line_export_reads_the_configured_store(monkeypatch):
+    """Test y-lines are exported through the Y-Line repository's adapter, filtered by projects id"""
+    # Arrange
+    from sqlalchemy import Column, Integer, MetaData, Table
+    from app.models.y_line import YLine, YLineStatus
+    from app.services.y_line_repository import ADAPTERS, YLineRepository
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    metadata = MetaData()
+    Table("projects", metadata, Column("id", Integer, primary_key=True))
+    YLine.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables["projects"].insert(), [{"id": 1}, {"id": 2}])
+        conn.execute(metadata.tables["y_lines"].insert(), [
+            {"ipa_number": f"IPA-{i}", "product_code": "PC", "project_id": 1 + i % 2,
+             "status": YLineStatus.ACTIVE, "created_at": datetime(2024, 1, 1)}
+            for i in range(4)
+        ])
+    monkeypatch.setitem(export_service.EXPORT_TABLES, "y-lines", YLineRepository(ADAPTERS["y_lines"]))
+
+    # Act
+    data = b"".join(ExportService.stream(
+        "y-lines", "csv", project_id="2", batch_size=1, session_factory=sessionmaker(bind=engine)
+    )).decode()
+
+    # Assert
+    rows = list(csv.DictReader(io.StringIO(data)))
+    assert [(row["ipa_number"], row["project_id"], row["status"]) for row in rows] == [
+        ("IPA-1", "2", "active"), ("IPA-3", "2", "active"),
+    ]
+    with pytest.raises(ValueError):
+        ExportService.validate("y-lines", "csv", project_id="MN24HMO")
+    engine.dispose()
@@ -0,0 +1,140 @@
+"""Test the project notes full-text index"""
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.notes import ProjectNote
+from app.services import note_search
+from app.services.note_search import NoteSearchIndex, tokenize
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    ProjectNote.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    session.add_all([
+        ProjectNote(RecordID=1, ProjectID="P1", Notes="Network adequacy review planned for rural counties",
+                    LastEditDate=datetime(2024, 1, 1)),
+        ProjectNote(RecordID=2, ProjectID="P1", Notes="Provider directory updated; adequacy looks fine",
+                    LastEditDate=datetime(2024, 1, 2)),
+        ProjectNote(RecordID=3, ProjectID="P2", Notes="Waiting on the provider file from the payor",
+                    LastEditDate=datetime(2024, 1, 3)),
+    ])
+    session.commit()
+    session.close()
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def index(tmp_path):
+    return NoteSearchIndex(path=str(tmp_path / "notes_index.json"), refresh_seconds=300, save_seconds=0)
+
+def _statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+def test_tokenize_stems_and_drops_stop_words():
+    """Test inflected forms share a stem and stop words are not indexed"""
+    assert tokenize("The providers' plans were updated") == ["provid", "plan", "updat"]
+    assert tokenize("provider plan update") == ["provid", "plan", "updat"]
+
+def test_search_ranks_with_bm25_and_filters_by_project(db, index):
+    """Test the shorter, more specific note ranks first and project_id narrows results"""
+    index.ensure_fresh(db)
+
+    hits = index.search("adequacy reviews")
+    assert [hit.RecordID for hit in hits] == [1, 2]
+    assert hits[0].score > hits[1].score
+
+    assert [hit.RecordID for hit in index.search("provider", project_id="P2")] == [3]
+    assert index.search("the") == []
+
+def test_sync_reads_only_notes_edited_since_watermark(db, index):
+    """Test a refresh indexes new notes and drops deleted ones without re-reading the table"""
+    # Arrange
+    index.ensure_fresh(db)
+    db.add(ProjectNote(RecordID=4, ProjectID="P2", Notes="Rural access standards", LastEditDate=datetime(2024, 2, 1)))
+    db.query(ProjectNote).filter(ProjectNote.RecordID == 2).delete()
+    db.commit()
+
+    # Act
+    index.invalidate()
+    read = index.sync(db)
+
+    # Assert
+    assert read == 1
+    assert index.watermark == datetime(2024, 2, 1)
+    assert [hit.RecordID for hit in index.search("rural")] == [4, 1]
+    assert [hit.RecordID for hit in index.search("directory")] == []
+
+def test_restart_loads_saved_index_instead_of_rebuilding(db, index, tmp_path):
+    """Test a new process reads the saved file and only asks for notes after the watermark"""
+    # Arrange
+    index.ensure_fresh(db)
+    index.save()
+    restarted = NoteSearchIndex(path=index.path, refresh_seconds=300)
+    statements = _statements(db)
+
+    # Act
+    restarted.ensure_fresh(db)
+
+    # Assert
+    assert len(restarted) == 3
+    assert "LastEditDate" in statements[0] and ">=" in statements[0]
+    assert [hit.RecordID for hit in restarted.search("payor")] == [3]
+    assert [p.name for p in tmp_path.iterdir()] == ["notes_index.json"]
+
+def test_unreadable_index_file_is_rebuilt(db, index):
+    """Test a corrupt file falls back to indexing every note"""
+    with open(index.path, "w") as f:
+        f.write("{not json")
+
+    index.ensure_fresh(db)
+
+    assert len(index) == 3
+
+def test_search_endpoint_sees_notes_written_through_router(session_factory, index, monkeypatch):
+    """Test /notes/search is routed ahead of /notes/{project_id} and the write hooks update the index"""
+    # Arrange
+    from app.api.endpoints import notes
+    from app.db.session import get_db
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(note_search, "note_search_index", index)
+    monkeypatch.setattr(notes, "note_search_index", index)
+    app = FastAPI()
+    app.include_router(notes.router)
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+    assert [hit["RecordID"] for hit in client.get("/notes/search?q=payor").json()] == [3]
+
+    # Act
+    client.post("/notes/", json={"ProjectID": "P3", "Notes": "Payor escalation sent"})
+    client.delete("/notes/3")
+    results = client.get("/notes/search", params={"q": "payor"}).json()
+
+    # Assert
+    assert [(hit["ProjectID"], hit["Notes"]) for hit in results] == [("P3", "Payor escalation sent")]
+    assert results[0]["score"] > 0
+    assert client.get("/notes/search").status_code == 422
@@ -0,0 +1,104 @@
+"""Test keyset pagination"""
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_db
+from app.models.competitor import Competitor
+from app.models.project import Project
+from app.services.competitor_service import CompetitorService
+from app.services.project_service import ProjectService
+from app.utils.pagination import NEXT_CURSOR_HEADER, Page, decode_cursor, encode_cursor
+
+@pytest.fixture
+def db():
+    """Throwaway in-memory SQLite session"""
+    engine = create_engine("sqlite://")
+    Project.__table__.create(engine)
+    Competitor.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+def _walk(fetch, limit):
+    """Follow cursors until exhausted, returning every page"""
+    pages, cursor = [], None
+    while True:
+        page = fetch(cursor=cursor, limit=limit)
+        pages.append(page.items)
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+def test_cursor_round_trip():
+    """Test cursors preserve datetimes and plain values"""
+    values = [datetime(2024, 5, 1, 12, 30), 42, None, "P1"]
+    assert decode_cursor(encode_cursor(values)) == values
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!")
+
+def test_competitor_pages_cover_all_rows(db):
+    """Test paging by RecordID returns every row exactly once"""
+    # Arrange
+    db.add_all(Competitor(ProjectID=f"P{i}") for i in range(7))
+    db.commit()
+
+    # Act
+    pages = _walk(lambda **kw: CompetitorService.get_competitors_page(db, **kw), limit=3)
+
+    # Assert
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [c.RecordID for page in pages for c in page] == list(range(1, 8))
+
+def test_project_pages_handle_ties_and_nulls(db):
+    """Test LastEditDate ties and NULLs neither repeat nor drop rows"""
+    # Arrange
+    same = datetime(2024, 1, 1)
+    dates = [same, same, None, datetime(2024, 3, 1), same, None]
+    for i, edited in enumerate(dates):
+        db.add(Project(ProjectID=f"P{i}", LastEditDate=edited))
+    db.commit()
+    # server_default fills NULL on insert, so clear those explicitly
+    db.query(Project).filter(Project.ProjectID.in_(["P2", "P5"])).update(
+        {Project.LastEditDate: None}, synchronize_session=False
+    )
+    db.commit()
+
+    # Act
+    pages = _walk(lambda **kw: ProjectService.get_projects_page(db, **kw), limit=2)
+
+    # Assert
+    ids = [p.ProjectID for page in pages for p in page]
+    assert ids == ["P3", "P4", "P1", "P0", "P5", "P2"]
+
+def test_read_competitors_sets_next_cursor_header(monkeypatch):
+    """Test the router exposes the cursor header and rejects bad cursors"""
+    from app.api.endpoints import competitors
+    row = {"RecordID": 1, "ProjectID": "P1", "Product": "HMO", "Payor": "Acme",
+           "CreatedDate": datetime(2024, 1, 1), "ModifiedDate": datetime(2024, 1, 1)}
+
+    def fake_page(db, cursor=None, limit=100):
+        if cursor == "bogus":
+            raise ValueError("Invalid cursor")
+        return Page(items=[row], next_cursor=None if cursor else "next")
+
+    monkeypatch.setattr(CompetitorService, "get_competitors_page", fake_page)
+    app = FastAPI()
+    app.include_router(competitors.router)
+    app.dependency_overrides[get_db] = lambda: None
+    client = TestClient(app)
+
+    first = client.get("/competitors/", params={"limit": 1})
+    assert first.json()[0]["RecordID"] == 1
+    assert first.headers[NEXT_CURSOR_HEADER] == "next"
+
+    last = client.get("/competitors/", params={"cursor": "next"})
+    assert NEXT_CURSOR_HEADER not in last.headers
+
+    assert client.get("/competitors/", params={"cursor": "bogus"}).status_code == 400
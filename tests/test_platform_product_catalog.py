@@ -0,0 +1,106 @@
+"""Test the in-memory platform product catalog"""
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.platform_load_product import PlatformLoadProduct
+from app.services.platform_product_catalog import PlatformProductCatalog
+
+LOADED = datetime(2024, 1, 1)
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    PlatformLoadProduct.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        PlatformLoadProduct(RECORD_ID=1, NWNW_ID="MN0001", NWPR_PFX="HMO1", GRGR_NAME="North", DataLoadDate=LOADED),
+        PlatformLoadProduct(RECORD_ID=2, NWNW_ID="MN0002", NWPR_PFX="PPO1", GRGR_NAME="North", DataLoadDate=LOADED),
+        PlatformLoadProduct(RECORD_ID=3, NWNW_ID="mn0100", NWPR_PFX="HMO2", GRGR_NAME="North", DataLoadDate=LOADED),
+        PlatformLoadProduct(RECORD_ID=4, NWNW_ID="WI0001", NWPR_PFX="HMO1", GRGR_NAME="East", DataLoadDate=LOADED),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def _ids(products):
+    return [p.RECORD_ID for p in products]
+
+def test_prefix_lookups(db):
+    """Test network, product and combined prefixes are case-insensitive ranges"""
+    catalog = PlatformProductCatalog(refresh_seconds=60).ensure_fresh(db)
+
+    assert _ids(catalog.for_project("MN24001")) == [1, 2, 3]
+    assert _ids(catalog.by_network_prefix("mn00")) == [1, 2]
+    assert _ids(catalog.by_product_prefix("hmo")) == [1, 4, 3]
+    assert _ids(catalog.search("MN", "HMO")) == [1, 3]
+    assert catalog.by_network_prefix("TX") == []
+
+def test_prefix_index_matches_linear_scan():
+    """Test bisected ranges equal a brute-force startswith filter"""
+    # Arrange
+    rng = random.Random(3)
+    engine = create_engine("sqlite://")
+    PlatformLoadProduct.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    ids = ["".join(rng.choice("ABC") for _ in range(rng.randint(1, 4))) for _ in range(500)]
+    db.add_all(PlatformLoadProduct(RECORD_ID=i, NWNW_ID=nw, NWPR_PFX="X") for i, nw in enumerate(ids))
+    db.commit()
+    catalog = PlatformProductCatalog().ensure_fresh(db)
+
+    # Act / Assert
+    for prefix in ("", "A", "AB", "CBA", "ABCA", "D"):
+        expected = sorted(i for i, nw in enumerate(ids) if nw.startswith(prefix))
+        assert sorted(_ids(catalog.by_network_prefix(prefix))) == expected
+    db.close()
+
+def test_refresh_fetches_only_rows_since_watermark(db, engine):
+    """Test incremental refresh applies new and changed rows and skips the rest"""
+    # Arrange
+    catalog = PlatformProductCatalog(refresh_seconds=0).ensure_fresh(db)
+    later = datetime(2024, 2, 1)
+    db.add(PlatformLoadProduct(RECORD_ID=5, NWNW_ID="MN0200", NWPR_PFX="EPO1", DataLoadDate=later))
+    db.get(PlatformLoadProduct, 4).GRGR_NAME = "Renamed"
+    db.get(PlatformLoadProduct, 4).DataLoadDate = later
+    db.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    # Act
+    changed = catalog.refresh(db)
+
+    # Assert
+    assert changed == 2 and catalog.watermark == later
+    assert _ids(catalog.for_project("MN")) == [1, 2, 3, 5]
+    assert catalog.by_network_prefix("WI")[0].GRGR_NAME == "Renamed"
+    assert any("WHERE" in sql and "DataLoadDate\" >=" in sql for sql in statements)
+    assert catalog.refresh(db) == 0
+
+def test_deleted_rows_trigger_full_reload(db):
+    """Test a row count mismatch after the incremental read reloads the catalog"""
+    catalog = PlatformProductCatalog(refresh_seconds=0).ensure_fresh(db)
+    db.delete(db.get(PlatformLoadProduct, 2))
+    db.commit()
+
+    assert catalog.refresh(db) == 1
+    assert _ids(catalog.for_project("MN")) == [1, 3]
+    assert len(catalog) == 3
+
+def test_lookup_does_not_query_between_refreshes(db, engine):
+    """Test repeated page opens within the interval are served from memory"""
+    catalog = PlatformProductCatalog(refresh_seconds=300).ensure_fresh(db)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    for _ in range(5):
+        catalog.ensure_fresh(db).for_project("MN")
+
+    assert statements == []
@@ -0,0 +1,95 @@
+"""Test batched persistence of selected platform products"""
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.selected_platform_product import SelectedPlatformProduct
+from app.services import platform_selection_service
+from app.services.platform_selection_service import PlatformSelectionService, SelectionChanges
+
+def _product(i):
+    return {"NWNW_ID": f"MN{i:04d}", "NWPR_PFX": "HMO1", "GRGR_ID": "G1", "GRGR_NAME": "North"}
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    SelectedPlatformProduct.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add_all(SelectedPlatformProduct(ProjectID="P1", **_product(i)) for i in range(3))
+    session.add(SelectedPlatformProduct(ProjectID="P2", **_product(0)))
+    session.commit()
+    yield session
+    session.close()
+
+def _stored(db, project_id="P1"):
+    return {row.NWNW_ID: row.RECORD_ID for row in PlatformSelectionService.get_selection(db, project_id)}
+
+def test_save_selection_writes_only_the_difference(db, engine):
+    """Test 300 selected products are saved with one read and one batched write"""
+    # Arrange
+    before = _stored(db)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+    desired = [_product(i) for i in range(1, 301)]
+    desired[0] = dict(desired[0], NWNW_ID=" mn0001 ")
+
+    # Act
+    changes = PlatformSelectionService.save_selection(db, "P1", desired, user_msid="tester")
+
+    # Assert
+    assert (len(changes.to_insert), len(changes.to_delete), changes.unchanged) == (298, 1, 2)
+    assert statements == ["SELECT", "DELETE", "INSERT"]
+    after = _stored(db)
+    assert len(after) == 300 and "MN0000" not in after
+    assert after["MN0001"] == before["MN0001"]
+    assert _stored(db, "P2") == {"MN0000": 4}
+
+def test_unchanged_selection_issues_no_writes(db, engine):
+    """Test resubmitting the stored selection only reads"""
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+    changes = PlatformSelectionService.save_selection(db, "P1", [_product(i) for i in range(3)])
+
+    assert changes.unchanged == 3 and statements == ["SELECT"]
+
+def test_failed_save_rolls_back(db, monkeypatch):
+    """Test a failed insert leaves the stored selection intact"""
+    before = _stored(db)
+
+    def broken_apply(db, changes, shared):
+        db.execute(SelectedPlatformProduct.__table__.delete())
+        raise SQLAlchemyError("insert failed")
+
+    monkeypatch.setattr(PlatformSelectionService, "_apply", staticmethod(broken_apply))
+
+    with pytest.raises(SQLAlchemyError):
+        PlatformSelectionService.save_selection(db, "P1", [_product(9)])
+    assert _stored(db) == before
+
+def test_merge_batches_stay_under_parameter_limit():
+    """Test the SQL Server MERGE binds fewer than 2100 parameters per statement"""
+    # Arrange
+    db = MagicMock()
+    changes = SelectionChanges(
+        to_insert=[_product(i) for i in range(500)], to_delete=list(range(250))
+    )
+
+    # Act
+    PlatformSelectionService._merge(db, changes, {"project_id": "P1", "project_status": None, "user_msid": None})
+
+    # Assert
+    batches = [call.args[1] for call in db.execute.call_args_list]
+    assert len(batches) == 3
+    assert all(len(params) < 2100 for params in batches)
+    actions = [v for params in batches for k, v in params.items() if k.startswith("a")]
+    assert actions.count("D") == 250 and actions.count("I") == 500
+    assert platform_selection_service.MERGE_ROWS_PER_BATCH * 6 + 3 < 2100
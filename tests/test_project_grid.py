@@ -0,0 +1,67 @@
+"""Test keyset paging and prefetch for the Streamlit project grid"""
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app import main
+from app.utils.query_cache import QueryCache
+
+@pytest.fixture
+def read_sql(monkeypatch):
+    """pd.read_sql returning page_size + 1 rows, behind a private query cache"""
+    monkeypatch.setattr(main, "query_cache", QueryCache(max_bytes=1024 * 1024, default_ttl=60))
+    monkeypatch.setattr("app.utils.query_cache.query_cache", main.query_cache)
+    monkeypatch.setattr(main, "get_db", lambda: iter([MagicMock()]))
+    frame = pd.DataFrame({
+        "RecordID": [9, 8, 7],
+        "ProjectID": ["P9", "P8", "P7"],
+        "ProjectType": ["T", "T", "R"],
+        "ProjectDesc": ["a", "b", "c"],
+        "Status": ["Active"] * 3,
+        "LastEditDate": pd.to_datetime(["2024-03-03", "2024-03-02", "2024-03-01"]),
+    })
+    with patch("app.utils.query_cache.pd.read_sql", return_value=frame) as mock:
+        yield mock
+
+def test_first_page_has_no_seek_and_reads_one_extra_row():
+    """Test the first page is a TOP (n + 1) over the filters"""
+    query, params = main.project_page_query(
+        status_filter=["New", "Active"], date_range=(date(2024, 1, 1), date(2024, 1, 31)), page_size=50
+    )
+
+    assert "TOP (?)" in query and "RecordID <" not in query
+    assert query.rstrip().endswith("ORDER BY LastEditDate DESC, RecordID DESC")
+    assert params == (51, "New", "Active", "2024-01-01 00:00:00", "2024-01-31 23:59:59")
+
+def test_later_pages_seek_after_the_last_row():
+    """Test the seek predicate includes ties on LastEditDate and the NULL tail"""
+    last_edit = datetime(2024, 3, 1)
+
+    query, params = main.project_page_query(after=(last_edit, 7), page_size=2)
+    null_query, null_params = main.project_page_query(after=(None, 7), page_size=2)
+
+    assert "LastEditDate < ? OR LastEditDate IS NULL OR (LastEditDate = ? AND RecordID < ?)" in query
+    assert params == (3, last_edit, last_edit, 7)
+    assert "AND LastEditDate IS NULL AND RecordID < ?" in null_query
+    assert null_params == (3, 7)
+
+def test_fetch_returns_window_and_next_seek_key(read_sql):
+    """Test only the visible window is returned with the last row's key"""
+    page, next_after = main.fetch_project_page(page_size=2)
+
+    assert page["ProjectID"].tolist() == ["P9", "P8"]
+    assert next_after == (datetime(2024, 3, 2), 8)
+
+def test_prefetch_warms_the_cache_for_the_next_page(read_sql):
+    """Test the background read means paging forward does not query again"""
+    # Arrange
+    after = (datetime(2024, 3, 2), 8)
+
+    # Act
+    main.prefetch_project_page(None, None, after).result(timeout=5)
+    main.fetch_project_page(after=after)
+
+    # Assert
+    assert read_sql.call_count == 1
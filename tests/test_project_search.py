@@ -0,0 +1,104 @@
+"""Test the in-memory typeahead index over projects"""
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.project import Project
+from app.services import project_service
+from app.services.project_search import ProjectSearchIndex, trigrams
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Project.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    session.add_all([
+        Project(RecordID=1, ProjectID="MN24HMO", ProjectDesc="Hennepin network adequacy", Analyst="Olson",
+                PM="Garcia", BenchmarkFileID="BM-0042", LastEditDate=datetime(2024, 1, 1)),
+        Project(RecordID=2, ProjectID="WI24PPO", ProjectDesc="Dane county refresh", Analyst="Nguyen",
+                PM="Olson", LastEditDate=datetime(2024, 1, 2)),
+        Project(RecordID=3, ProjectID="HEN2024", ProjectDesc="Dental expansion", Analyst="Smith",
+                PM="Lee", LastEditDate=datetime(2024, 1, 3)),
+    ])
+    session.commit()
+    session.close()
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def index(db):
+    return ProjectSearchIndex(refresh_seconds=300).ensure_fresh(db)
+
+def _ids(matches):
+    return [match.project.ProjectID for match in matches]
+
+def test_last_query_word_is_a_prefix():
+    """Test a partly typed word keeps its trailing trigram open"""
+    assert trigrams("hen", prefix=True) == {"  h", " he", "hen"}
+    assert "en " in trigrams("hen")
+
+def test_prefix_matches_rank_project_id_first(index):
+    """Test a ProjectID prefix outranks a word in the description"""
+    assert _ids(index.search("hen")) == ["HEN2024", "MN24HMO"]
+    assert _ids(index.search("olson")) == ["WI24PPO", "MN24HMO"]
+    assert _ids(index.search("bm-0042")) == ["MN24HMO"]
+
+def test_fuzzy_match_tolerates_typos(index):
+    """Test misspelt words still find the project"""
+    assert _ids(index.search("netwrk adequcy")) == ["MN24HMO"]
+    assert index.search("zzz") == []
+
+def test_sync_reads_edits_since_watermark_and_drops_deletes(db, index):
+    """Test a refresh indexes edited projects and forgets deleted ones"""
+    # Arrange
+    db.get(Project, 2).ProjectDesc = "Dane county dental refresh"
+    db.get(Project, 2).LastEditDate = datetime(2024, 2, 1)
+    db.delete(db.get(Project, 3))
+    db.commit()
+
+    # Act
+    read = index.sync(db)
+
+    # Assert
+    assert read == 1
+    assert index.watermark == datetime(2024, 2, 1)
+    assert _ids(index.search("dental")) == ["WI24PPO"]
+    assert len(index) == 2
+
+def test_search_endpoint_is_routed_before_record_id(session_factory, monkeypatch):
+    """Test GET /projects/search reaches the index rather than /projects/{record_id}"""
+    from app.api.endpoints import projects
+    from app.db.session import get_db
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(project_service, "project_search_index", ProjectSearchIndex(refresh_seconds=300))
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    results = client.get("/projects/search", params={"q": "wi24"}).json()
+
+    assert [(r["RecordID"], r["ProjectID"]) for r in results] == [(2, "WI24PPO")]
+    assert results[0]["score"] > 1
+    assert client.get("/projects/search").status_code == 422
@@ -0,0 +1,88 @@
+"""Test the shared query result cache"""
+import pandas as pd
+from app.utils.query_cache import QueryCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_cache(max_bytes=10 * 1024 * 1024, clock=None):
+    return QueryCache(max_bytes=max_bytes, default_ttl=60, clock=clock or FakeClock())
+
+def test_key_normalizes_whitespace_and_params():
+    """Test that equivalent SQL maps to the same key"""
+    key1 = QueryCache.make_key("SELECT *\n  FROM t WHERE a = ?", ("x",))
+    key2 = QueryCache.make_key("SELECT * FROM t WHERE a = ?", ["x"])
+    assert key1 == key2
+    assert key1 != QueryCache.make_key("SELECT * FROM t WHERE a = ?", ("y",))
+
+def test_loader_called_once_and_copies_returned():
+    """Test caching and protection against caller mutation"""
+    cache = make_cache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return pd.DataFrame({'a': [1, 2]})
+
+    first = cache.get_or_load("k", loader)
+    first['a'] = 0
+    second = cache.get_or_load("k", loader)
+
+    assert len(calls) == 1
+    assert second['a'].tolist() == [1, 2]
+    assert cache.get_stats()['hits'] == 1
+
+def test_ttl_expiry():
+    """Test that entries expire after their TTL"""
+    clock = FakeClock()
+    cache = make_cache(clock=clock)
+    cache.set("k", 1, ttl=5)
+    clock.now = 4.9
+    assert cache.get("k") == (True, 1)
+    clock.now = 5.0
+    assert cache.get("k") == (False, None)
+
+def test_lru_eviction_under_memory_budget():
+    """Test that least recently used entries are evicted first"""
+    frame = pd.DataFrame({'a': range(100)})
+    size = int(frame.memory_usage(index=True, deep=True).sum())
+    cache = make_cache(max_bytes=size * 2)
+
+    cache.set("a", frame)
+    cache.set("b", frame)
+    cache.get("a")
+    cache.set("c", frame)
+
+    assert cache.get("a")[0]
+    assert not cache.get("b")[0]
+    assert cache.get("c")[0]
+    assert cache.get_stats()['evictions'] == 1
+
+def test_invalidate_by_table_tag():
+    """Test that writers can drop every read of a table"""
+    cache = make_cache()
+    cache.set("projects", 1, tags=("CS_EXP_Project_Translation",))
+    cache.set("recent", 2, tags=("CS_EXP_Project_Translation", "CS_EXP_ProjectNotes"))
+    cache.set("notes", 3, tags=("CS_EXP_ProjectNotes",))
+
+    removed = cache.invalidate("CS_EXP_Project_Translation")
+
+    assert removed == 2
+    assert not cache.get("projects")[0]
+    assert not cache.get("recent")[0]
+    assert cache.get("notes") == (True, 3)
+
+def test_load_racing_invalidation_is_not_stored():
+    """Test that a result loaded across an invalidation is discarded"""
+    cache = make_cache()
+
+    def loader():
+        cache.invalidate("t")
+        return "stale"
+
+    assert cache.get_or_load("k", loader, tags=("t",)) == "stale"
+    assert not cache.get("k")[0]
@@ -0,0 +1,132 @@
+"""Test the reference data registry and its endpoint"""
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints import reference_data as reference_endpoint
+from app.models.county_centroid import CountyCentroid
+from app.models.project import Project
+from app.models.project_type import ProjectType
+from app.models.strenuus_product import StrenuusProduct
+from app.services.reference_data import DEFAULT_PROJECT_TYPES, ReferenceRegistry
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    for model in (ProjectType, Project, StrenuusProduct, CountyCentroid):
+        model.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        ProjectType(TypeCode="T", Description="Translation", IsActive=True),
+        ProjectType(TypeCode="X", Description="Retired", IsActive=False),
+        Project(ProjectID="P1", Status="On Hold"),
+        Project(ProjectID="P2", Status="active"),
+        StrenuusProduct(KeyId=1, Payor="Aetna", Product="Choice HMO"),
+        StrenuusProduct(KeyId=2, Payor="Aetna", Product="Open Access"),
+        CountyCentroid(State="mn", County="Hennepin", Region="Metro", Latitude=45.0, Longitude=-93.4),
+        CountyCentroid(State="MN", County="Anoka", Region="Metro", Latitude=45.3, Longitude=-93.3),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def test_load_reads_every_table_in_one_query(db, engine):
+    """Test one statement fills every list, deduplicated and sorted"""
+    # Arrange
+    registry = ReferenceRegistry()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    # Act
+    data = registry.load(db)
+
+    # Assert
+    assert len(statements) == 1
+    assert [t.code for t in data.project_types] == ["T"]
+    assert data.project_statuses[-1] == "On Hold" and data.project_statuses.count("Active") == 1
+    assert data.payors == ("Aetna",)
+    assert data.states == ("MN",) and data.regions == ("Metro",)
+    assert [c.county for c in data.counties_for_state("mn")] == ["Anoka", "Hennepin"]
+    assert registry.loaded and registry.get() is data
+
+def test_version_tracks_content(db):
+    """Test reloading unchanged tables keeps the version and a change bumps it"""
+    registry = ReferenceRegistry()
+    first = registry.load(db).version
+    assert registry.load(db).version == first
+
+    db.add(StrenuusProduct(KeyId=3, Payor="Cigna", Product="Open Access"))
+    db.commit()
+
+    assert registry.load(db).version != first
+
+def test_ensure_loaded_rereads_after_ttl_or_invalidate(db, engine):
+    """Test new payors reach the registry, and its version, without a restart"""
+    # Arrange
+    registry = ReferenceRegistry(ttl_seconds=300)
+    factory = sessionmaker(bind=engine)
+    first = registry.ensure_loaded(factory).version
+    db.add(StrenuusProduct(KeyId=3, Payor="Cigna", Product="Open Access"))
+    db.commit()
+
+    # Act
+    cached = registry.ensure_loaded(factory)
+    registry.invalidate()
+    reloaded = registry.ensure_loaded(factory)
+    registry.ttl_seconds = 0
+    db.add(StrenuusProduct(KeyId=4, Payor="Humana", Product="Gold Plus"))
+    db.commit()
+    expired = registry.ensure_loaded(factory)
+
+    # Assert
+    assert cached.version == first and cached.payors == ("Aetna",)
+    assert reloaded.version != first and reloaded.payors == ("Aetna", "Cigna")
+    assert expired.payors == ("Aetna", "Cigna", "Humana")
+
+def test_failed_load_keeps_defaults_and_backs_off():
+    """Test a database error leaves the defaults in place and is not retried on every call"""
+    # Arrange
+    registry = ReferenceRegistry()
+    session = MagicMock()
+    session.execute.side_effect = OperationalError("SELECT", {}, Exception("down"))
+    factory = MagicMock(return_value=session)
+
+    # Act
+    registry.ensure_loaded(factory)
+    data = registry.ensure_loaded(factory)
+
+    # Assert
+    assert not registry.loaded
+    assert data.project_types == DEFAULT_PROJECT_TYPES
+    assert factory.call_count == 1
+    session.close.assert_called_once()
+
+def test_endpoint_sets_etag_and_honours_if_none_match(db, monkeypatch):
+    """Test clients holding the current version get 304 without a body"""
+    # Arrange
+    registry = ReferenceRegistry()
+    registry.load(db)
+    monkeypatch.setattr(reference_endpoint, "reference_registry", registry)
+    app = FastAPI()
+    app.include_router(reference_endpoint.router)
+    client = TestClient(app)
+
+    # Act
+    first = client.get("/reference-data")
+    cached = client.get("/reference-data", headers={"If-None-Match": first.headers["ETag"]})
+
+    # Assert
+    assert first.status_code == 200
+    assert first.json()["version"] == registry.get().version
+    assert first.json()["counties"][0] == {"state": "MN", "county": "Anoka", "region": "Metro"}
+    assert cached.status_code == 304 and cached.content == b""
@@ -0,0 +1,171 @@
+"""Test the service-area radius engine"""
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.county_centroid import CountyCentroid
+from app.models.service_area import ServiceArea, ServiceAreaFootprint
+from app.services import service_area_engine
+from app.services.service_area_engine import CountyIndex, ServiceAreaEngine, haversine_miles, load_footprint
+
+# Approximate county centroids around Minneapolis-St. Paul
+COUNTIES = [
+    ("MN", "Hennepin", "North", 45.00, -93.48),
+    ("MN", "Ramsey", "North", 45.02, -93.10),   # ~19 mi from Hennepin
+    ("MN", "Dakota", "North", 44.67, -93.06),   # ~31 mi
+    ("MN", "Wright", "North", 45.17, -93.96),   # ~27 mi
+    ("MN", "Olmsted", "South", 44.00, -92.40),  # ~85 mi
+]
+
+@pytest.fixture
+def db():
+    """SQLite session with centroids and a project whose only county is Hennepin"""
+    service_area_engine.reset_county_index()
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    CountyCentroid.__table__.create(engine)
+    ServiceArea.__table__.create(engine)
+    ServiceAreaFootprint.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        CountyCentroid(State=s, County=c, Region=r, Latitude=lat, Longitude=lon)
+        for s, c, r, lat, lon in COUNTIES
+    )
+    session.add(ServiceArea(ProjectID="P1", State="MN", County="Hennepin",
+                            ReportInclude="Y", ProjectStatus="Active"))
+    session.commit()
+    yield session
+    session.close()
+    service_area_engine.reset_county_index()
+
+def _counties(db):
+    rows = db.query(ServiceArea).filter(ServiceArea.ProjectID == "P1").all()
+    return {row.County: row.ReportInclude for row in rows}
+
+def test_band_index_matches_brute_force():
+    """Test the latitude-band search returns exactly the brute-force result"""
+    # Arrange
+    rng = np.random.default_rng(7)
+    lat = rng.uniform(25, 49, 3000)
+    lon = rng.uniform(-124, -67, 3000)
+    names = [str(i) for i in range(3000)]
+    index = CountyIndex(["XX"] * 3000, names, [None] * 3000, lat, lon)
+    centers, _ = index.positions([("XX", "0"), ("XX", "1"), ("XX", "2")])
+
+    # Act
+    found = index.within(centers, 150)
+
+    # Assert
+    rad_lat, rad_lon = np.radians(lat), np.radians(lon)
+    expected = set()
+    for c in range(3):
+        d = haversine_miles(rad_lat[c], rad_lon[c], rad_lat, rad_lon)
+        expected |= set(np.flatnonzero(d <= 150))
+    assert {int(index.counties[i]) for i in found} == expected
+
+def test_apply_writes_only_the_difference(db):
+    """Test widening and narrowing the radius adds and removes just the changed counties"""
+    # Act
+    wide = ServiceAreaEngine.apply(db, "P1", 35)
+
+    # Assert
+    assert sorted(county for _, county in wide.summary()["added"]) == ["Dakota", "Ramsey", "Wright"]
+    assert _counties(db) == {"Hennepin": "Y", "Ramsey": "N", "Dakota": "N", "Wright": "N"}
+    ramsey_id = db.query(ServiceArea.RecordID).filter(ServiceArea.County == "Ramsey").scalar()
+
+    # Act
+    narrow = ServiceAreaEngine.apply(db, "P1", 20)
+
+    # Assert: Ramsey is kept in place, the footprint is never removed
+    assert narrow.to_add == []
+    assert sorted(county for _, county in narrow.removed_counties) == ["Dakota", "Wright"]
+    assert _counties(db) == {"Hennepin": "Y", "Ramsey": "N"}
+    assert db.query(ServiceArea.RecordID).filter(ServiceArea.County == "Ramsey").scalar() == ramsey_id
+    assert {row.MaxMileage for row in db.query(ServiceArea)} == {20}
+
+def test_report_include_does_not_change_the_footprint(db):
+    """Test an analyst flagging an added county does not widen the radius or pin the county"""
+    # Arrange
+    ServiceAreaEngine.apply(db, "P1", 20)
+    db.query(ServiceArea).filter(ServiceArea.County == "Ramsey").update({"ReportInclude": "Y"})
+    db.query(ServiceArea).filter(ServiceArea.County == "Hennepin").update({"ReportInclude": "N"})
+    db.commit()
+
+    # Act
+    diff = ServiceAreaEngine.apply(db, "P1", 10)
+
+    # Assert
+    assert load_footprint(db, "P1") == [("MN", "Hennepin")]
+    assert diff.removed_counties == [("MN", "Ramsey")]
+    assert _counties(db) == {"Hennepin": "N"}
+
+def test_preview_does_not_write(db):
+    """Test a dry run reports the diff without touching the table"""
+    diff = ServiceAreaEngine.preview(db, "P1", 100)
+
+    assert len(diff.to_add) == 4 and not diff.applied
+    assert _counties(db) == {"Hennepin": "Y"}
+    assert load_footprint(db, "P1") == []
+
+def test_project_without_footprint_is_rejected(db):
+    """Test a project with no stored footprint and no counties raises ValueError"""
+    with pytest.raises(ValueError):
+        ServiceAreaEngine.preview(db, "missing", 50)
+
+def test_widened_project_needs_an_explicit_footprint(db):
+    """Test a project already widened by a radius is not captured whole, and a given footprint shrinks it"""
+    # Arrange: a radius applied before the footprint table existed
+    db.query(ServiceArea).update({"MaxMileage": 35})
+    db.add_all(ServiceArea(ProjectID="P1", State="MN", County=c, ReportInclude="N", MaxMileage=35)
+               for c in ("Ramsey", "Dakota", "Wright"))
+    db.commit()
+
+    # Act
+    with pytest.raises(ValueError, match="give its footprint"):
+        ServiceAreaEngine.preview(db, "P1", 20)
+    diff = ServiceAreaEngine.apply(db, "P1", 20, footprint=[("MN", "Hennepin")])
+
+    # Assert
+    assert sorted(county for _, county in diff.removed_counties) == ["Dakota", "Wright"]
+    assert load_footprint(db, "P1") == [("MN", "Hennepin")]
+    assert _counties(db) == {"Hennepin": "Y", "Ramsey": "N"}
+
+def test_first_run_captures_only_original_rows(db):
+    """Test auto-capture seeds the footprint from FOOTPRINT_FLAG rows, not every current county"""
+    # Arrange
+    db.add(ServiceArea(ProjectID="P1", State="MN", County="Olmsted", ProjectStatus="Active"))
+    db.commit()
+
+    # Act
+    diff = ServiceAreaEngine.apply(db, "P1", 20)
+
+    # Assert
+    assert load_footprint(db, "P1") == [("MN", "Hennepin")]
+    assert diff.removed_counties == [("MN", "Olmsted")]
+
+def test_radius_endpoint_takes_a_footprint(db):
+    """Test the radius endpoint stores a footprint given in the body"""
+    from app.api.endpoints import service_areas
+    from app.db.session import get_db
+
+    app = FastAPI()
+    app.include_router(service_areas.router)
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+    db.query(ServiceArea).update({"MaxMileage": 35})
+    db.commit()
+
+    refused = client.post("/service-areas/P1/radius?max_mileage=20")
+    applied = client.post(
+        "/service-areas/P1/radius?max_mileage=20", json=[{"State": "MN", "County": "Hennepin"}]
+    )
+
+    assert refused.status_code == 400
+    assert applied.status_code == 200
+    assert applied.json()["footprint"] == [["MN", "Hennepin"]]
+    assert load_footprint(db, "P1") == [("MN", "Hennepin")]
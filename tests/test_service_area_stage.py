@@ -0,0 +1,158 @@
+"""Test the staged service area load pipeline"""
+import io
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.service_area import ServiceArea
+from app.models.service_area_stage import ServiceAreaLoad, ServiceAreaStage
+from app.services.service_area_stage_service import (
+    FAILED, PROMOTED, ServiceAreaStageService, validate_stage_frame
+)
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    for model in (ServiceArea, ServiceAreaLoad, ServiceAreaStage):
+        model.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    session.add_all([
+        ServiceArea(ProjectID="P1", Region="North", State="MN", County="Hennepin", ReportInclude="Y", MaxMileage=30),
+        ServiceArea(ProjectID="P1", Region="North", State="MN", County="Ramsey", ReportInclude="N", MaxMileage=30),
+        ServiceArea(ProjectID="P2", Region="North", State="MN", County="Ramsey", ReportInclude="N", MaxMileage=30),
+    ])
+    session.commit()
+    session.close()
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+def _live(db, project_id="P1"):
+    rows = db.query(ServiceArea).filter(ServiceArea.ProjectID == project_id)
+    return {row.County: (row.RecordID, row.ReportInclude, row.MaxMileage) for row in rows}
+
+def test_validate_stage_frame_reports_first_error_per_row():
+    """Test rows are normalised and invalid ones carry a message"""
+    frame = pd.DataFrame([
+        {"State": " mn", "County": "Anoka ", "ReportInclude": "", "MaxMileage": "25"},
+        {"State": "Minnesota", "County": "", "MaxMileage": "x"},
+        {"State": "MN", "County": "Scott", "ReportInclude": "Q"},
+    ])
+
+    result = validate_stage_frame(frame)
+
+    assert result.loc[0, ["State", "County", "ReportInclude", "MaxMileage", "error"]].tolist() == \
+        ["MN", "Anoka", "", 25, ""]
+    assert result["error"].tolist()[1:] == ["County is required", "ReportInclude must be Y or N"]
+
+def test_stage_csv_in_chunks_then_promote(db):
+    """Test a CSV is staged chunk by chunk and promoted with inserts and updates only"""
+    # Arrange
+    before = _live(db)
+    csv = io.StringIO(
+        "state,county,reportinclude,maxmileage\n"
+        "MN,Hennepin,Y,30\n"
+        "MN,Ramsey,Y,30\n"
+        "MN,Anoka,N,30\n"
+        "MN,,N,30\n"
+    )
+    load = ServiceAreaStageService.start_load(db, "P1", source="csv")
+
+    # Act
+    report = ServiceAreaStageService.stage_csv(db, load.LoadID, csv, chunk_size=2)
+
+    # Assert: nothing live has changed yet
+    assert report.staged == 3 and [e.row for e in report.errors] == [5]
+    assert _live(db) == before
+
+    # Act
+    load = ServiceAreaStageService.promote(db, load.LoadID)
+
+    # Assert
+    assert (load.Status, load.RowsInserted, load.RowsUpdated, load.RowsDeleted) == (PROMOTED, 1, 1, 0)
+    after = _live(db)
+    assert after["Hennepin"] == before["Hennepin"]
+    assert after["Ramsey"] == (before["Ramsey"][0], "Y", 30)
+    assert "Anoka" in after
+    assert db.query(ServiceAreaStage).count() == 0
+    assert _live(db, "P2")["Ramsey"][1] == "N"
+
+def test_replace_removes_counties_missing_from_load(db):
+    """Test replace mode deletes the project's counties that were not staged"""
+    load = ServiceAreaStageService.start_load(db, "P1")
+    ServiceAreaStageService.stage_rows(db, load.LoadID, [
+        {"State": "MN", "County": "Hennepin", "ReportInclude": "Y", "MaxMileage": 30},
+        {"State": "MN", "County": "hennepin", "ReportInclude": "N", "MaxMileage": 30},
+    ])
+
+    load = ServiceAreaStageService.promote(db, load.LoadID, replace=True)
+
+    assert (load.RowsInserted, load.RowsUpdated, load.RowsDeleted) == (0, 1, 1)
+    assert {county: flag for county, (_, flag, _) in _live(db).items()} == {"Hennepin": "N"}
+
+def test_failed_promote_marks_load_and_keeps_stage(db, monkeypatch):
+    """Test a database error rolls back, records the failure and allows a retry"""
+    # Arrange
+    before = _live(db)
+    load = ServiceAreaStageService.start_load(db, "P1")
+    ServiceAreaStageService.stage_rows(db, load.LoadID, [{"State": "MN", "County": "Anoka"}])
+
+    def broken_merge(*args):
+        raise SQLAlchemyError("deadlock")
+
+    monkeypatch.setattr(ServiceAreaStageService, "_merge_portable", staticmethod(broken_merge))
+
+    # Act
+    with pytest.raises(SQLAlchemyError):
+        ServiceAreaStageService.promote(db, load.LoadID)
+
+    # Assert
+    load = ServiceAreaStageService.get_load(db, load.LoadID)
+    assert load.Status == FAILED and "deadlock" in load.Message
+    assert _live(db) == before
+    monkeypatch.undo()
+    assert ServiceAreaStageService.promote(db, load.LoadID).RowsInserted == 1
+
+def test_load_endpoints(session_factory):
+    """Test staging, status and promotion through the API"""
+    from app.api.endpoints import service_areas
+    from app.db.session import get_db
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(service_areas.router)
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    created = client.post(
+        "/service-area-loads/?project_id=P1",
+        json=[{"State": "MN", "County": "Anoka"}, {"State": "XX1", "County": "Bad"}]
+    ).json()
+    assert created["RowsStaged"] == 1 and created["errors"][0]["message"] == \
+        "State must be a two-letter code"
+
+    load_id = created["LoadID"]
+    promoted = client.post(f"/service-area-loads/{load_id}/promote").json()
+    assert promoted["Status"] == PROMOTED and promoted["RowsInserted"] == 1
+    assert client.post(f"/service-area-loads/{load_id}/rows", json=[]).status_code == 400
+    assert client.get("/service-area-loads/999").status_code == 404
@@ -0,0 +1,91 @@
+"""Test the set-difference service area sync"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.service_area import ServiceArea
+from app.services.service_area_service import ServiceAreaService
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    ServiceArea.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    """Session with a three-county project whose flags an analyst has edited"""
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        ServiceArea(ProjectID="P1", Region="North", State="MN", County="Hennepin", ReportInclude="Y"),
+        ServiceArea(ProjectID="P1", Region="North", State="MN", County="Ramsey", ReportInclude="Y"),
+        ServiceArea(ProjectID="P1", Region="North", State="MN", County="Dakota", ReportInclude="N"),
+        ServiceArea(ProjectID="P2", Region="North", State="MN", County="Dakota", ReportInclude="N"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+def _rows(db, project_id="P1"):
+    return {
+        row.County: (row.RecordID, row.ReportInclude)
+        for row in db.query(ServiceArea).filter(ServiceArea.ProjectID == project_id)
+    }
+
+def test_sync_writes_only_the_difference(db, engine):
+    """Test kept rows retain RecordID and flags while others are added or removed"""
+    # Arrange
+    before = _rows(db)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, *args: statements.append(sql.split()[0]))
+    target = [
+        {"Region": "north", "State": "mn ", "County": "Hennepin"},
+        {"Region": "North", "State": "MN", "County": "Ramsey"},
+        {"Region": "North", "State": "MN", "County": "Wright", "ReportInclude": "N"},
+        {"Region": "North", "State": "MN", "County": "Anoka", "ReportInclude": "N"},
+    ]
+
+    # Act
+    changes = ServiceAreaService.sync_service_areas(db, "P1", target, values={"MaxMileage": 25})
+
+    # Assert
+    assert (len(changes.to_insert), len(changes.to_delete), changes.unchanged) == (2, 1, 2)
+    after = _rows(db)
+    assert after["Hennepin"] == before["Hennepin"]
+    assert after["Ramsey"] == before["Ramsey"]
+    assert set(after) == {"Hennepin", "Ramsey", "Wright", "Anoka"}
+    assert _rows(db, "P2").keys() == {"Dakota"}
+    assert statements.count("INSERT") == 1 and statements.count("DELETE") == 1
+
+def test_sync_to_same_set_is_a_no_op(db):
+    """Test syncing to the current set issues no inserts or deletes"""
+    target = [{"Region": "North", "State": "MN", "County": c} for c in ("Hennepin", "Ramsey", "Dakota")]
+
+    changes = ServiceAreaService.sync_service_areas(db, "P1", target)
+
+    assert changes.write_count == 0 and changes.unchanged == 3
+
+def test_sync_rolls_back_on_failure(db, monkeypatch):
+    """Test a failed insert leaves the deletes undone as well"""
+    # Arrange
+    before = _rows(db)
+    target = [{"Region": "North", "State": "MN", "County": "Wright"}]
+    real_execute = db.execute
+
+    def failing_execute(statement, *args, **kwargs):
+        if getattr(statement, "is_insert", False):
+            raise SQLAlchemyError("insert failed")
+        return real_execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", failing_execute)
+
+    # Act
+    with pytest.raises(SQLAlchemyError):
+        ServiceAreaService.sync_service_areas(db, "P1", target)
+
+    # Assert
+    monkeypatch.undo()
+    assert _rows(db) == before
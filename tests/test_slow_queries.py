@@ -0,0 +1,104 @@
+"""Test slow query capture"""
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.competitor import Competitor
+from app.services.competitor_service import CompetitorService
+from app.utils import slow_queries
+from app.utils.db_monitor import monitor_db_operation
+from app.utils.metrics import instrument_engine
+from app.utils.slow_queries import SlowQueryLog, redact, slow_query_log
+
+@pytest.fixture
+def capture_all():
+    """Record every statement in the process-wide log"""
+    threshold = slow_query_log.threshold_ms
+    slow_query_log.threshold_ms = 0
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.threshold_ms = threshold
+    slow_query_log.clear()
+
+def test_redact_keeps_shape_and_hides_text():
+    """Test text values are replaced by their length"""
+    assert redact(("Acme Health", 42, None, date(2024, 1, 2))) == \
+        ["<str:11>", 42, None, "2024-01-02"]
+    assert redact({"name": "x", "flag": True}) == {"name": "<str:1>", "flag": True}
+
+def test_slow_query_records_caller_and_operation(capture_all):
+    """Test events name the service function and the monitored UI operation"""
+    # Arrange
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    Competitor.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+
+    @monitor_db_operation("competitor_report")
+    def render():
+        return CompetitorService.get_competitors_page(db, limit=5)
+
+    # Act
+    render()
+
+    # Assert
+    event = capture_all.recent(1)[0]
+    assert event.caller == "app.services.competitor_service.get_competitors_page"
+    assert event.operation == "competitor_report"
+    assert event.parameters == [6, 0]
+    assert event.plan_status == "skipped"
+    db.close()
+
+def test_threshold_and_ring_buffer_size():
+    """Test fast statements are ignored and only the newest N are kept"""
+    log = SlowQueryLog(size=2, threshold_ms=100, capture_plan=False)
+    cursor = MagicMock(rowcount=3)
+
+    assert log.maybe_record(MagicMock(), cursor, "SELECT 1", (), False, 0.05, "SELECT ?") is None
+    for i in range(3):
+        log.maybe_record(MagicMock(), cursor, f"SELECT {i}", (), False, 0.2, "SELECT ?")
+
+    assert [e.statement for e in log.recent()] == ["SELECT 2", "SELECT 1"]
+    assert log.recent()[0].rowcount == 3
+
+def test_plan_captured_in_background_on_sql_server(monkeypatch):
+    """Test SHOWPLAN capture runs off-thread once per fingerprint"""
+    # Arrange
+    calls = []
+    monkeypatch.setattr(
+        slow_queries, "fetch_showplan",
+        lambda engine, statement, params: calls.append(params) or "<ShowPlanXML/>"
+    )
+    log = SlowQueryLog(threshold_ms=0, capture_plan=True)
+    conn = MagicMock()
+    conn.dialect.name = "mssql"
+
+    # Act
+    first = log.maybe_record(conn, MagicMock(), "SELECT ?", ("P1",), False, 1.0, "SELECT ?")
+    log._executor.shutdown(wait=True)
+    second = log.maybe_record(conn, MagicMock(), "SELECT ?", ("P2",), False, 1.0, "SELECT ?")
+
+    # Assert
+    assert first.plan == second.plan == "<ShowPlanXML/>"
+    assert calls == [("P1",)]
+
+def test_slow_query_endpoints(capture_all):
+    """Test the API lists events and serves captured plans"""
+    from app.api.endpoints import monitoring
+    event = capture_all.maybe_record(MagicMock(), MagicMock(), "SELECT 1", None, False, 1.0, "SELECT ?")
+    app = FastAPI()
+    app.include_router(monitoring.router)
+    client = TestClient(app)
+
+    [listed] = client.get("/monitoring/slow-queries").json()
+    assert listed["id"] == event.id and listed["has_plan"] is False
+    assert client.get(f"/monitoring/slow-queries/{event.id}/plan").status_code == 404
+
+    event.plan = "<ShowPlanXML/>"
+    response = client.get(f"/monitoring/slow-queries/{event.id}/plan")
+    assert response.text == "<ShowPlanXML/>"
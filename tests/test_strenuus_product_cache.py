@@ -0,0 +1,138 @@
+"""Test the Strenuus product reference cache and competitor flag defaults"""
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.competitor import Competitor
+from app.models.strenuus_product import StrenuusProduct
+from app.schemas.competitor import CompetitorCreate, CompetitorUpdate
+from app.services import competitor_service, strenuus_product_cache
+from app.services.competitor_service import CompetitorService
+from app.services.strenuus_product_cache import StrenuusProductCache
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    StrenuusProduct.__table__.create(engine)
+    Competitor.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    loaded = datetime(2024, 1, 1)
+    session.add_all([
+        StrenuusProduct(KeyId=1, StrenuusProductCode="UHC-HMO", Payor="UnitedHealthcare", Product="Choice HMO",
+                        EI=True, CS=False, MR=False, LoadDate=loaded),
+        StrenuusProduct(KeyId=2, StrenuusProductCode="UHC-MA", Payor="UnitedHealthcare", Product="AARP Medicare",
+                        EI=False, CS=False, MR=True, LoadDate=loaded),
+        StrenuusProduct(KeyId=3, StrenuusProductCode="AET-HMO", Payor="Aetna", Product="Choice HMO",
+                        EI=True, CS=True, MR=False, LoadDate=loaded),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = StrenuusProductCache(ttl_seconds=300)
+    monkeypatch.setattr(competitor_service, "strenuus_product_cache", cache)
+    return cache
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+def test_indexes_by_payor_product_and_code(db, cache):
+    """Test lookups are case-insensitive and payors are listed once each"""
+    cache.ensure_fresh(db)
+
+    assert cache.payors() == ["Aetna", "UnitedHealthcare"]
+    assert [p.KeyId for p in cache.products_for_payor("unitedhealthcare")] == [2, 1]
+    assert [p.KeyId for p in cache.get_by_product("choice hmo")] == [1, 3]
+    assert cache.resolve(product="Choice HMO") is None
+    assert cache.resolve(product="Choice HMO", payor="Aetna").KeyId == 3
+    assert cache.resolve(code="uhc-ma").flags() == {"EI": False, "CS": False, "MR": True}
+
+def test_version_check_reloads_only_on_change(db, engine, cache, monkeypatch):
+    """Test an expired TTL costs one version query and reloads only when the table changed"""
+    # Arrange
+    registry = MagicMock()
+    monkeypatch.setattr(strenuus_product_cache, "reference_registry", registry)
+    cache.ensure_fresh(db)
+    statements = _count_statements(engine)
+
+    # Act: within the TTL nothing is queried
+    cache.ensure_fresh(db)
+    assert statements == []
+
+    # Act: after invalidate the version matches, so no reload
+    cache.invalidate()
+    cache.ensure_fresh(db)
+    assert len(statements) == 1
+
+    # Act: a vendor load changes the version
+    db.add(StrenuusProduct(KeyId=4, Payor="Cigna", Product="Open Access", LoadDate=datetime(2024, 2, 1)))
+    db.commit()
+    statements.clear()
+    cache.invalidate()
+    cache.ensure_fresh(db)
+
+    # Assert
+    assert len(statements) == 2
+    assert "Cigna" in cache.payors()
+    assert cache.version == (4, datetime(2024, 2, 1))
+    registry.invalidate.assert_called_once()
+
+def test_create_competitor_defaults_flags_without_querying_products(db, engine, cache):
+    """Test EI/CS/MR and the product code come from the warm cache"""
+    # Arrange
+    cache.ensure_fresh(db)
+    statements = _count_statements(engine)
+
+    # Act
+    created = CompetitorService.create_competitor(
+        db, CompetitorCreate(ProjectID="P1", Payor="Aetna", Product="Choice HMO")
+    )
+
+    # Assert
+    assert (created.EI, created.CS, created.MR) == (True, True, False)
+    assert created.StrenuusProductCode == "AET-HMO"
+    assert not any("Strenuus_Product" in sql for sql in statements)
+
+def test_explicit_flags_win_and_update_redefaults_on_product_change(db, cache):
+    """Test caller-supplied flags are kept and a product change re-derives the rest"""
+    created = CompetitorService.create_competitor(
+        db, CompetitorCreate(ProjectID="P1", Payor="UnitedHealthcare", Product="Choice HMO", EI=False)
+    )
+    assert (created.EI, created.CS, created.MR) == (False, False, False)
+
+    unchanged = CompetitorService.update_competitor(db, created.RecordID, CompetitorUpdate(ProjectID="P2"))
+    assert unchanged.EI is False
+
+    updated = CompetitorService.update_competitor(
+        db, created.RecordID, CompetitorUpdate(Product="AARP Medicare", StrenuusProductCode="UHC-MA")
+    )
+    assert (updated.EI, updated.CS, updated.MR) == (False, False, True)
+
+def test_update_product_or_payor_replaces_stale_code(db, cache):
+    """Test changing product or payor without a code resolves the new product and its code"""
+    created = CompetitorService.create_competitor(
+        db, CompetitorCreate(ProjectID="P1", Payor="UnitedHealthcare", Product="Choice HMO")
+    )
+    assert created.StrenuusProductCode == "UHC-HMO"
+
+    product = CompetitorService.update_competitor(db, created.RecordID, CompetitorUpdate(Product="AARP Medicare"))
+    assert (product.StrenuusProductCode, product.EI, product.CS, product.MR) == ("UHC-MA", False, False, True)
+
+    CompetitorService.update_competitor(db, created.RecordID, CompetitorUpdate(Product="Choice HMO"))
+    payor = CompetitorService.update_competitor(db, created.RecordID, CompetitorUpdate(Payor="Aetna"))
+    assert (payor.StrenuusProductCode, payor.EI, payor.CS, payor.MR) == ("AET-HMO", True, True, False)
+
+    unknown = CompetitorService.update_competitor(db, created.RecordID, CompetitorUpdate(Product="Custom PPO"))
+    assert unknown.StrenuusProductCode is None
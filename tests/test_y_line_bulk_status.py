@@ -0,0 +1,115 @@
+"""Test the set-based Y-Line bulk status update"""
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.y_line import YLine, YLineStatus
+from app.models.y_line_rollup import YLineRollup
+from app.services import y_line_service
+from app.services.y_line_service import YLineService
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    # y_lines references projects.id; a stand-in table satisfies the foreign key
+    metadata = MetaData()
+    Table("projects", metadata, Column("id", Integer, primary_key=True))
+    YLine.__table__.to_metadata(metadata)
+    YLineRollup.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables["projects"].insert(), [{"id": 1}])
+        conn.execute(YLine.__table__.insert(), [
+            {"id": i, "ipa_number": f"IPA{i}", "product_code": "PC", "project_id": 1}
+            for i in range(1, 4501)
+        ])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+def _statuses(db, ids):
+    table = YLine.__table__
+    return set(db.execute(select(table.c.status).where(table.c.id.in_(ids))).scalars())
+
+def test_updates_in_batches_and_reports_missing_ids(db):
+    """Test 4,500 IDs go out as three UPDATEs and unmatched IDs are listed"""
+    # Arrange
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    ids = list(range(1, 4501)) + [9001, 9002, 17]
+
+    # Act
+    result = YLineService(db).bulk_update_status(ids, YLineStatus.ACTIVE)
+
+    # Assert
+    updates = [sql for sql in statements if sql.startswith("UPDATE y_lines ")]
+    assert len(updates) == 3
+    # Rows are not read back; the only reads are the totals moved between rollups
+    selects = [sql for sql in statements if sql.lstrip().startswith("SELECT")]
+    assert len(selects) == 3 and all("GROUP BY" in sql for sql in selects)
+    assert (result.requested, result.updated, result.missing_ids) == (4502, 4500, [9001, 9002])
+    assert result.y_lines is None
+    assert _statuses(db, range(1, 4501)) == {YLineStatus.ACTIVE}
+
+def test_batches_stay_under_parameter_limit():
+    """Test each UPDATE binds fewer than SQL Server's 2100 parameters"""
+    assert y_line_service.IN_LIST_BATCH_SIZE + 1 < 2100
+
+def test_return_rows_comes_from_the_update(db):
+    """Test updated rows are returned without a follow-up read"""
+    result = YLineService(db).bulk_update_status([2, 1], YLineStatus.COMPLETED, return_rows=True)
+
+    assert [row["id"] for row in result.y_lines] == [1, 2]
+    assert all(row["status"] == YLineStatus.COMPLETED for row in result.y_lines)
+
+def test_without_returning_ids_are_read_back(db, monkeypatch):
+    """Test backends without UPDATE ... RETURNING still report missing IDs"""
+    monkeypatch.setattr(db.get_bind().dialect, "update_returning", False)
+
+    result = YLineService(db).bulk_update_status([1, 2, 9999], YLineStatus.CANCELLED, return_rows=True)
+
+    assert result.updated == 2 and result.missing_ids == [9999]
+    assert [row["id"] for row in result.y_lines] == [1, 2]
+
+def test_strict_mode_rolls_back_when_any_id_is_missing(db):
+    """Test strict raises 404 and leaves every status unchanged"""
+    with pytest.raises(HTTPException) as excinfo:
+        YLineService(db).bulk_update_status([1, 2, 9999], YLineStatus.ACTIVE, strict=True)
+
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.detail["missing_ids"] == [9999]
+    assert _statuses(db, [1, 2]) == {YLineStatus.PENDING}
+
+def test_bulk_status_route_is_not_captured_by_y_line_id(session_factory):
+    """Test PUT /y-lines/bulk-status reaches the bulk handler"""
+    from app.api.deps import get_db
+    from app.api.endpoints import y_line
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(y_line.router)
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    response = client.put("/y-lines/bulk-status?status=active&return_rows=true", json=[3, 4, 9999])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["updated"], body["missing_ids"]) == (2, [9999])
+    assert [row["status"] for row in body["y_lines"]] == ["active", "active"]
@@ -0,0 +1,148 @@
+"""Test validated bulk Y-Line ingest"""
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.y_line import YLine, YLineStatus
+from app.models.y_line_rollup import YLineRollup
+from app.schemas.y_line import YLineCreate
+from app.services.y_line_service import INSERTED, REJECTED, SKIPPED, YLineService
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    # y_lines references projects.id; a stand-in table satisfies the foreign key
+    metadata = MetaData()
+    Table("projects", metadata, Column("id", Integer, primary_key=True))
+    YLine.__table__.to_metadata(metadata)
+    YLineRollup.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables["projects"].insert(), [{"id": 1}])
+        conn.execute(YLine.__table__.insert(), [{"ipa_number": "IPA-OLD", "product_code": "PC", "project_id": 1}])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+def _count(db):
+    return db.execute(select(func.count()).select_from(YLine.__table__)).scalar()
+
+def _rows():
+    return [
+        {"ipa_number": "IPA-1", "product_code": "PC", "estimated_value": "1500.50", "status": "Active"},
+        {"ipa_number": " ", "product_code": "PC"},
+        {"ipa_number": "IPA-2", "product_code": "PC", "actual_value": -1},
+        {"ipa_number": "ipa-1", "product_code": "PC"},
+        {"ipa_number": "IPA-OLD", "product_code": "PC"},
+        {"ipa_number": "IPA-3", "product_code": "", "status": "unknown"},
+        {"ipa_number": "IPA-4", "product_code": "PC", "estimated_value": "lots"},
+        {"ipa_number": "IPA-5", "product_code": "PC", "description": "x" * 501},
+        {"ipa_number": "IPA-6", "product_code": "PC", "status": "COMPLETED"},
+    ]
+
+def test_every_row_is_reported_and_nothing_inserted_by_default(db):
+    """Test one bad row rejects the file and each row's reason is given"""
+    report = YLineService(db).ingest_y_lines(1, _rows())
+
+    assert (report.received, report.inserted, report.rejected) == (9, 0, 7)
+    assert [(r.row, r.status, r.message) for r in report.rows] == [
+        (1, SKIPPED, None),
+        (2, REJECTED, "Invalid IPA number format"),
+        (3, REJECTED, "Invalid monetary values"),
+        (4, REJECTED, "Duplicate IPA number in this batch"),
+        (5, REJECTED, "IPA number already exists"),
+        (6, REJECTED, "Product code is required"),
+        (7, REJECTED, "estimated_value must be a number"),
+        (8, REJECTED, "description is longer than 500 characters"),
+        (9, SKIPPED, None),
+    ]
+    assert _count(db) == 1
+
+def test_partial_inserts_the_valid_rows(db):
+    """Test partial acceptance writes valid rows with coerced values"""
+    report = YLineService(db).ingest_y_lines(1, _rows(), partial=True)
+
+    assert (report.inserted, report.rejected) == (2, 7)
+    table = YLine.__table__
+    inserted = db.execute(
+        select(table.c.ipa_number, table.c.estimated_value, table.c.status, table.c.description)
+        .where(table.c.ipa_number.in_(["IPA-1", "IPA-6"])).order_by(table.c.ipa_number)
+    ).all()
+    assert inserted == [("IPA-1", 1500.5, YLineStatus.ACTIVE, None), ("IPA-6", None, YLineStatus.COMPLETED, None)]
+
+def test_unknown_project_is_not_found(db):
+    """Test rows for a missing project raise 404"""
+    with pytest.raises(HTTPException) as excinfo:
+        YLineService(db).ingest_y_lines(99, [{"ipa_number": "IPA-1", "product_code": "PC"}])
+
+    assert excinfo.value.status_code == 404
+
+def test_bulk_create_rejects_whole_batch_with_row_errors(db):
+    """Test bulk_create_y_lines returns created rows or lists every rejected one"""
+    service = YLineService(db)
+    created = service.bulk_create_y_lines(1, [
+        YLineCreate(ipa_number=f"NEW-{i}", product_code="PC", estimated_value=10.0 * i) for i in range(3)
+    ])
+    assert [row.ipa_number for row in created] == ["NEW-0", "NEW-1", "NEW-2"]
+
+    with pytest.raises(HTTPException) as excinfo:
+        service.bulk_create_y_lines(1, [YLineCreate(ipa_number="NEW-1", product_code="PC")])
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == [{"row": 1, "ipa_number": "NEW-1", "message": "IPA number already exists"}]
+
+def test_large_file_is_inserted_in_chunks(db):
+    """Test 50,000 rows go out as a few executemany chunks, not row by row"""
+    # Arrange
+    inserts = []
+    event.listen(
+        db.get_bind(), "before_cursor_execute",
+        lambda conn, cursor, sql, params, context, many: inserts.append(many) if sql.startswith("INSERT INTO y_lines ") else None
+    )
+    rows = [{"ipa_number": f"IPA-{i:06d}", "product_code": "PC", "estimated_value": i} for i in range(50000)]
+
+    # Act
+    start = time.perf_counter()
+    report = YLineService(db).ingest_y_lines(1, rows)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert report.inserted == 50000 and report.rejected == 0
+    assert inserts == [True] * 50
+    assert _count(db) == 50001
+    assert elapsed < 30
+
+def test_ingest_endpoint_reports_rows(session_factory):
+    """Test POST /{project_id}/y-lines/ingest returns the per-row report"""
+    from app.api.deps import get_db
+    from app.api.endpoints import y_line
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(y_line.router)
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    response = client.post("/1/y-lines/ingest?partial=true", json=_rows()[:3])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["inserted"], body["rejected"]) == (1, 2)
+    assert [row["status"] for row in body["rows"]] == [INSERTED, REJECTED, REJECTED]
@@ -0,0 +1,190 @@
+"""Test the unified Y-Line repository and the legacy Y-Line migration"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.project import Project
+from app.models.y_line import YLine, YLineStatus
+from app.models.y_line_migration import LegacyProjectMapping, YLineMigrationCheckpoint
+from app.models.y_line_rollup import YLineRollup
+from app.models.yline import YLine as TranslationYLine, YLineItem, YLineManager
+from app.services import y_line_migration, y_line_repository, y_line_service
+from app.services.y_line_migration import migrate_translation_y_lines
+from app.services.y_line_repository import ADAPTERS, YLineRepository
+from app.services.y_line_rollup import reconcile_rollups
+from app.services.y_line_service import YLineService
+from app.utils.query_cache import QueryCache
+
+LEGACY_ROWS = [
+    # RecordID, ProjectID, status, product, IPA, market, PreAward
+    (1, "MN24HMO", "Active", "HM", 1001, 10, 1),
+    (2, "MN24HMO", "Inactive", "HM", 1002, 10, 0),
+    (3, "WI24PPO", "Pending", "PP", 1001, 20, 0),
+    (4, "XX00000", "Active", "HM", 1003, 10, 0),  # no mapped project
+    (5, "WI24PPO", None, "PP", 1004, 20, 1),
+    (6, "WI24PPO", "On Hold", "PP", 1005, 20, 0),
+    (7, "WI24PPO", "Active", "PP", None, 20, 0),  # no IPA
+]
+# projects.id for each legacy ProjectID; deliberately not the legacy RecordIDs 1 and 2
+MN_PROJECT, WI_PROJECT = 101, 102
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    # y_lines references projects.id; a stand-in table satisfies the foreign key
+    metadata = MetaData()
+    Table("projects", metadata, Column("id", Integer, primary_key=True))
+    for model in (YLine, YLineRollup, YLineMigrationCheckpoint, LegacyProjectMapping, Project, TranslationYLine):
+        model.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables["projects"].insert(), [{"id": 1}, {"id": 2}, {"id": 101}, {"id": 102}])
+        conn.execute(Project.__table__.insert(), [
+            {"RecordID": 1, "ProjectID": "MN24HMO"}, {"RecordID": 2, "ProjectID": "WI24PPO"},
+        ])
+        conn.execute(LegacyProjectMapping.__table__.insert(), [
+            {"legacy_project_id": "MN24HMO", "project_id": MN_PROJECT},
+            {"legacy_project_id": "WI24PPO", "project_id": WI_PROJECT},
+        ])
+        conn.execute(TranslationYLine.__table__.insert(), [
+            dict(RecordID=r, ProjectID=p, ProjectStatus=s, NDB_Yline_ProdCd=c, NDB_Yline_IPA=ipa,
+                 NDB_Yline_MktNum=m, PreAward=pre, DataLoadDate=datetime(2024, 1, r))
+            for r, p, s, c, ipa, m, pre in LEGACY_ROWS
+        ])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = QueryCache(max_bytes=1024 * 1024, default_ttl=60)
+    monkeypatch.setattr(y_line_service, "y_line_repository", YLineRepository(ADAPTERS["y_lines"], cache))
+    return cache
+
+def _statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+def test_translation_adapter_reads_legacy_rows_as_records(db):
+    """Test legacy rows come back in the y_lines shape with mapped statuses"""
+    repository = YLineRepository(ADAPTERS["translation"], QueryCache(max_bytes=1024 * 1024))
+
+    records = repository.find(db, project_id=WI_PROJECT)
+
+    assert [(r.id, r.ipa_number, r.status, r.pre_award_status, r.post_award_status) for r in records] == [
+        (3, "WI24PPO/1001/PP/20", YLineStatus.PENDING, "No", "Yes"),
+        (5, "WI24PPO/1004/PP/20", YLineStatus.PENDING, "Yes", "No"),
+        (6, "WI24PPO/1005/PP/20", YLineStatus.PENDING, "No", "Yes"),
+        (7, None, YLineStatus.ACTIVE, "No", "Yes"),
+    ]
+    assert repository.find(db, project_id=2) == []
+    assert [r.id for r in repository.find(db, status=YLineStatus.PENDING)] == [3, 5, 6]
+    assert [r.id for r in repository.find(db, status=YLineStatus.CANCELLED)] == [2]
+    assert repository.get(db, 4).project_id is None
+
+def test_reads_are_cached_until_a_service_write(db, cache):
+    """Test a repeated read is served from the cache and writes through YLineService invalidate it"""
+    # Arrange
+    service = YLineService(db)
+    service.ingest_y_lines(1, [{"ipa_number": "IPA-1", "product_code": "PC"}])
+    assert [r.ipa_number for r in service.get_project_y_lines(1)] == ["IPA-1"]
+    statements = _statements(db)
+
+    # Act
+    service.get_project_y_lines(1)
+    cached = len(statements)
+    service.ingest_y_lines(1, [{"ipa_number": "IPA-2", "product_code": "PC"}])
+    records = service.get_project_y_lines(1)
+
+    # Assert
+    assert cached == 0
+    assert [r.ipa_number for r in records] == ["IPA-1", "IPA-2"]
+    assert records[0].status == YLineStatus.PENDING
+
+def test_migration_resumes_from_checkpoint(db, cache):
+    """Test a stopped migration continues after the last committed batch"""
+    # Act
+    first = migrate_translation_y_lines(db, batch_size=2, max_batches=1)
+    resumed = migrate_translation_y_lines(db, batch_size=2)
+    again = migrate_translation_y_lines(db, batch_size=2)
+
+    # Assert
+    assert (first.last_record_id, first.copied, first.completed) == (2, 2, False)
+    assert (resumed.copied, resumed.skipped, resumed.unmapped, resumed.completed) == (5, 2, 1, True)
+    assert resumed.unmapped_projects == {"XX00000"}
+    assert again.batches == 0
+    ipa_numbers = db.execute(select(YLine.__table__.c.ipa_number).order_by(YLine.__table__.c.id)).scalars().all()
+    assert ipa_numbers == [
+        "MN24HMO/1001/HM/10", "MN24HMO/1002/HM/10", "WI24PPO/1001/PP/20",
+        "WI24PPO/1004/PP/20", "WI24PPO/1005/PP/20",
+    ]
+    assert reconcile_rollups(db).corrected == 0
+
+def test_migration_keys_rows_to_mapped_project_ids(db, cache):
+    """Test copied rows land on the mapped projects.id, and unmapped rows are copied after a restart"""
+    # Act
+    progress = migrate_translation_y_lines(db, batch_size=10)
+    db.execute(LegacyProjectMapping.__table__.insert().values(legacy_project_id="XX00000", project_id=1))
+    db.commit()
+    restarted = migrate_translation_y_lines(db, batch_size=10, restart=True)
+
+    # Assert
+    assert progress.unmapped_projects == {"XX00000"}
+    assert (restarted.copied, restarted.unmapped, restarted.unmapped_projects) == (1, 0, set())
+    lines = YLine.__table__.c
+    copied = db.execute(select(lines.project_id, func.count()).group_by(lines.project_id)).all()
+    assert sorted(copied) == [(1, 1), (MN_PROJECT, 2), (WI_PROJECT, 3)]
+    assert reconcile_rollups(db).corrected == 0
+
+def test_failed_batch_leaves_checkpoint_and_rows_unchanged(db, cache, monkeypatch):
+    """Test a batch that fails is rolled back whole and copied once on the next run"""
+    # Arrange
+    calls = []
+
+    def fail_second_batch(self, session):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return apply(self, session)
+
+    apply = y_line_migration.RollupDeltas.apply
+    monkeypatch.setattr(y_line_migration.RollupDeltas, "apply", fail_second_batch)
+
+    # Act
+    with pytest.raises(RuntimeError):
+        migrate_translation_y_lines(db, batch_size=2)
+    checkpoint = db.execute(select(YLineMigrationCheckpoint.__table__)).one()
+    copied_before_failure = db.execute(select(func.count()).select_from(YLine.__table__)).scalar()
+    progress = migrate_translation_y_lines(db, batch_size=2)
+
+    # Assert
+    assert (checkpoint.last_record_id, checkpoint.copied) == (2, 2)
+    assert copied_before_failure == 2
+    assert progress.completed and progress.copied == 5
+    assert db.execute(select(func.count()).select_from(YLine.__table__)).scalar() == 5
+
+def test_manager_creates_items_in_y_lines_and_lists_them(db, cache, monkeypatch):
+    """Test a Y-Line created from the page is stored in y_lines and listed with its award flags"""
+    # Arrange
+    monkeypatch.setattr(y_line_repository, "y_line_repository", YLineRepository(ADAPTERS["y_lines"], cache))
+    manager = YLineManager(db)
+    item = YLineItem("IPA-9", "HM", "New line", False, True, "Active", datetime.now(), notes="not stored")
+
+    # Act
+    manager.create_yline_item(item, MN_PROJECT)
+    items = manager.get_yline_items(status_filter="Active")
+
+    # Assert
+    assert items[["IPA_Number", "PreAward", "PostAward", "Status"]].values.tolist() == [["IPA-9", False, True, "Active"]]
+    assert db.execute(select(YLine.__table__.c.project_id)).scalar() == MN_PROJECT
+    with pytest.raises(ValueError, match="IPA number already exists"):
+        manager.create_yline_item(item, MN_PROJECT)
+    with pytest.raises(ValueError, match="Project not found"):
+        manager.create_yline_item(item, 999)
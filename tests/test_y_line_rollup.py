@@ -0,0 +1,153 @@
+"""Test incrementally maintained Y-Line rollups"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select, update
+from sqlalchemy.dialects import mssql, postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.y_line import YLine, YLineStatus
+from app.models.y_line_rollup import YLineRollup
+from app.services.y_line_rollup import RollupReconciler, locked_rollups_query, reconcile_rollups
+from app.services.y_line_service import YLineService
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    # y_lines references projects.id; a stand-in table satisfies the foreign key
+    metadata = MetaData()
+    Table("projects", metadata, Column("id", Integer, primary_key=True))
+    YLine.__table__.to_metadata(metadata)
+    YLineRollup.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables["projects"].insert(), [{"id": 1}, {"id": 2}])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def loaded(db):
+    """Three lines on project 1, one on project 2, created through the service"""
+    service = YLineService(db)
+    service.ingest_y_lines(1, [
+        {"ipa_number": "A1", "product_code": "PC", "estimated_value": 100, "actual_value": 90},
+        {"ipa_number": "A2", "product_code": "PC", "estimated_value": 200, "actual_value": 250},
+        {"ipa_number": "A3", "product_code": "PC", "estimated_value": 50, "status": "active"},
+    ])
+    service.ingest_y_lines(2, [{"ipa_number": "B1", "product_code": "PC", "estimated_value": 10}])
+    return service
+
+def _totals(rollup):
+    return {t.status: (t.line_count, t.estimated_total, t.actual_total) for t in rollup.by_status}
+
+def test_ingest_adds_to_project_and_status_totals(loaded):
+    """Test a project's rollup has its totals overall and by status"""
+    rollup = loaded.get_project_rollup(1)
+
+    assert (rollup.line_count, rollup.estimated_total, rollup.actual_total) == (3, 350.0, 340.0)
+    assert rollup.variance == -10.0
+    assert _totals(rollup) == {YLineStatus.PENDING: (2, 300.0, 340.0), YLineStatus.ACTIVE: (1, 50.0, 0.0)}
+    assert loaded.get_project_rollup(2).line_count == 1
+
+def test_bulk_status_moves_totals_between_statuses(db, loaded):
+    """Test only lines whose status changes move, and source still agrees"""
+    ids = list(db.execute(select(YLine.__table__.c.id).where(YLine.__table__.c.project_id == 1)).scalars())
+
+    loaded.bulk_update_status(ids + [999], YLineStatus.ACTIVE)
+
+    assert _totals(loaded.get_project_rollup(1)) == {YLineStatus.ACTIVE: (3, 350.0, 340.0)}
+    assert reconcile_rollups(db).corrected == 0
+
+def test_reconcile_corrects_drift_from_outside_writes(db, loaded):
+    """Test rows changed behind the service's back are fixed from source"""
+    # Arrange
+    lines, rollups = YLine.__table__, YLineRollup.__table__
+    db.execute(update(lines).where(lines.c.ipa_number == "A1").values(estimated_value=1000))
+    db.execute(lines.insert().values(ipa_number="RAW", product_code="PC", project_id=2, status=None,
+                                     estimated_value=5))
+    db.execute(update(rollups).where(rollups.c.project_id == 2).values(line_count=7))
+    db.commit()
+
+    # Act
+    result = reconcile_rollups(db)
+
+    # Assert
+    assert (result.checked, result.corrected) == (3, 2)
+    assert _totals(loaded.get_project_rollup(1))[YLineStatus.PENDING] == (2, 1200.0, 340.0)
+    assert _totals(loaded.get_project_rollup(2)) == {YLineStatus.PENDING: (2, 15.0, 0.0)}
+    assert reconcile_rollups(db).corrected == 0
+
+def test_reconcile_rebuilds_missing_rollups_for_one_project(db, loaded):
+    """Test reconciling one project leaves the others alone"""
+    db.execute(YLineRollup.__table__.delete())
+    db.commit()
+
+    result = reconcile_rollups(db, project_id=1)
+
+    assert result.corrected == 2
+    assert loaded.get_project_rollup(1).line_count == 3
+    assert loaded.get_project_rollup(2).line_count == 0
+
+def test_reconcile_locks_stored_rollups_on_sql_server():
+    """Test the stored rollups are read with UPDLOCK, HOLDLOCK, since mssql drops FOR UPDATE"""
+    sql = str(locked_rollups_query(1).compile(dialect=mssql.dialect()))
+
+    assert "FROM y_line_rollups WITH (UPDLOCK, HOLDLOCK)" in sql
+    assert "FOR UPDATE" in str(locked_rollups_query().compile(dialect=postgresql.dialect()))
+
+def test_reconciler_runs_on_its_interval(session_factory, loaded, db):
+    """Test the background job reconciles until stopped"""
+    # Arrange
+    db.execute(YLineRollup.__table__.delete())
+    db.commit()
+    reconciler = RollupReconciler(interval_seconds=0.01, session_factory=session_factory)
+
+    # Act
+    reconciler.start()
+    try:
+        for _ in range(500):
+            if db.execute(select(YLineRollup.__table__.c.project_id)).first():
+                break
+            db.rollback()
+            reconciler._stop.wait(0.01)
+    finally:
+        reconciler.stop(timeout=5)
+
+    # Assert
+    assert not reconciler.running
+    assert loaded.get_project_rollup(1).line_count == 3
+    disabled = RollupReconciler(interval_seconds=0)
+    disabled.start()
+    assert not disabled.running
+
+def test_rollup_endpoints(session_factory, loaded):
+    """Test GET /{project_id}/y-lines/rollup and POST /y-lines/rollup/reconcile"""
+    from app.api.deps import get_db
+    from app.api.endpoints import y_line
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(y_line.router)
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    body = client.get("/1/y-lines/rollup").json()
+    assert (body["line_count"], body["variance"]) == (3, -10.0)
+    assert [(t["status"], t["line_count"]) for t in body["by_status"]] == [("pending", 2), ("active", 1)]
+    assert client.get("/99/y-lines/rollup").status_code == 404
+    assert client.post("/y-lines/rollup/reconcile?project_id=1").json() == {"checked": 2, "corrected": 0}
@@ -0,0 +1,151 @@
+"""Test the indexed, faceted Y-Line search"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, event
+from sqlalchemy.dialects import mssql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.y_line import YLine, YLineStatus
+from app.models.y_line_rollup import YLineRollup
+from app.services.y_line_search import search_conditions, search_query, search_y_lines
+
+STATUSES = list(YLineStatus)
+
+def _y_line(i):
+    return {
+        "id": i,
+        "ipa_number": f"IPA{i:06d}",
+        "product_code": "DENT" if i % 3 == 0 else "MED",
+        "description": f"Rural network line {i}" if i % 2 else f"Urban line {i}",
+        "estimated_value": None if i % 10 == 0 else float(i * 997 % 2_000_000),
+        "status": STATUSES[i % 4],
+        "project_id": 1 + i % 2,
+    }
+
+def _session_factory(rows):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    # y_lines references projects.id; a stand-in table satisfies the foreign key
+    metadata = MetaData()
+    Table("projects", metadata, Column("id", Integer, primary_key=True))
+    YLine.__table__.to_metadata(metadata)
+    YLineRollup.__table__.to_metadata(metadata)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(metadata.tables["projects"].insert(), [{"id": 1}, {"id": 2}])
+        conn.execute(YLine.__table__.insert(), [_y_line(i) for i in range(1, rows + 1)])
+    return engine, sessionmaker(bind=engine)
+
+@pytest.fixture
+def session_factory():
+    engine, factory = _session_factory(200)
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+def _sql(conditions):
+    query = search_query(conditions, after=None, limit=10, facets=False)
+    return str(query.compile(dialect=mssql.dialect(), compile_kwargs={"literal_binds": True}))
+
+def test_codes_are_prefix_matched_and_wildcards_escaped():
+    """Test ipa_number and product_code use a sargable LIKE 'term%' and nothing scans"""
+    sql = _sql(search_conditions(q="ip_a%", fulltext=False))
+
+    assert "y_lines.ipa_number LIKE 'ip\\_a\\%%'" in sql
+    assert "y_lines.product_code LIKE 'ip\\_a\\%%'" in sql
+    assert "lower(" not in sql
+    assert "description LIKE" not in sql and "LIKE '%" not in sql
+
+def test_description_uses_contains_with_full_text_index():
+    """Test the full-text setting swaps the description scan for CONTAINS"""
+    sql = _sql(search_conditions(q='rural "net', fulltext=True))
+
+    assert "CONTAINS(y_lines.description, '\"rural*\" AND \"net*\"')" in sql
+    assert "description LIKE" not in sql
+
+def test_facets_group_by_the_derived_bucket_column():
+    """Test SQL Server groups by the bucket column, not a second copy of its parameterised CASE"""
+    query = search_query(search_conditions(project_id=1), after=None, limit=10, facets=True)
+
+    sql = str(query.compile(dialect=mssql.dialect()))
+
+    group_by = sql.split("GROUP BY", 1)[1]
+    assert group_by.strip() == "matched.status, matched.bucket"
+    assert sql.count("CASE") == 1
+
+def test_page_total_and_facets_come_from_one_statement(db):
+    """Test a single round trip returns the page, total and facet counts"""
+    # Arrange
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    # Act
+    result = search_y_lines(db, project_id=2, q="ipa0000", limit=20)
+
+    # Assert
+    assert len(statements) == 1
+    assert result.total == 50
+    assert [row.id for row in result.y_lines] == list(range(1, 40, 2))
+    assert result.next_after == 39
+    assert result.status_counts == {"active": 25, "cancelled": 25}
+    assert sum(result.value_counts.values()) == 50
+    assert "none" not in result.value_counts
+
+def test_keyset_pages_cover_every_match_once(db):
+    """Test following next_after visits each match exactly once"""
+    seen, after = [], None
+    while True:
+        page = search_y_lines(db, status=YLineStatus.PENDING, min_value=10_000, after=after, limit=7,
+                              facets=after is None)
+        seen.extend(row.id for row in page.y_lines)
+        if after is None:
+            total = page.total
+        else:
+            assert page.total is None
+        after = page.next_after
+        if after is None:
+            break
+
+    assert len(seen) == len(set(seen)) == total
+    assert seen == sorted(seen)
+
+def test_value_buckets_and_null_values(db):
+    """Test every match lands in one value bucket, NULL values in 'none'"""
+    result = search_y_lines(db, project_id=1, limit=1)
+
+    assert result.total == 100
+    assert result.value_counts["none"] == 20
+    assert sum(result.value_counts.values()) == 100
+
+def test_search_route_is_not_captured_by_y_line_id(session_factory):
+    """Test GET /y-lines/search reaches the search handler"""
+    from app.api.deps import get_db
+    from app.api.endpoints import y_line
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.include_router(y_line.router)
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+
+    response = client.get("/y-lines/search", params={"q": "IPA00001", "limit": 5})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["ipa_number"] for row in body["y_lines"]] == [f"IPA{i:06d}" for i in range(10, 15)]
+    assert body["total"] == 10 and body["next_after"] == 14
+    assert client.get("/y-lines/search", params={"limit": 0}).status_code == 422